@@ -0,0 +1,60 @@
+'''
+Compares loading GGA/RMC sentences from a `pynmea2.archive` with parsing
+the text log they were archived from, as sentence objects and as NumPy
+columns of the GGA sentences.
+
+    PYTHONPATH=. python benchmarks/bench_archive.py [count]
+'''
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+import pynmea2
+from pynmea2 import archive, columnar
+
+from bench_memory import lines
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    tmp = tempfile.mkdtemp()
+    try:
+        log = os.path.join(tmp, 'log.nmea')
+        with open(log, 'w') as f:
+            for line in lines(count):
+                f.write(line + '\n')
+        path = log + '.arc'
+        with archive.ArchiveWriter(path) as writer:
+            writer.write_many(pynmea2.NMEAFile(log))
+        print('text %d bytes, archive %d bytes'
+              % (os.path.getsize(log), os.path.getsize(path)))
+
+        def text():
+            with pynmea2.NMEAFile(log) as f:
+                return f.read()
+
+        def text_columns():
+            with open(log) as f:
+                return columnar.decode(f, pynmea2.GGA)
+
+        def objects():
+            with archive.ArchiveReader(path) as reader:
+                return reader.read()
+
+        def columns():
+            with archive.ArchiveReader(path) as reader:
+                return reader.decode(pynmea2.GGA)
+
+        for name, func in (('NMEAFile', text), ('archive', objects),
+                           ('columnar', text_columns),
+                           ('archive columns', columns)):
+            best = min(timeit.repeat(func, number=1, repeat=3))
+            print('%-16s %7.2f us/sentence' % (name, best / count * 1e6))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main()
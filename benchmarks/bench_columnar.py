@@ -0,0 +1,50 @@
+'''
+Compares decoding GGA sentences into NumPy columns with `pynmea2.columnar`
+against parsing them and reading their fields one sentence at a time.
+
+    PYTHONPATH=. python benchmarks/bench_columnar.py [count]
+'''
+import sys
+import timeit
+
+import numpy as np
+
+import pynmea2
+from pynmea2 import columnar
+from pynmea2.nmea import NMEASentence
+
+
+def lines(count):
+    for i in range(count):
+        seconds = i // 10
+        t = '%02d%02d%02d.%d' % (seconds // 3600 % 24, seconds // 60 % 60,
+                                  seconds % 60, i % 10)
+        body = 'GPGGA,%s,%02d%07.4f,S,%03d%07.4f,E,1,%02d,2.6,%.2f,M,-33.9,M,,0000' % (
+            t, 19 + i % 3, (i * 0.0007) % 60, 24 + i % 5, (i * 0.0011) % 60,
+            4 + i % 8, 100 + i % 50 / 7.)
+        yield '$%s*%02X' % (body, NMEASentence.checksum(body))
+
+
+def objects(data):
+    msgs = [pynmea2.parse(line) for line in data]
+    return {
+        'timestamp': [msg.timestamp for msg in msgs],
+        'gps_qual': np.array([msg.gps_qual for msg in msgs]),
+        'altitude': np.array([msg.altitude for msg in msgs]),
+    }
+
+
+def columns(data):
+    return columnar.decode(data, pynmea2.GGA)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = list(lines(count))
+    for name, func in (('objects', objects), ('columnar', columns)):
+        best = min(timeit.repeat(lambda: func(data), number=1, repeat=3))
+        print('%-9s %7.2f us/sentence' % (name, best / count * 1e6))
+
+
+if __name__ == '__main__':
+    main()
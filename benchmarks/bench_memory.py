@@ -0,0 +1,82 @@
+'''
+Reports the memory held per parsed sentence, for GGA/RMC messages, compared
+to sentence objects carrying an instance __dict__ (as before pynmea2 used
+__slots__) and non-interned talker strings, and once the sentences are
+rendered.
+
+The lines are generated while the memory is traced and only held by the
+sentences: parsed sentences keep the line they were parsed from, which
+`str()` returns.
+
+    PYTHONPATH=. python benchmarks/bench_memory.py [count]
+'''
+import sys
+import tracemalloc
+
+import pynmea2
+from pynmea2.nmea import NMEASentence, TalkerSentence
+
+
+def lines(count):
+    for i in range(count):
+        seconds = i // 10
+        t = '%02d%02d%02d.%d' % (seconds // 3600 % 24, seconds // 60 % 60,
+                                  seconds % 60, i % 10)
+        lat = '%02d%07.4f' % (19 + i % 3, (i * 0.0007) % 60)
+        lon = '%03d%07.4f' % (24 + i % 5, (i * 0.0011) % 60)
+        if i % 2:
+            body = 'GPGGA,%s,%s,S,%s,E,1,%02d,2.6,%.2f,M,-33.9,M,,0000' % (
+                t, lat, lon, 4 + i % 8, 100 + i % 50 / 7.)
+        else:
+            body = 'GPRMC,%s,A,%s,S,%s,E,%.1f,%.2f,250915,,E' % (
+                t, lat, lon, i % 100 / 3., i % 360 / 1.3)
+        yield '$%s*%02X' % (body, NMEASentence.checksum(body))
+
+
+def dict_classes():
+    '''
+    GGA and RMC with an instance __dict__
+    '''
+    classes = {}
+    for cls in (pynmea2.GGA, pynmea2.RMC):
+        name = 'Dict' + cls.__name__
+        classes[cls.__name__] = type(cls)(name, (cls,), {'__slots__': ('__dict__',)})
+        del TalkerSentence.sentence_types[name]
+    return classes
+
+
+def parse_with_dict(line, classes):
+    msg = pynmea2.parse(line)
+    return classes[msg.sentence_type](line[1:3], line[3:6], msg.data)
+
+
+def measure(func, count, render=False):
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    result = [func(line) for line in lines(count)]
+    if render:
+        for msg in result:
+            str(msg)
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    # the list holding the results is not part of the sentences
+    size -= sys.getsizeof(result)
+    del result
+    return size / float(count)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    classes = dict_classes()
+
+    before = measure(lambda line: parse_with_dict(line, classes), count)
+    after = measure(pynmea2.parse, count)
+    rendered = measure(pynmea2.parse, count, render=True)
+    print('%d GGA/RMC sentences' % count)
+    print('instance __dict__: %7.1f bytes/sentence' % before)
+    print('__slots__:         %7.1f bytes/sentence' % after)
+    print('rendered:          %7.1f bytes/sentence' % rendered)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+'''
+Measures the sentences per second received by `NMEAUDPReceiver` and
+`NMEATCPServer` from a sender on localhost.
+
+    PYTHONPATH=. python benchmarks/bench_net.py [count]
+'''
+import asyncio
+import multiprocessing
+import socket
+import sys
+import time
+
+from pynmea2.aio import NMEAUDPReceiver, NMEATCPServer
+
+from bench_memory import lines
+
+# sentences per datagram
+PER_DATAGRAM = 10
+
+
+def send(datagrams, port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    for datagram in datagrams:
+        sock.sendto(datagram, ('127.0.0.1', port))
+    sock.close()
+
+
+async def bench_udp(data, **kwargs):
+    receiver = await NMEAUDPReceiver.create('127.0.0.1', 0, **kwargs)
+    sock = receiver.transport.get_extra_info('socket')
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 24)
+    port = sock.getsockname()[1]
+    datagrams = [
+        b''.join(data[i:i + PER_DATAGRAM])
+        for i in range(0, len(data), PER_DATAGRAM)]
+
+    # UDP drops what the receiver does not keep up with, the rate is the
+    # one of the sentences received
+    sender = multiprocessing.Process(target=send, args=(datagrams, port))
+    start = time.perf_counter()
+    sender.start()
+    count = 0
+    while count < len(data):
+        try:
+            count += len(await asyncio.wait_for(receiver.read_batch(), 0.5))
+        except asyncio.TimeoutError:
+            break
+        end = time.perf_counter()
+    sender.join()
+    receiver.close()
+    return count, end - start
+
+
+async def bench_tcp(data, **kwargs):
+    server = await NMEATCPServer.create('127.0.0.1', 0, **kwargs)
+    port = server.server.sockets[0].getsockname()[1]
+
+    async def send():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b''.join(data))
+        await writer.drain()
+        writer.close()
+
+    start = time.perf_counter()
+    sender = asyncio.ensure_future(send())
+    count = 0
+    while count < len(data):
+        count += len(await server.read_batch())
+    elapsed = time.perf_counter() - start
+    await sender
+    server.close()
+    return count, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    data = [(line + '\r\n').encode('ascii') for line in lines(count)]
+    for name, bench in (('UDP', bench_udp), ('TCP', bench_tcp)):
+        for lazy in (False, True):
+            received, elapsed = asyncio.run(bench(data, lazy=lazy))
+            print('%s lazy=%-5s %7d/%d sentences %9.0f sentences/s' % (
+                name, lazy, received, count, received / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+'''
+Compares `NMEAFile.read()` against `parallel_read` with an increasing number
+of workers, returning sentence objects or GGA columns.
+
+    PYTHONPATH=. python benchmarks/bench_parallel.py [count]
+'''
+import os
+import sys
+import tempfile
+import time
+
+import pynmea2
+from pynmea2.parallel import parallel_read
+
+from bench_memory import lines
+
+
+def timed(func):
+    start = time.perf_counter()
+    count = func()
+    return count, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    cpus = os.cpu_count() or 1
+    fd, path = tempfile.mkstemp(suffix='.log')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            for line in lines(count):
+                f.write(line + '\r\n')
+
+        with pynmea2.NMEAFile(path) as f:
+            n, base = timed(lambda: len(f.read()))
+        print('%-24s %8.2f s %9.0f lines/s' % ('NMEAFile.read', base, n / base))
+
+        workers = 1
+        while True:
+            n, t = timed(lambda: sum(1 for _ in parallel_read(path, workers)))
+            print('%-24s %8.2f s %9.0f lines/s %6.2fx' % (
+                'parallel_read(%d)' % workers, t, n / t, base / t))
+            # the lines of other types are skipped, but still scanned
+            n, t = timed(lambda: sum(1 for _ in
+                                     parallel_read(path, workers, pynmea2.GGA)))
+            print('%-24s %8.2f s %9.0f lines/s %6.2fx' % (
+                'parallel_read(%d, GGA)' % workers, t, count / t, base / t))
+            if workers >= cpus:
+                break
+            workers = min(workers * 2, cpus)
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+'''
+Compares `pynmea2.parse` against the regex based parser it replaced, and
+against `parse(lazy=True)`, for each kind of sentence.
+
+    PYTHONPATH=. python benchmarks/bench_parse.py
+'''
+import operator
+import timeit
+from functools import reduce
+
+import pynmea2
+from pynmea2.nmea import NMEASentence, TalkerSentence, QuerySentence, \
+    ProprietarySentence, ParseError, SentenceTypeError, ChecksumError
+
+
+SENTENCES = [
+    ('GGA', '$GPGGA,184353.07,1929.045,S,02410.506,E,1,04,2.6,100.00,M,-33.9,M,,0000*6D'),
+    ('RMC', '$GPRMC,181031.576,V,3926.276,N,07739.361,W,99.7,18.30,250915,,E*79'),
+    ('VTG', '$GPVTG,108.53,T,,M,0.04,N,0.07,K,A*31'),
+    ('GSV', '$GPGSV,3,1,09,12,28,063,33,14,63,000,32,22,68,150,26,25,40,109,23*7B'),
+    ('query', '$CCGPQ,GGA*2B'),
+    ('PGRME', '$PGRME,15.0,M,45.0,M,25.0,M*1C'),
+    ('PASHR', '$PASHR,130533.620,0.311,T,-80.467,-1.395,0.25,0.066,0.067,0.215,2,3*12'),
+    ('PSXN', '$PSXN,23,0.30,-0.97,298.57,0.13*1B'),
+]
+
+
+def regex_parse(line, check=False):
+    '''
+    The regex based implementation of `NMEASentence.parse` (pynmea2 1.19.0)
+    '''
+    match = NMEASentence.sentence_re.match(line)
+    if not match:
+        raise ParseError('could not parse data', line)
+
+    nmea_str = match.group('nmea_str')
+    data_str = match.group('data')
+    checksum = match.group('checksum')
+    sentence_type = match.group('sentence_type').upper()
+    data = data_str.split(',')
+
+    if checksum:
+        cs1 = int(checksum, 16)
+        cs2 = reduce(operator.xor, map(ord, nmea_str), 0)
+        if cs1 != cs2:
+            raise ChecksumError(
+                'checksum does not match: %02X != %02X' % (cs1, cs2), data)
+    elif check:
+        raise ChecksumError(
+            'strict checking requested but checksum missing', data)
+
+    talker_match = NMEASentence.talker_re.match(sentence_type)
+    if talker_match:
+        cls = TalkerSentence.sentence_types.get(talker_match.group('sentence'))
+        if not cls:
+            raise SentenceTypeError(
+                'Unknown sentence type %s' % sentence_type, line)
+        return cls(talker_match.group('talker'),
+                   talker_match.group('sentence'), data)
+
+    query_match = NMEASentence.query_re.match(sentence_type)
+    if query_match and not data_str:
+        return QuerySentence(query_match.group('talker'),
+                             query_match.group('listener'),
+                             query_match.group('sentence'))
+
+    proprietary_match = NMEASentence.proprietary_re.match(sentence_type)
+    if proprietary_match:
+        manufacturer = proprietary_match.group('manufacturer')
+        cls = ProprietarySentence.sentence_types.get(
+            manufacturer, ProprietarySentence)
+        return cls(manufacturer, data)
+
+    raise ParseError(
+        'could not parse sentence type: %r' % sentence_type, line)
+
+
+def bench(func, line, number=20000, repeat=7):
+    '''
+    Best time per call, in microseconds
+    '''
+    timer = timeit.Timer(lambda: func(line))
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def main():
+    print('%-8s %10s %10s %8s %10s' % (
+        'type', 'regex us', 'parse us', 'speedup', 'lazy us'))
+    for name, line in SENTENCES:
+        assert str(regex_parse(line)) == str(pynmea2.parse(line))
+        old = bench(regex_parse, line)
+        new = bench(pynmea2.parse, line)
+        lazy = bench(lambda l: pynmea2.parse(l, lazy=True), line)
+        print('%-8s %10.2f %10.2f %7.2fx %10.2f' % (
+            name, old, new, old / new, lazy))
+
+
+if __name__ == '__main__':
+    main()
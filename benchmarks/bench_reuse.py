@@ -0,0 +1,68 @@
+'''
+Compares reading a 100 Hz attitude stream (ASHRATT, PSXN,23 and FECGPatt
+sentences) with `NMEAStreamReader`, creating a sentence per line, and with
+`reuse=True`, parsing each line into the last sentence of its class.
+
+Reports the time per sentence, and the sentence objects and `data` lists
+allocated for the consumer per sentence, with their size. The field strings
+are allocated either way and not counted.
+
+    PYTHONPATH=. python benchmarks/bench_reuse.py [count]
+'''
+import sys
+import timeit
+
+import pynmea2
+from pynmea2.nmea import NMEASentence
+
+
+def lines(count):
+    for i in range(count):
+        seconds = i // 100
+        t = '%02d%02d%02d.%02d' % (seconds // 3600 % 24, seconds // 60 % 60,
+                                   seconds % 60, i % 100)
+        roll = (i % 200 - 100) / 37.
+        pitch = (i % 150 - 75) / 41.
+        heading = i * 0.013 % 360
+        kind = i % 3
+        if kind == 0:
+            body = 'PASHR,%s,%.3f,T,%.3f,%.3f,,0.066,0.067,0.215,2,3' % (
+                t, heading, roll, pitch)
+        elif kind == 1:
+            body = 'PSXN,23,%.2f,%.2f,%.2f,0.13' % (roll, pitch, heading)
+        else:
+            body = 'PFEC,GPatt,%.1f,%.1f,%.1f' % (heading, pitch, roll)
+        yield '$%s*%02X' % (body, NMEASentence.checksum(body))
+
+
+def allocated(data, reuse):
+    '''
+    Returns the number of distinct sentence objects and data lists yielded,
+    and their size in bytes
+    '''
+    seen = {}
+    for msg in pynmea2.NMEAStreamReader(reuse=reuse).next(data):
+        seen[id(msg)] = msg
+        seen[id(msg.data)] = msg.data
+    return len(seen), sum(sys.getsizeof(obj) for obj in seen.values())
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = ''.join(line + '\r\n' for line in lines(count)).encode('ascii')
+
+    print('%d attitude sentences' % count)
+    for name, reuse in (('parse', False), ('reuse', True)):
+        def read():
+            for msg in pynmea2.NMEAStreamReader(reuse=reuse).next(data):
+                msg.roll
+        best = min(timeit.repeat(read, number=1, repeat=5))
+        objects, size = allocated(data, reuse)
+        print('%-9s %7.2f us/sentence %6.2f objects/sentence '
+              '%7.1f bytes/sentence' % (name, best / count * 1e6,
+                                        objects / float(count),
+                                        size / float(count)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+'''
+Compares rendering GGA sentences from numbers with a sentence template
+against formatting each field and rendering a new sentence object.
+
+    PYTHONPATH=. python benchmarks/bench_template.py [count]
+'''
+import sys
+import timeit
+
+import pynmea2
+
+
+def rows(count):
+    for i in range(count):
+        seconds = i // 10
+        t = '%02d%02d%02d.%d' % (seconds // 3600 % 24, seconds // 60 % 60,
+                                  seconds % 60, i % 10)
+        yield (t, 1900 + (i * 0.0007) % 60, 'S', 2400 + (i * 0.0011) % 60,
+               'E', 1, 4 + i % 8, 2.6, 100 + i % 50 / 7., -33.9, '0000')
+
+
+def objects(data):
+    return [pynmea2.GGA('GP', 'GGA', (
+        t, '%09.4f' % lat, lat_dir, '%010.4f' % lon, lon_dir, str(qual),
+        '%02d' % sats, '%.1f' % hdop, '%.2f' % alt, 'M', '%.1f' % sep, 'M',
+        '', station)).render()
+        for t, lat, lat_dir, lon, lon_dir, qual, sats, hdop, alt, sep,
+        station in data]
+
+
+def template(data):
+    gga = pynmea2.GGA.template(
+        'GP', lat='%09.4f', lon='%010.4f', num_sats='%02d',
+        horizontal_dil='%.1f', altitude='%.2f', altitude_units='M',
+        geo_sep='%.1f', geo_sep_units='M', age_gps_data='')
+    render = gga.render
+    return [render(values) for values in data]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = list(rows(count))
+    assert objects(data[:100]) == template(data[:100])
+    for name, func in (('objects', objects), ('template', template)):
+        best = min(timeit.repeat(lambda: func(data), number=1, repeat=3))
+        print('%-9s %7.2f us/sentence' % (name, best / count * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+'''
+Compares writing GGA/RMC sentences to a file with `NMEAWriter` against
+writing `str(msg)` for each sentence.
+
+    PYTHONPATH=. python benchmarks/bench_write.py [count]
+'''
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+import pynmea2
+
+from bench_memory import lines
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    msgs = pynmea2.parse_many(lines(count))[0]
+    tuples = [(msg.talker + msg.sentence_type,) + tuple(msg.data)
+              for msg in msgs]
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, 'out.nmea')
+    try:
+        def naive():
+            with open(path, 'w', newline='') as f:
+                for msg in msgs:
+                    f.write(str(msg) + '\r\n')
+
+        def writer():
+            with pynmea2.NMEAFile(path, 'w') as f:
+                f.write_many(msgs)
+
+        def writer_tuples():
+            with pynmea2.NMEAFile(path, 'w') as f:
+                f.write_many(tuples)
+
+        for name, func in (('str(msg)', naive), ('NMEAWriter', writer),
+                           ('tuples', writer_tuples)):
+            best = min(timeit.repeat(func, number=1, repeat=3))
+            print('%-10s %7.2f us/sentence %9d sentences/s'
+                  % (name, best / count * 1e6, count / best))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,11 +7,16 @@ version = __version__
 
 from .nmea import NMEASentence, ProprietarySentence, QuerySentence
 from .nmea import ChecksumError, ParseError, SentenceTypeError
+from .nmea import ParseFailure, PARSE_ERROR, SENTENCE_TYPE_ERROR, \
+    CHECKSUM_MISMATCH, CHECKSUM_MISSING
 
 parse = NMEASentence.parse
+try_parse = NMEASentence.try_parse
+parse_many = NMEASentence.parse_many
+parse_into = NMEASentence.parse_into
 
 from .types import *
 
-from .stream import NMEAStreamReader
+from .stream import NMEAStreamReader, NMEAWriter, DatetimeTracker
 from .nmea_file import NMEAFile
 
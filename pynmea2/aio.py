@@ -0,0 +1,347 @@
+'''
+Reads NMEA sentences from asyncio streams, UDP broadcasts and TCP
+connections.
+
+Requires Python 3.7+
+'''
+import asyncio
+
+from .stream import NMEAStreamReader, ERRORS, MAX_LINE_LENGTH
+
+__all__ = ['AsyncNMEAStreamReader', 'NMEAUDPReceiver', 'NMEATCPClient',
+           'NMEATCPServer']
+
+# default `chunk_size` of AsyncNMEAStreamReader
+CHUNK_SIZE = 65536
+
+# the port assigned to NMEA 0183 over UDP and TCP (IEC 61162-450)
+PORT = 10110
+
+
+class AsyncNMEAStreamReader(object):
+    '''
+    Reads NMEA sentences from an `asyncio.StreamReader`, or any object with
+    a coroutine `read(size)` method returning strings or `bytes`.
+
+      async for msg in AsyncNMEAStreamReader(reader):
+          print(msg)
+
+    The stream is read in chunks of up to `chunk_size`, which are split into
+    lines and parsed as by `NMEAStreamReader`. The other arguments are the
+    same as for `NMEAStreamReader`.
+    '''
+    def __init__(self, stream, errors='raise', lazy=False,
+                 include=None, exclude=None,
+                 max_line_length=MAX_LINE_LENGTH, chunk_size=CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.reader = NMEAStreamReader(
+            errors=errors, lazy=lazy, include=include, exclude=exclude,
+            max_line_length=max_line_length)
+        # the sentences of the last chunk which were not returned yet
+        self._batch = iter(())
+        self._eof = False
+
+    async def read_chunk(self):
+        '''
+        Reads a chunk from the stream and returns a generator of the
+        sentences it completes, as `NMEAStreamReader.next`, or None at the
+        end of the stream.
+        '''
+        if self._eof:
+            return None
+        data = await self.stream.read(self.chunk_size)
+        if not data:
+            self._eof = True
+            # the last line does not need to be terminated
+            buffer = self.reader.buffer
+            if not buffer:
+                return None
+            data = b'\n' if isinstance(buffer, bytes) else '\n'
+        return self.reader.next(data)
+
+    async def read_batch(self):
+        '''
+        Reads a chunk from the stream and returns the list of sentences it
+        completes (may be empty), or None at the end of the stream.
+        '''
+        batch = await self.read_chunk()
+        if batch is None:
+            return None
+        return list(batch)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            msg = next(self._batch, None)
+            if msg is not None:
+                return msg
+            batch = await self.read_chunk()
+            if batch is None:
+                raise StopAsyncIteration
+            self._batch = batch
+
+
+class _Batches(object):
+    '''
+    Collects the sentences received in the background, and hands them out
+    in batches with `read_batch` or by iterating with `async for`
+    '''
+    def __init__(self, errors='raise', lazy=False, include=None,
+                 exclude=None, max_line_length=MAX_LINE_LENGTH):
+        if errors not in ERRORS:
+            raise ValueError('errors must be one of %r (was: %r)'
+                             % (ERRORS, errors))
+        self.errors = errors
+        self.lazy = lazy
+        self.include = include
+        self.exclude = exclude
+        self.max_line_length = max_line_length
+        self._msgs = []
+        # the error to raise from `read_batch`: a ParseError with
+        # errors='raise', or an unexpected error of a connection
+        self._error = None
+        self._waiter = None
+        self._closed = False
+
+    def _reader(self):
+        return NMEAStreamReader(
+            errors=self.errors, lazy=self.lazy, include=self.include,
+            exclude=self.exclude, max_line_length=self.max_line_length)
+
+    def _collect(self, msgs):
+        '''
+        Adds the sentences of `msgs`, a generator from
+        `NMEAStreamReader.next`, to the next batch
+        '''
+        append = self._msgs.append
+        try:
+            for msg in msgs:
+                append(msg)
+        except Exception as e:
+            self._fail(e)
+        self._wake()
+
+    def _fail(self, error):
+        '''
+        Keeps the first error since the last batch, to be raised by
+        `read_batch`
+        '''
+        if self._error is None:
+            self._error = error
+        self._wake()
+
+    def _wake(self):
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def read_batch(self):
+        '''
+        Returns the list of all the sentences received since the last call,
+        waiting for at least one. Returns None once closed.
+
+        With errors='raise', the first ParseError since the last call is
+        raised instead, after the sentences received before it are returned.
+        So are unexpected errors of the connections, which are closed (and
+        reopened by `NMEATCPClient`).
+        '''
+        while not self._msgs:
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+            if self._closed:
+                return None
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        msgs, self._msgs = self._msgs, []
+        return msgs
+
+    def close(self):
+        self._closed = True
+        self._wake()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        batch = await self.read_batch()
+        if batch is None:
+            raise StopAsyncIteration
+        return batch
+
+
+class NMEAUDPReceiver(_Batches, asyncio.DatagramProtocol):
+    '''
+    Receives NMEA sentences broadcast over UDP. Each datagram may hold
+    several sentences, and the last one does not need to be terminated.
+
+      receiver = await NMEAUDPReceiver.create(port=10110)
+      async for batch in receiver:
+          for msg in batch:
+              print(msg)
+
+    The arguments are the same as for `NMEAStreamReader`.
+    '''
+    def __init__(self, **kwargs):
+        _Batches.__init__(self, **kwargs)
+        self.transport = None
+        self.reader = self._reader()
+
+    @classmethod
+    async def create(cls, host='0.0.0.0', port=PORT, **kwargs):
+        '''
+        Returns a receiver listening on `host` and `port`
+        '''
+        loop = asyncio.get_running_loop()
+        transport, receiver = await loop.create_datagram_endpoint(
+            lambda: cls(**kwargs), local_addr=(host, port))
+        return receiver
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        if not data.endswith(b'\n'):
+            data += b'\n'
+        self._collect(self.reader.next(data))
+
+    def connection_lost(self, exc):
+        _Batches.close(self)
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+        _Batches.close(self)
+
+
+class NMEATCPServer(_Batches):
+    '''
+    Receives NMEA sentences from the devices connecting to it over TCP.
+    The sentences of all the connections are handed out together.
+
+      server = await NMEATCPServer.create(port=10110)
+      async for batch in server:
+          ...
+
+    `chunk_size` and the other arguments are the same as for
+    `AsyncNMEAStreamReader`.
+    '''
+    def __init__(self, chunk_size=CHUNK_SIZE, **kwargs):
+        _Batches.__init__(self, **kwargs)
+        self.chunk_size = chunk_size
+        self.server = None
+
+    @classmethod
+    async def create(cls, host=None, port=PORT, **kwargs):
+        '''
+        Returns a server listening on `host` and `port`
+        '''
+        server = cls(**kwargs)
+        server.server = await asyncio.start_server(server._handle, host, port)
+        return server
+
+    async def _handle(self, reader, writer):
+        stream = AsyncNMEAStreamReader(
+            reader, errors=self.errors, lazy=self.lazy, include=self.include,
+            exclude=self.exclude, max_line_length=self.max_line_length,
+            chunk_size=self.chunk_size)
+        try:
+            while not self._closed:
+                msgs = await stream.read_chunk()
+                if msgs is None:
+                    break
+                self._collect(msgs)
+        except OSError:
+            pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._fail(e)
+        finally:
+            writer.close()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+        _Batches.close(self)
+
+
+class NMEATCPClient(_Batches):
+    '''
+    Receives NMEA sentences from a TCP server, reconnecting when the
+    connection fails or is closed. The delay before reconnecting starts at
+    `min_delay` seconds and doubles with each failed attempt, up to
+    `max_delay`.
+
+      client = await NMEATCPClient.create('localhost', 10110)
+      async for batch in client:
+          ...
+
+    `chunk_size` and the other arguments are the same as for
+    `AsyncNMEAStreamReader`.
+    '''
+    def __init__(self, host, port=PORT, min_delay=0.5, max_delay=30.0,
+                 chunk_size=CHUNK_SIZE, **kwargs):
+        _Batches.__init__(self, **kwargs)
+        self.host = host
+        self.port = port
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.chunk_size = chunk_size
+        # the number of connections made
+        self.connections = 0
+        self._task = None
+
+    @classmethod
+    async def create(cls, host, port=PORT, **kwargs):
+        '''
+        Returns a client connecting to `host` and `port` in the background
+        '''
+        client = cls(host, port, **kwargs)
+        client._task = asyncio.ensure_future(client._run())
+        return client
+
+    async def _run(self):
+        delay = self.min_delay
+        while not self._closed:
+            try:
+                reader, writer = await asyncio.open_connection(
+                    self.host, self.port)
+            except OSError:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_delay)
+                continue
+
+            self.connections += 1
+            delay = self.min_delay
+            stream = AsyncNMEAStreamReader(
+                reader, errors=self.errors, lazy=self.lazy,
+                include=self.include, exclude=self.exclude,
+                max_line_length=self.max_line_length,
+                chunk_size=self.chunk_size)
+            try:
+                while True:
+                    msgs = await stream.read_chunk()
+                    if msgs is None:
+                        break
+                    self._collect(msgs)
+            except OSError:
+                pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._fail(e)
+            finally:
+                writer.close()
+            await asyncio.sleep(delay)
+
+    def close(self):
+        if self._task is not None:
+            self._task.cancel()
+        _Batches.close(self)
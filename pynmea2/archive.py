@@ -0,0 +1,439 @@
+'''
+Binary archive of parsed sentences, which loads much faster than the log
+they were parsed from.
+
+An archive holds blocks of up to `BLOCK_SIZE` sentences. In each block, the
+sentences are grouped by class (named by its path in the `sentence_types`
+registries, such as `['TalkerSentence', 'GGA']`), by their other slots
+(talker, manufacturer, ...) and by their number of fields, and each group is
+stored by column:
+
+    'f'     fields converted with float or Decimal, as doubles (NaN if
+            empty) with the width and precision to render them back
+    'i'     fields converted with int, as 64-bit integers
+    's'     other fields, as UTF-8 text separated by newlines
+
+Numeric columns are only used when all their values render back to the
+same text, so sentences read back have the same `data`, and `render()` the
+same text, as the ones written.
+
+      with ArchiveWriter('log.nmea.arc') as archive:
+          archive.write_many(pynmea2.NMEAFile('log.nmea'))
+      ...
+      with ArchiveReader('log.nmea.arc') as archive:
+          for msg in archive:
+              ...
+'''
+import json
+import struct
+import sys
+from array import array
+from decimal import Decimal
+from itertools import repeat
+
+from . import nmea
+from .nmea import NMEASentence
+
+__all__ = ['ArchiveWriter', 'ArchiveReader']
+
+MAGIC = b'NMEAARC\n'
+VERSION = 1
+
+# default number of sentences per block
+BLOCK_SIZE = 1 << 16
+
+# value of 'i' columns for empty fields, the same as `columnar.MISSING_INT`
+_MISSING = -(1 << 63)
+
+_BLOCK_HEADER = struct.Struct('<Q')
+
+
+def _class_path(cls):
+    '''
+    Returns the names under which `cls` and its bases are registered, from
+    the `sentence_types` of `NMEASentence` down
+    '''
+    path = []
+    while cls is not NMEASentence:
+        path.append(cls.__name__)
+        cls = cls.__bases__[0]
+    return path[::-1]
+
+
+def _resolve(path):
+    '''
+    Returns the class registered under `path`, see `_class_path`
+    '''
+    cls = NMEASentence
+    for name in path:
+        cls = cls.sentence_types[name]
+    return cls
+
+
+class ArchiveWriter(object):
+    '''
+    Writes sentences to an archive, see the module documentation. `f` is a
+    path or a binary file.
+    '''
+    def __init__(self, f, block_size=BLOCK_SIZE):
+        if isinstance(f, str):
+            f = open(f, 'wb')
+        self._file = f
+        self.block_size = block_size
+        # (class, state, number of fields) -> index, rows of the group
+        self._groups = {}
+        # index of the group of each sentence of the block
+        self._order = array('i')
+        f.write(MAGIC)
+        f.write(json.dumps({
+            'version': VERSION,
+            'byteorder': sys.byteorder,
+        }).encode('utf-8') + b'\n')
+
+    def write(self, msg):
+        '''
+        Adds a sentence to the archive. Raises ValueError for sentences
+        whose class is not registered, or whose data or other slots are not
+        strings
+        '''
+        t = type(msg)
+        data = tuple(msg.data)
+        state = []
+        for name, slot in t._state_slots:
+            if name == 'data':
+                continue
+            try:
+                state.append((name, slot.__get__(msg, t)))
+            except AttributeError:
+                pass
+        key = t, tuple(state), len(data)
+        group = self._groups.get(key)
+        if group is None:
+            self._check(msg, state)
+            group = self._groups[key] = len(self._groups), []
+        self._order.append(group[0])
+        group[1].append(data)
+        if len(self._order) >= self.block_size:
+            self.flush()
+
+    def write_many(self, msgs):
+        '''
+        Adds the sentences of an iterable to the archive
+        '''
+        write = self.write
+        for msg in msgs:
+            write(msg)
+
+    @staticmethod
+    def _check(msg, state):
+        t = type(msg)
+        try:
+            registered = _resolve(_class_path(t)) is t
+        except (KeyError, AttributeError):
+            registered = False
+        if not registered:
+            raise ValueError('cannot archive %r: %s is not registered'
+                             % (msg, t.__name__))
+        for name, value in state:
+            if not isinstance(value, str):
+                raise ValueError('cannot archive %r: %s is not a string'
+                                 % (msg, name))
+
+    def flush(self):
+        '''
+        Writes the sentences added since the last block as a block
+        '''
+        if not self._order:
+            return
+        groups = []
+        sections = [self._order.tobytes()]
+        for (t, state, width), (_, rows) in sorted(
+                self._groups.items(), key=lambda item: item[1][0]):
+            fields = t.fields
+            columns = []
+            for i, values in enumerate(zip(*rows) if width else ()):
+                field = fields[i] if i < len(fields) else ()
+                spec, section = _encode_column(field, values, t)
+                columns.append([spec[0], len(section)] + spec[1:])
+                sections.append(section)
+            groups.append({
+                'class': _class_path(t),
+                'state': state,
+                'count': len(rows),
+                'columns': columns,
+            })
+
+        header = json.dumps({
+            'count': len(self._order),
+            'groups': groups,
+        }).encode('utf-8')
+        self._file.write(_BLOCK_HEADER.pack(len(header)))
+        self._file.write(header)
+        for section in sections:
+            self._file.write(section)
+        self._groups = {}
+        self._order = array('i')
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _encode_column(field, values, cls):
+    '''
+    Returns the spec (kind and format, see the module documentation) and the
+    bytes of a column of values of `field`
+    '''
+    convert = field[2] if len(field) > 2 else None
+    if convert is float or convert is Decimal or convert is int:
+        fmt = _number_format(values, convert is int)
+        if fmt is not None:
+            spec, typecode, missing, cast = fmt
+            fmt = _format(spec)
+            try:
+                column = array(typecode, [
+                    cast(v) if v else missing for v in values])
+            except (ValueError, OverflowError):
+                column = None
+            # NaN is the missing value of float columns
+            if column is not None and all(
+                    (fmt % x if x == x and x != missing else '') == v
+                    for x, v in zip(column, values)):
+                return spec, column.tobytes()
+
+    try:
+        text = '\n'.join(values)
+    except TypeError:
+        text = None
+    if text is None or text.count('\n') != len(values) - 1:
+        raise ValueError('cannot archive %s sentences: field values must '
+                         'be strings without newlines' % cls.__name__)
+    return ['s'], text.encode('utf-8')
+
+
+def _number_format(values, integer):
+    '''
+    Returns the spec, typecode, value for empty fields and conversion of a
+    numeric column, from its first value, or None
+    '''
+    for v in values:
+        if v:
+            break
+    else:
+        return None
+    if not isinstance(v, str):
+        return None
+    digits = v.lstrip('-')
+    whole = digits.split('.')[0]
+    # zero padded, as in '04' or '02410.506'
+    width = len(v) if len(whole) > 1 and whole[0] == '0' else 0
+    if integer:
+        return ['i', width], 'q', _MISSING, int
+    decimals = len(digits) - len(whole) - 1 if '.' in digits else 0
+    return ['f', width, decimals], 'd', float('nan'), float
+
+
+def _format(spec):
+    if spec[0] == 'i':
+        return '%%0%dd' % spec[1]
+    return '%%0%d.%df' % (spec[1], spec[2])
+
+
+class ArchiveReader(object):
+    '''
+    Reads the sentences of an archive, see the module documentation. `f` is
+    a path or a binary file.
+    '''
+    def __init__(self, f):
+        opened = isinstance(f, str)
+        if opened:
+            f = open(f, 'rb')
+        self._file = f
+        try:
+            self._read_header()
+        except Exception:
+            if opened:
+                f.close()
+            raise
+        self._classes = {}
+
+    def _read_header(self):
+        f = self._file
+        if f.readline() != MAGIC:
+            raise ValueError('not an NMEA archive: %r'
+                             % getattr(f, 'name', f))
+        header = json.loads(f.readline().decode('utf-8'))
+        if header['version'] != VERSION:
+            raise ValueError('unsupported NMEA archive version: %r'
+                             % header['version'])
+        self._swap = header['byteorder'] != sys.byteorder
+        # offset of the first block
+        self._start = f.tell()
+
+    def _blocks(self):
+        '''
+        Yields the group index of each sentence of each block, and its
+        groups as `(class, header, sections)`
+        '''
+        f = self._file
+        f.seek(self._start)
+        while True:
+            size = f.read(_BLOCK_HEADER.size)
+            if not size:
+                return
+            header = json.loads(f.read(
+                _BLOCK_HEADER.unpack(size)[0]).decode('utf-8'))
+            order = self._array('i', f.read(4 * header['count']))
+            groups = []
+            for group in header['groups']:
+                path = tuple(group['class'])
+                cls = self._classes.get(path)
+                if cls is None:
+                    cls = self._classes[path] = _resolve(path)
+                sections = [f.read(column[1]) for column in group['columns']]
+                groups.append((cls, group, sections))
+            yield order, groups
+
+    def _array(self, typecode, data):
+        a = array(typecode)
+        a.frombytes(data)
+        if self._swap:
+            a.byteswap()
+        return a
+
+    def _values(self, column, section):
+        '''
+        Returns the text of the fields of a column
+        '''
+        kind = column[0]
+        if kind == 's':
+            return section.decode('utf-8').split('\n')
+        fmt = _format([kind] + column[2:])
+        if kind == 'i':
+            return ['' if x == _MISSING else fmt % x
+                    for x in self._array('q', section)]
+        return ['' if x != x else fmt % x for x in self._array('d', section)]
+
+    def __iter__(self):
+        new = object.__new__
+        set_cache = nmea._set_cache
+        set_data = nmea._set_data
+        for order, groups in self._blocks():
+            nexts = []
+            for cls, group, sections in groups:
+                slots = dict(cls._state_slots)
+                setters = tuple((slots[name].__set__, value)
+                                for name, value in group['state'])
+                columns = [self._values(column, section) for column, section
+                           in zip(group['columns'], sections)]
+                if columns:
+                    rows = zip(*columns)
+                else:
+                    rows = repeat((), group['count'])
+                msgs = []
+                append = msgs.append
+                for row in rows:
+                    msg = new(cls)
+                    set_cache(msg, None)
+                    for setter, value in setters:
+                        setter(msg, value)
+                    set_data(msg, list(row))
+                    append(msg)
+                nexts.append(iter(msgs).__next__)
+            for msg in [nexts[i]() for i in order]:
+                yield msg
+
+    def read(self):
+        '''
+        Returns the list of the sentences of the archive
+        '''
+        return list(self)
+
+    def decode(self, cls):
+        '''
+        Returns the columns of the sentences of class `cls` in the archive,
+        as `columnar.decode` would for the lines of the original log, but
+        without converting the numeric fields again. Requires numpy.
+        '''
+        import numpy as np
+        from . import columnar
+
+        fields = cls.fields
+        indexes = []
+        parts = [[] for _ in fields]
+        start = 0
+        for order, groups in self._blocks():
+            order = np.frombuffer(order, np.int32)
+            for g, (group_cls, group, sections) in enumerate(groups):
+                if group_cls is not cls:
+                    continue
+                indexes.append(start + np.flatnonzero(order == g))
+                columns = list(zip(group['columns'], sections))
+                for i, field in enumerate(fields):
+                    if i < len(columns):
+                        parts[i].append(self._decode(field, *columns[i]))
+                    else:
+                        parts[i].append(columnar._column(
+                            field, [''] * group['count']))
+            start += len(order)
+
+        if indexes:
+            indexes = np.argsort(np.concatenate(indexes), kind='stable')
+        result = {}
+        for field, arrays in zip(fields, parts):
+            if arrays:
+                column = np.concatenate(arrays)[indexes]
+            else:
+                column = columnar._column(field, [])
+            result[field[1]] = column
+        return result
+
+    def _decode(self, field, column, section):
+        '''
+        Returns the NumPy array of a column for `decode`
+        '''
+        import numpy as np
+        from . import columnar
+
+        kind = column[0]
+        if kind == 'f':
+            return np.array(self._array('d', section), dtype=np.float64)
+        if kind == 'i':
+            # `_MISSING` is `columnar.MISSING_INT`
+            return np.array(self._array('q', section), dtype=np.int64)
+        if columnar.field_dtype(field) is None and section.isascii():
+            return _bytes_column(np, section)
+        return columnar._column(field, self._values(column, section))
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _bytes_column(np, section):
+    '''
+    Returns the fixed width bytes array of the values of an ASCII 's'
+    column, as `columnar` would encode them, without splitting it into
+    Python objects
+    '''
+    buf = np.frombuffer(section, np.uint8)
+    newline = buf == ord('\n')
+    keep = ~newline
+    starts = np.concatenate(([0], np.flatnonzero(newline) + 1))
+    lengths = np.diff(np.concatenate((starts, [len(buf) + 1]))) - 1
+    width = max(int(lengths.max()), 1)
+    result = np.zeros((len(starts), width), np.uint8)
+    rows = np.cumsum(newline)[keep]
+    result[rows, np.flatnonzero(keep) - starts[rows]] = buf[keep]
+    return result.view('S%d' % width).ravel()
@@ -0,0 +1,291 @@
+'''
+Decodes batches of sentences of one class into NumPy arrays, one column per
+entry of the class `fields`, without creating a sentence object per line.
+
+The dtype of each column follows the converter of its field:
+
+    float, Decimal  float64, NaN if missing or invalid
+    int             int64, `MISSING_INT` if missing or invalid
+    timestamp       float64 seconds of the day, NaN if missing or invalid
+    datestamp       datetime64[D], NaT if missing or invalid
+    others          fixed width bytes
+
+Requires numpy (`pip install pynmea2[numpy]`).
+'''
+from decimal import Decimal
+
+import numpy as np
+
+from . import nmea
+from .nmea import NMEASentence, TalkerSentence, ProprietarySentence
+from .nmea_utils import timestamp, datestamp, timestamp_array, \
+    datestamp_array
+
+__all__ = ['decode', 'decode_array', 'field_dtype', 'MISSING_INT']
+
+ERRORS = ('raise', 'ignore')
+
+# value of int columns for missing or invalid fields, which no NMEA field
+# holds
+MISSING_INT = np.iinfo(np.int64).min
+
+_HEXPAIRS = dict(
+    (cast(a + b), int(a + b, 16))
+    for cast in (str, lambda s: s.encode('ascii'))
+    for a in '0123456789ABCDEFabcdef' for b in '0123456789ABCDEFabcdef')
+
+
+def field_dtype(field):
+    '''
+    Returns the dtype of the column for an entry of `fields`, or None for
+    a bytes column (whose width depends on the data)
+    '''
+    convert = field[2] if len(field) > 2 else None
+    if convert is timestamp:
+        return np.dtype(np.float64)
+    if convert is datestamp:
+        return np.dtype('datetime64[D]')
+    if convert is float or convert is Decimal:
+        return np.dtype(np.float64)
+    if convert is int:
+        return np.dtype(np.int64)
+    return None
+
+
+def decode(lines, cls, check=False, errors='raise'):
+    '''
+    Decodes the sentences of class `cls` among `lines` (strings or
+    bytes-like objects) into a dict of arrays keyed by field name.
+
+    Lines of other sentence types are skipped. `errors` is `'raise'`
+    (default) to raise the exception `parse` would for lines which could not
+    be parsed, or `'ignore'` to skip them.
+    '''
+    if errors not in ERRORS:
+        raise ValueError('errors must be one of %r (was: %r)'
+                         % (ERRORS, errors))
+
+    width = len(cls.fields)
+    rows = _rows(lines, cls, check, errors)
+    if all(row.count(',') == width - 1 for row in rows):
+        # split all the rows at once, and take every `width`th field
+        values = ','.join(rows).split(',') if rows else []
+        columns = [values[i::width] for i in range(width)]
+    else:
+        rows = [(row.split(',') + [''] * width)[:width] for row in rows]
+        columns = list(zip(*rows)) if rows else [()] * width
+
+    result = {}
+    for field, column in zip(cls.fields, columns):
+        result[field[1]] = _column(field, column)
+    return result
+
+
+def decode_array(lines, cls, check=False, errors='raise'):
+    '''
+    Same as `decode`, but returns a NumPy structured array
+    '''
+    columns = decode(lines, cls, check, errors)
+    names = [f[1] for f in cls.fields]
+    array = np.empty(
+        len(columns[names[0]]) if names else 0,
+        dtype=[(name, columns[name].dtype) for name in names])
+    for name in names:
+        array[name] = columns[name]
+    return array
+
+
+def _rows(lines, cls, check, errors):
+    '''
+    Returns the data strings of the sentences of class `cls` in `lines`
+    '''
+    rows = []
+    # for the rows whose checksum is verified in bulk by `_checksums`: the
+    # index of their line, their sentence and its checksum (-1 if missing)
+    indexes = []
+    strs = []
+    sums = []
+    # the first line which could not be parsed, and its failure
+    error = None
+
+    # raw address -> False if its sentences are not of class `cls`, True if
+    # they are, or a function instantiating them for classes which choose
+    # their type or transform the data when constructed
+    addresses = {}
+    hexpairs = _HEXPAIRS
+    for i, line in enumerate(lines):
+        if isinstance(line, str):
+            syntax = nmea._TEXT_SYNTAX
+        else:
+            if not isinstance(line, bytes):
+                line = bytes(line)
+            syntax = nmea._BYTES_SYNTAX
+
+        scan = nmea._scan(line, syntax)
+        if scan is None:
+            if error is None:
+                error = i, line, nmea.PARSE_ERROR
+            continue
+
+        nmea_str, kind, checksum = scan
+        head = nmea_str[:kind]
+        match = addresses.get(head)
+        if match is None:
+            match = addresses[head] = _match(head, kind, cls)
+        if match is False:
+            continue
+
+        data_str = nmea_str[kind:]
+        if isinstance(data_str, bytes):
+            data_str = data_str.decode(nmea.ENCODING)
+
+        if match is True:
+            if checksum:
+                sums.append(hexpairs[checksum])
+            elif check:
+                if error is None:
+                    error = i, line, nmea.CHECKSUM_MISSING
+                continue
+            else:
+                sums.append(-1)
+            indexes.append(i)
+            strs.append(nmea_str)
+            rows.append(data_str)
+            continue
+
+        failure = nmea._verify(scan, check)
+        if failure is not None:
+            if error is None:
+                error = i, line, failure
+            continue
+        try:
+            msg = match(data_str.split(','))
+        except Exception:
+            # the data does not fit the class, such as too few fields
+            if error is None:
+                error = i, line, nmea.PARSE_ERROR
+            continue
+        if type(msg) is cls:
+            indexes.append(i)
+            strs.append(nmea_str)
+            sums.append(-1)
+            rows.append(','.join(msg.data))
+
+    if not rows:
+        bad = np.zeros(0, dtype=bool)
+    else:
+        sums = np.array(sums)
+        bad = (sums != -1) & (_checksums(strs) != sums)
+    if errors == 'raise':
+        if bad.any():
+            j = int(np.argmax(bad))
+            if error is None or indexes[j] < error[0]:
+                # `lines` may be an iterator: the line is rebuilt from its
+                # sentence and checksum
+                nmea_str = strs[j]
+                checksum = '*%02X' % sums[j]
+                if isinstance(nmea_str, bytes):
+                    checksum = checksum.encode('ascii')
+                error = indexes[j], nmea_str + checksum, \
+                    nmea.CHECKSUM_MISMATCH
+        if error is not None:
+            raise error[2].exception(error[1])
+    if bad.any():
+        rows = [row for row, b in zip(rows, bad) if not b]
+    return rows
+
+
+def _checksums(strs):
+    '''
+    Computes the checksums of a list of sentences (text or bytes)
+    '''
+    try:
+        if all(isinstance(s, str) for s in strs):
+            joined = ''.join(strs).encode(nmea.ENCODING)
+        else:
+            joined = b''.join(s if isinstance(s, bytes) else
+                              s.encode(nmea.ENCODING) for s in strs)
+    except UnicodeEncodeError:
+        return np.array([NMEASentence.checksum(s) if isinstance(s, str)
+                         else nmea._xor_bytes(s) for s in strs])
+    starts = np.zeros(len(strs), dtype=np.intp)
+    np.cumsum([len(s) for s in strs[:-1]], out=starts[1:])
+    return np.bitwise_xor.reduceat(np.frombuffer(joined, np.uint8), starts)
+
+
+def _match(head, kind, cls):
+    '''
+    Returns whether the sentences with the raw address `head` are of class
+    `cls`, see `_rows`
+    '''
+    address = head
+    if isinstance(address, bytes):
+        address = address.decode(nmea.ENCODING)
+    address = address.upper()
+
+    if kind == nmea.TALKER:
+        if TalkerSentence.sentence_types.get(address[2:5]) is not cls:
+            return False
+        if cls.__init__ is TalkerSentence.__init__:
+            return True
+        talker, sentence_type = address[:2], address[2:5]
+        return lambda data: cls(talker, sentence_type, data)
+
+    if kind == nmea.PROPRIETARY:
+        manufacturer = address[1:4]
+        base = ProprietarySentence.sentence_types.get(
+            manufacturer, ProprietarySentence)
+        if not issubclass(cls, base):
+            return False
+        if base is cls and cls.__new__ is ProprietarySentence.__new__ and \
+                cls.__init__ is ProprietarySentence.__init__:
+            return True
+        return lambda data: base(manufacturer, data)
+
+    return False
+
+
+def _column(field, values):
+    dtype = field_dtype(field)
+    convert = field[2] if len(field) > 2 else None
+    if convert is timestamp:
+        return _seconds(values)
+    if convert is datestamp:
+        return datestamp_array(values)
+    if dtype is None:
+        try:
+            return np.array(values, dtype=np.bytes_)
+        except UnicodeEncodeError:
+            return np.char.encode(np.array(values, dtype=np.str_), nmea.ENCODING)
+    if dtype == np.float64:
+        return _numbers(values, np.float64, np.nan, float)
+    return _numbers(values, np.int64, MISSING_INT, int)
+
+
+def _numbers(values, dtype, missing, convert):
+    '''
+    Converts a column of strings to numbers with `convert`, with `missing`
+    for empty or invalid values
+    '''
+    count = len(values)
+    try:
+        return np.fromiter(map(convert, values), dtype, count)
+    except (ValueError, OverflowError):
+        pass
+    result = np.empty(count, dtype=dtype)
+    for i, v in enumerate(values):
+        try:
+            result[i] = convert(v)
+        except (ValueError, OverflowError):
+            result[i] = missing
+    return result
+
+
+def _seconds(values):
+    '''
+    Converts a column of "hhmmss[.ss]" timestamps to seconds of the day
+    '''
+    micro = timestamp_array(values)
+    result = micro.astype(np.int64) / 1e6
+    result[np.isnat(micro)] = np.nan
+    return result
@@ -0,0 +1,372 @@
+'''
+Reads and writes compressed logs.
+
+gzip, bz2 and xz files are recognized by their magic bytes when reading,
+and by their extension when writing. They are decompressed in blocks of
+`BLOCK_SIZE` bytes by a background thread, ahead of the reader.
+
+gzip files are written in blocks of about `BLOCK_SIZE` bytes which are
+compressed independently, each as a gzip member, followed by a table of
+their offsets stored in the extra fields of empty members. They remain
+regular gzip files, which can also be opened with `seekable=True` for
+random access (as used by `NMEAIndex` and `parallel_read`).
+'''
+import bisect
+import builtins
+import bz2
+import io
+import lzma
+import os
+import queue
+import stat
+import struct
+import threading
+import zlib
+from array import array
+
+__all__ = ['open', 'detect', 'BlockGzipReader', 'BlockGzipWriter']
+
+# size of the blocks read ahead, and of the blocks of gzip files written
+BLOCK_SIZE = 1 << 20
+
+# number of blocks read ahead
+DEPTH = 4
+
+_MAGICS = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+)
+
+_EXTENSIONS = {
+    '.gz': 'gzip',
+    '.bgz': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'xz',
+    '.lzma': 'xz',
+}
+
+_OPENERS = {
+    'bz2': bz2.BZ2File,
+    'xz': lzma.LZMAFile,
+}
+
+
+def detect(path):
+    '''
+    Returns the compression of the file at `path` ('gzip', 'bz2' or 'xz'),
+    or None if it is not compressed. Files which do not exist or are empty
+    are recognized by their extension. Only regular files are read: FIFOs
+    and devices (such as serial ports) are not compressed.
+    '''
+    try:
+        if not stat.S_ISREG(os.stat(path).st_mode):
+            return None
+        with builtins.open(path, 'rb') as f:
+            head = f.read(6)
+    except (IOError, OSError):
+        head = b''
+    if head:
+        for magic, compression in _MAGICS:
+            if head.startswith(magic):
+                return compression
+        return None
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def open(path, mode='rb', compression='detect', seekable=False,
+         encoding=None, block_size=BLOCK_SIZE):
+    '''
+    Opens the file at `path`, compressed or not, like the builtin `open`.
+
+    `compression` is one of 'gzip', 'bz2', 'xz' or None, or 'detect' to
+    recognize it from the magic bytes (when reading) or the extension.
+
+    Files opened for reading with `seekable=True` support `seek`: this
+    requires gzip files written by `BlockGzipWriter` (or uncompressed
+    files).
+    '''
+    if compression == 'detect':
+        if 'r' in mode:
+            compression = detect(path)
+        else:
+            compression = _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if compression is None:
+        return builtins.open(path, mode, encoding=encoding)
+
+    binary = 'b' in mode
+    raw_mode = mode.replace('t', '').replace('b', '') + 'b'
+    if raw_mode not in ('rb', 'wb', 'xb'):
+        raise ValueError('invalid mode for compressed files: %r' % mode)
+
+    if raw_mode == 'rb':
+        if seekable:
+            if compression != 'gzip':
+                raise ValueError(
+                    '%s files are not seekable, use block gzip' % compression)
+            f = io.BufferedReader(BlockGzipReader(path), 1 << 16)
+        else:
+            f = io.BufferedReader(_ReadAhead(_decompressor(path, compression),
+                                             block_size, path), block_size)
+    elif compression == 'gzip':
+        f = io.BufferedWriter(
+            BlockGzipWriter(builtins.open(path, raw_mode), block_size),
+            block_size)
+    else:
+        f = _OPENERS[compression](path, raw_mode)
+
+    if binary:
+        return f
+    return io.TextIOWrapper(f, encoding=encoding)
+
+
+def _decompressor(path, compression):
+    if compression == 'gzip':
+        import gzip
+        return gzip.GzipFile(path, 'rb')
+    return _OPENERS[compression](path, 'rb')
+
+
+class _ReadAhead(io.RawIOBase):
+    '''
+    Reads `f` in blocks of `block_size` bytes in a background thread, up to
+    `DEPTH` blocks ahead. Decompressors release the GIL, so this overlaps
+    decompression with parsing.
+    '''
+    def __init__(self, f, block_size, name=None):
+        super(_ReadAhead, self).__init__()
+        self.name = name
+        self._f = f
+        self._block_size = block_size
+        self._queue = queue.Queue(DEPTH)
+        self._block = b''
+        self._pos = 0
+        self._eof = False
+        self._stop = False
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stop:
+                data = self._f.read(self._block_size)
+                self._queue.put(data)
+                if not data:
+                    break
+        except Exception as e:
+            self._queue.put(e)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self._pos >= len(self._block):
+            if self._eof:
+                return 0
+            data = self._queue.get()
+            if isinstance(data, Exception):
+                self._eof = True
+                raise data
+            if not data:
+                self._eof = True
+                return 0
+            self._block = data
+            self._pos = 0
+        n = min(len(b), len(self._block) - self._pos)
+        b[:n] = self._block[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._stop = True
+            # unblock the thread if it is waiting for room in the queue
+            while self._thread.is_alive():
+                try:
+                    self._queue.get(timeout=0.01)
+                except queue.Empty:
+                    pass
+            self._f.close()
+        super(_ReadAhead, self).close()
+
+
+# block gzip format: the table of blocks is stored in the extra field of
+# empty gzip members after the data, each holding up to `_TABLE_ENTRIES`
+# entries of (compressed offset, uncompressed offset) with an entry for the
+# end of the data last. The last member of the file points to the first
+# member of the table.
+_TABLE_ID = b'NT'
+_TRAILER_ID = b'NI'
+_TABLE_ENTRIES = 4095
+_EMPTY_DEFLATE = b'\x03\x00'
+
+
+def _empty_member(subfield_id, payload):
+    '''
+    Returns a gzip member without data, with `payload` in its extra field
+    '''
+    extra = subfield_id + struct.pack('<H', len(payload)) + payload
+    return (b'\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff' +
+            struct.pack('<H', len(extra)) + extra +
+            _EMPTY_DEFLATE + b'\x00' * 8)
+
+
+_TRAILER_SIZE = len(_empty_member(_TRAILER_ID, b'\x00' * 16))
+
+
+def _member_payload(data, subfield_id):
+    '''
+    Returns the extra field payload of a member written by `_empty_member`,
+    or None
+    '''
+    if data[:4] != b'\x1f\x8b\x08\x04' or data[12:14] != subfield_id:
+        return None
+    size, = struct.unpack('<H', data[14:16])
+    return data[16:16 + size]
+
+
+class BlockGzipWriter(io.RawIOBase):
+    '''
+    Writes to `f` (a binary file) in the block gzip format, see the module
+    documentation. Blocks end at the last newline of `block_size` bytes,
+    if any.
+    '''
+    def __init__(self, f, block_size=BLOCK_SIZE, level=6):
+        super(BlockGzipWriter, self).__init__()
+        self.name = getattr(f, 'name', None)
+        self._f = f
+        self._block_size = block_size
+        self._level = level
+        self._buffer = bytearray()
+        self._offset = f.tell()
+        self._size = 0
+        self._compressed = array('q')
+        self._uncompressed = array('q')
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._buffer += b
+        size = self._block_size
+        while len(self._buffer) >= size:
+            end = self._buffer.rfind(b'\n', 0, size) + 1 or size
+            self._write_block(bytes(self._buffer[:end]))
+            del self._buffer[:end]
+        return len(b)
+
+    def _write_block(self, data):
+        c = zlib.compressobj(self._level, zlib.DEFLATED, 31)
+        member = c.compress(data) + c.flush()
+        self._f.write(member)
+        self._compressed.append(self._offset)
+        self._uncompressed.append(self._size)
+        self._offset += len(member)
+        self._size += len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        if self._buffer:
+            self._write_block(bytes(self._buffer))
+            self._buffer = bytearray()
+
+        start = self._offset
+        entries = list(zip(self._compressed, self._uncompressed))
+        entries.append((start, self._size))
+        for i in range(0, len(entries), _TABLE_ENTRIES):
+            payload = b''.join(struct.pack('<qq', *entry)
+                               for entry in entries[i:i + _TABLE_ENTRIES])
+            self._f.write(_empty_member(_TABLE_ID, payload))
+        self._f.write(_empty_member(
+            _TRAILER_ID, struct.pack('<qq', start, len(entries))))
+        self._f.close()
+        super(BlockGzipWriter, self).close()
+
+
+class BlockGzipReader(io.RawIOBase):
+    '''
+    Seekable reader of the decompressed data of a block gzip file
+    '''
+    def __init__(self, path):
+        super(BlockGzipReader, self).__init__()
+        self.name = path
+        self._f = builtins.open(path, 'rb')
+        try:
+            self._read_table()
+        except Exception:
+            self._f.close()
+            raise
+        self._pos = 0
+        # index and data of the last block decompressed
+        self._index = -1
+        self._block = b''
+
+    def _read_table(self):
+        f = self._f
+        end = f.seek(0, io.SEEK_END)
+        if end >= _TRAILER_SIZE:
+            f.seek(end - _TRAILER_SIZE)
+            payload = _member_payload(f.read(_TRAILER_SIZE), _TRAILER_ID)
+        else:
+            payload = None
+        if payload is None or len(payload) != 16:
+            raise ValueError('%r is not a block gzip file' % f.name)
+
+        start, count = struct.unpack('<qq', payload)
+        f.seek(start)
+        table = f.read(end - _TRAILER_SIZE - start)
+        self._compressed = array('q')
+        self._uncompressed = array('q')
+        pos = 0
+        while len(self._compressed) < count:
+            payload = _member_payload(table[pos:pos + 16 + 65535], _TABLE_ID)
+            if payload is None:
+                raise ValueError('invalid block gzip table in %r' % f.name)
+            values = struct.unpack('<%dq' % (len(payload) // 8), payload)
+            self._compressed.extend(values[0::2])
+            self._uncompressed.extend(values[1::2])
+            pos += 16 + len(payload) + len(_EMPTY_DEFLATE) + 8
+        self.size = self._uncompressed[-1]
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, pos, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            pos += self._pos
+        elif whence == io.SEEK_END:
+            pos += self.size
+        if pos < 0:
+            raise ValueError('negative seek position %d' % pos)
+        self._pos = pos
+        return pos
+
+    def readinto(self, b):
+        pos = self._pos
+        if pos >= self.size:
+            return 0
+        index = bisect.bisect_right(self._uncompressed, pos) - 1
+        if index != self._index:
+            start = self._compressed[index]
+            self._f.seek(start)
+            member = self._f.read(self._compressed[index + 1] - start)
+            self._block = zlib.decompress(member, 31)
+            self._index = index
+        offset = pos - self._uncompressed[index]
+        n = min(len(b), len(self._block) - offset)
+        b[:n] = self._block[offset:offset + n]
+        self._pos += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._f.close()
+        super(BlockGzipReader, self).close()
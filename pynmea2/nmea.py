@@ -1,12 +1,17 @@
 import re
 import operator
 from functools import reduce
+from sys import intern
 
 
 class ParseError(ValueError):
     def __init__(self, message, data):
         super(ParseError, self).__init__((message, data))
 
+    def __reduce__(self):
+        # `args` holds the (message, data) tuple
+        return (type(self), self.args[0])
+
 class SentenceTypeError(ParseError):
     pass
 
@@ -14,8 +19,286 @@ class ChecksumError(ParseError):
     pass
 
 
+class ParseFailure(object):
+    '''
+    Result of `NMEASentence.try_parse` for a line which could not be parsed,
+    one of the preallocated `PARSE_ERROR`, `SENTENCE_TYPE_ERROR`,
+    `CHECKSUM_MISMATCH` and `CHECKSUM_MISSING`. Failures are false in a
+    boolean context.
+    '''
+    __slots__ = ('name', 'error')
+
+    def __init__(self, name, error):
+        self.name = name
+        self.error = error
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return '<ParseFailure %s>' % self.name
+
+    def exception(self, line):
+        '''
+        Returns the exception `NMEASentence.parse` raises for `line`
+        '''
+        if isinstance(line, str):
+            syntax = _TEXT_SYNTAX
+        else:
+            line = bytes(line)
+            syntax = _BYTES_SYNTAX
+        scan = _scan(line, syntax)
+        if scan is None:
+            return ParseError('could not parse data', line)
+
+        address, _, data = _split(scan)
+        if self is CHECKSUM_MISSING:
+            return ChecksumError(
+                'strict checking requested but checksum missing', data)
+        if self is CHECKSUM_MISMATCH:
+            cs1 = int(scan[2], 16)
+            cs2 = _checksum(scan[0])
+            return ChecksumError(
+                'checksum does not match: %02X != %02X' % (cs1, cs2), data)
+        if self is SENTENCE_TYPE_ERROR:
+            return SentenceTypeError('Unknown sentence type %s' % address, line)
+        return ParseError('could not parse sentence type: %r' % address, line)
+
+
+PARSE_ERROR = ParseFailure('PARSE_ERROR', ParseError)
+SENTENCE_TYPE_ERROR = ParseFailure('SENTENCE_TYPE_ERROR', SentenceTypeError)
+CHECKSUM_MISMATCH = ParseFailure('CHECKSUM_MISMATCH', ChecksumError)
+CHECKSUM_MISSING = ParseFailure('CHECKSUM_MISSING', ChecksumError)
+
+
+# values of the `errors` argument of `NMEASentence.parse_many`
+MANY_ERRORS = ('report', 'raise', 'ignore')
+
+# byte strings are decoded one byte per character so that rendering a parsed
+# sentence and encoding it again reproduces the original bytes
+ENCODING = 'latin-1'
+
+# kinds of sentence address recognized by `_scan`, given as the length of the
+# address at the start of the sentence
+PROPRIETARY = 4     # 'PGRM'
+TALKER = 6          # 'GPGGA,'
+QUERY = 9           # 'CCGPQ,GGA'
+
+
+def _xor_bytes(buf):
+    '''
+    XOR of all bytes in `buf`, computed by folding the upper half of the
+    buffer onto the lower half as one large integer
+    '''
+    n = int.from_bytes(buf, 'little')
+    shift = 4 * (1 << (len(buf) - 1).bit_length())
+    while shift >= 8:
+        n ^= n >> shift
+        shift >>= 1
+    return n & 0xFF
+
+
+def _syntax(cast):
+    hexdigits = '0123456789ABCDEFabcdef'
+    return (
+        cast('$'), cast('*'), cast('_'), cast('A'),
+        (cast('P'), cast('p')),
+        (cast('Q,'), cast('q,')),
+        cast(','),
+        frozenset(cast(a + b) for a in hexdigits for b in hexdigits),
+        {},
+    )
+
+_TEXT_SYNTAX = _syntax(str)
+_BYTES_SYNTAX = _syntax(lambda s: s.encode('ascii'))
+
+
+def _address_kind(s, syntax):
+    '''
+    Returns the kind of address at the start of `s`, or 0 if there is none
+    '''
+    _, _, underscore, letter, proprietary, query, comma, _, _ = syntax
+    # '\w' is alphanumeric or underscore
+    w = s[:9].replace(underscore, letter)
+    if s[:1] in proprietary and len(w) >= 4 and w[1:4].isalnum():
+        return PROPRIETARY
+    if s[4:6] in query and len(w) == 9 and w[:4].isalnum() and w[6:].isalnum():
+        return QUERY
+    if s[5:6] == comma and w[:5].isalnum():
+        return TALKER
+    return 0
+
+
+def _scan(line, syntax):
+    '''
+    Hand-written equivalent of `NMEASentence.sentence_re`, for text or bytes.
+
+    Returns a tuple of (nmea_str, address kind, checksum), where checksum is
+    None if the sentence has none, or None if `line` is not a NMEA sentence.
+    '''
+    dollar, star, _, _, _, query, _, hexpairs, kinds = syntax
+
+    s = line.lstrip()
+    if s[:1] == dollar:
+        s = s[1:]
+
+    i = s.find(star)
+    if i == -1:
+        checksum = None
+    else:
+        checksum = s[i + 1:].rstrip()
+        if checksum not in hexpairs:
+            return None
+        s = s[:i]
+
+    # the kind of address only depends on its first 6 characters, except for
+    # query sentences which are not worth caching
+    head = s[:6]
+    kind = kinds.get(head)
+    if kind is None:
+        kind = _address_kind(s, syntax)
+        if head[4:] not in query:
+            if len(kinds) > 1024:
+                kinds.clear()
+            kinds[head] = kind
+    if not kind:
+        return None
+    return s, kind, checksum
+
+
+# address field -> (upper case address field, sentence type or 'P' and
+# manufacturer), see `_wanted`
+_ADDRESS_KEYS = {}
+
+
+def _wanted(line, syntax, include, exclude):
+    '''
+    Returns whether the address field of `line` is selected by the `include`
+    and `exclude` sets of `NMEASentence.parse`, looking only at the start of
+    the line. Lines without an address field are left for `parse` to reject.
+    '''
+    dollar, comma = syntax[0], syntax[6]
+    s = line.lstrip()
+    start = 1 if s[:1] == dollar else 0
+    end = s.find(comma, start, start + 16)
+    if end <= start:
+        return True
+
+    field = s[start:end]
+    keys = _ADDRESS_KEYS.get(field)
+    if keys is None:
+        address = field
+        if isinstance(address, bytes):
+            address = address.decode(ENCODING)
+        address = address.upper()
+        if address[:1] == 'P':
+            keys = (address, address[:4])
+        else:
+            keys = (address, address[2:5])
+        if len(_ADDRESS_KEYS) > 1024:
+            _ADDRESS_KEYS.clear()
+        _ADDRESS_KEYS[field] = keys
+
+    address, name = keys
+    if include is not None and address not in include and name not in include:
+        return False
+    if exclude is not None and (address in exclude or name in exclude):
+        return False
+    return True
+
+
+def _checksum(nmea_str):
+    if isinstance(nmea_str, bytes):
+        return _xor_bytes(nmea_str)
+    return NMEASentence.checksum(nmea_str)
+
+
+def _verify(scan, check):
+    '''
+    Returns the failure for the checksum of a sentence framed by `_scan`, or
+    None if it is valid
+    '''
+    nmea_str, _, checksum = scan
+    if checksum:
+        if int(checksum, 16) != _checksum(nmea_str):
+            return CHECKSUM_MISMATCH
+    elif check:
+        return CHECKSUM_MISSING
+    return None
+
+
+def _split(scan):
+    '''
+    Returns the (upper case) address, data string and data fields of a
+    sentence framed by `_scan`, as text
+    '''
+    # pylint: disable=bad-whitespace
+    nmea_str, kind, _ = scan
+    address         = nmea_str[:kind]
+    data_str        = nmea_str[kind:]
+    if isinstance(nmea_str, bytes):
+        address     = address.decode(ENCODING)
+        data_str    = data_str.decode(ENCODING)
+    data            = data_str.split(',')
+    return address.upper(), data_str, data
+
+
+class Field(property):
+    '''
+    Descriptor for an entry of `NMEASentence.fields`, reading the value at a
+    fixed index of `data` and applying the field's converter, if any
+    '''
+    def __init__(self, index, field):
+        self.index = index
+        self.field = field
+        super(Field, self).__init__(self._getter(index, field), doc=field[0])
+
+    @staticmethod
+    def _getter(i, f):
+        if len(f) < 3:
+            def get(self):
+                try:
+                    return self.data[i]
+                except IndexError:
+                    return ''
+            return get
+
+        convert = f[2]
+        def value(self):
+            try:
+                v = self.data[i]
+            except IndexError:
+                return None
+            if v == '':
+                return None
+            try:
+                return convert(v)
+            except:
+                return v
+
+        def get(self):
+            cache = self._cache
+            if cache is None:
+                if not self.cache_fields:
+                    return value(self)
+                self.cache()
+                cache = self._cache
+            try:
+                return cache[i]
+            except KeyError:
+                v = cache[i] = value(self)
+                return v
+        return get
+
+
 class NMEASentenceType(type):
     sentence_types = {}
+    def __new__(mcs, name, bases, dct):
+        # sentences have no instance __dict__, subclasses which store extra
+        # attributes must declare them in their own __slots__
+        dct.setdefault('__slots__', ())
+        return type.__new__(mcs, name, bases, dct)
+
     def __init__(cls, name, bases, dct):
         type.__init__(cls, name, bases, dct)
         base = bases[0]
@@ -24,6 +307,24 @@ class NMEASentenceType(type):
         base.sentence_types[name] = cls
         cls.name_to_idx = dict((f[1], i) for i, f in enumerate(cls.fields))
 
+        cls._state_slots = tuple(
+            (slot, vars(klass)[slot])
+            for klass in cls.__mro__
+            for slot in vars(klass).get('__slots__', ())
+            if slot not in ('_cache', '_parsed', '_rendered', '__weakref__'))
+
+        for i, f in enumerate(cls.fields):
+            # methods and properties of the class hierarchy take precedence
+            # over fields of the same name, as with `__getattr__`
+            for klass in cls.__mro__:
+                if f[1] in vars(klass):
+                    attr = vars(klass)[f[1]]
+                    break
+            else:
+                attr = None
+            if attr is None or isinstance(attr, Field):
+                setattr(cls, f[1], Field(i, f))
+
 
 # http://mikewatkins.ca/2008/11/29/python-2-and-3-metaclasses/
 NMEASentenceBase = NMEASentenceType('NMEASentenceBase', (object,), {})
@@ -40,7 +341,14 @@ class NMEASentence(NMEASentenceBase):
     >>> s = NMEASentence.parse("$GPGGA,184353.07,1929.045,S,02410.506,E,1,04,2.6,100.00,M,-33.9,M,,0000*6D")
     >>> print(s)
     '''
+    # `_lazy` holds the line and `check` flag of a sentence parsed with
+    # `lazy=True` until its `data` is split. `_parsed` holds the line the
+    # sentence was parsed from and `_rendered` its last rendering, until
+    # `_data_changed`, see `_line`
+    __slots__ = ('data', '_cache', '_lazy', '_parsed', '_rendered',
+                 '__weakref__')
 
+    # grammar of a sentence, `parse` uses the equivalent hand-written `_scan`
     sentence_re = re.compile(r'''
         # start of string, optional whitespace, optional '$'
         ^\s*\$?
@@ -82,12 +390,20 @@ class NMEASentence(NMEASentenceBase):
     name_to_idx = {}
     fields = ()
 
+    # keep converted field values (and derived values such as `latitude`) on
+    # each instance after they are first read, until the sentence is modified.
+    # Set on a class for all its sentences, see `cache` for a single sentence
+    cache_fields = False
+
     @staticmethod
     def checksum(nmea_str):
-        return reduce(operator.xor, map(ord, nmea_str), 0)
+        try:
+            return _xor_bytes(nmea_str.encode(ENCODING))
+        except UnicodeEncodeError:
+            return reduce(operator.xor, map(ord, nmea_str), 0)
 
     @staticmethod
-    def parse(line, check=False):
+    def parse(line, check=False, lazy=False, include=None, exclude=None):
         '''
         parse(line)
 
@@ -96,58 +412,192 @@ class NMEASentence(NMEASentenceBase):
 
         Raises ValueError if the string could not be parsed, or if the checksum
         did not match.
+
+        With `lazy=True`, talker sentences are only framed and their class
+        looked up: the checksum is verified and the data split when a field
+        (or `data`) is first read, or the sentence rendered, so a `ValueError`
+        for a bad checksum is raised from there instead.
+
+        `include` and `exclude` are sets of sentence types to select, such as
+        `{'GGA', 'RMC'}`. Talker sentences are matched by their sentence type
+        or full address (`'GPGGA'`), proprietary sentences by 'P' and their
+        manufacturer (`'PTNL'`) or their address field (`'PASHR'`). Returns
+        None for any other sentence, which is not checked or split.
         '''
-        match = NMEASentence.sentence_re.match(line)
-        if not match:
-            raise ParseError('could not parse data', line)
-
-        # pylint: disable=bad-whitespace
-        nmea_str        = match.group('nmea_str')
-        data_str        = match.group('data')
-        checksum        = match.group('checksum')
-        sentence_type   = match.group('sentence_type').upper()
-        data            = data_str.split(',')
-
-        if checksum:
-            cs1 = int(checksum, 16)
-            cs2 = NMEASentence.checksum(nmea_str)
-            if cs1 != cs2:
-                raise ChecksumError(
-                    'checksum does not match: %02X != %02X' % (cs1, cs2), data)
-        elif check:
-            raise ChecksumError(
-                'strict checking requested but checksum missing', data)
+        return NMEASentence._raise(
+            line, _TEXT_SYNTAX, check, lazy, include, exclude)
+
+    @staticmethod
+    def parse_bytes(buf, check=False, lazy=False, include=None, exclude=None):
+        '''
+        parse_bytes(buf)
+
+        Parses a `bytes`, `bytearray` or `memoryview` object representing a
+        NMEA 0183 sentence, and returns a NMEASentence object
+
+        The sentence is framed and its checksum verified on the raw bytes; only
+        the sentence type and the data fields are decoded to text.
+
+        Raises ValueError if the buffer could not be parsed, or if the checksum
+        did not match. See `parse` for `lazy`, `include` and `exclude`.
+        '''
+        if not isinstance(buf, bytes):
+            buf = bytes(buf)
+        return NMEASentence._raise(
+            buf, _BYTES_SYNTAX, check, lazy, include, exclude)
+
+    @staticmethod
+    def try_parse(line, check=False, lazy=False, include=None, exclude=None):
+        '''
+        try_parse(line)
+
+        Parses a string or bytes-like object like `parse` or `parse_bytes`,
+        but returns a `ParseFailure` (see `PARSE_ERROR`, ...) instead of
+        raising an exception if it could not be parsed. Use its `exception`
+        method to get the exception `parse` would have raised.
+        '''
+        if isinstance(line, str):
+            return NMEASentence._parse(
+                line, _TEXT_SYNTAX, check, lazy, include, exclude)
+        if not isinstance(line, bytes):
+            line = bytes(line)
+        return NMEASentence._parse(
+            line, _BYTES_SYNTAX, check, lazy, include, exclude)
+
+    @staticmethod
+    def parse_into(line, target, check=False):
+        '''
+        parse_into(line, target)
+
+        Parses a string or bytes-like object like `parse`, but if the
+        sentence is of the same class as `target`, it is parsed into
+        `target` (and its `data` list) instead of a new sentence, which is
+        returned with the same fields, data and rendering `parse` would
+        give. Otherwise, or if `target` is None, a new sentence is returned.
+
+          msg = None
+          for line in lines:
+              msg = NMEASentence.parse_into(line, msg)
+
+        Raises ValueError like `parse`.
+        '''
+        if isinstance(line, str):
+            syntax = _TEXT_SYNTAX
+        else:
+            if not isinstance(line, bytes):
+                line = bytes(line)
+            syntax = _BYTES_SYNTAX
+        result = _parse_into(line, syntax, check, target, None)
+        if isinstance(result, ParseFailure):
+            raise result.exception(line)
+        return result
+
+    @staticmethod
+    def parse_many(lines, check=False, errors='report', lazy=False,
+                   include=None, exclude=None):
+        '''
+        parse_many(lines)
+
+        Parses an iterable of lines (strings or bytes-like objects), and
+        returns a tuple of the list of sentences and a list of
+        `(index, exception)` for the lines which could not be parsed.
+
+        `errors` can be one of `'report'` (default), `'raise'` to raise the
+        first exception instead, or `'ignore'` to leave errors out of the
+        report. See `parse` for the other arguments.
 
-        talker_match = NMEASentence.talker_re.match(sentence_type)
-        if talker_match:
-            talker = talker_match.group('talker')
-            sentence = talker_match.group('sentence')
-            cls = TalkerSentence.sentence_types.get(sentence)
+        The class of talker sentences is only looked up once per address,
+        so this is faster than calling `parse` for each line.
+        '''
+        if errors not in MANY_ERRORS:
+            raise ValueError('errors must be one of %r (was: %r)'
+                             % (MANY_ERRORS, errors))
+
+        sentences = []
+        failures = []
+        talkers = {}
+        filtered = include is not None or exclude is not None
+        for i, line in enumerate(lines):
+            if isinstance(line, str):
+                syntax = _TEXT_SYNTAX
+            else:
+                if not isinstance(line, bytes):
+                    line = bytes(line)
+                syntax = _BYTES_SYNTAX
+            if filtered and not _wanted(line, syntax, include, exclude):
+                continue
+
+            result = _parse_cached(line, syntax, check, lazy, talkers)
+            if isinstance(result, ParseFailure):
+                if errors == 'raise':
+                    raise result.exception(line)
+                if errors == 'report':
+                    failures.append((i, result.exception(line)))
+                continue
+            sentences.append(result)
+
+        return sentences, failures
+
+    @staticmethod
+    def _raise(line, syntax, check, lazy, include, exclude):
+        result = NMEASentence._parse(line, syntax, check, lazy, include, exclude)
+        if isinstance(result, ParseFailure):
+            raise result.exception(line)
+        return result
+
+    @staticmethod
+    def _parse(line, syntax, check, lazy, include, exclude):
+        if include is not None or exclude is not None:
+            if not _wanted(line, syntax, include, exclude):
+                return None
+
+        scan = _scan(line, syntax)
+        if scan is None:
+            return PARSE_ERROR
+
+        kind = scan[1]
+        if lazy and kind == TALKER:
+            return TalkerSentence._parse_lazy(line, scan, check)
+
+        failure = _verify(scan, check)
+        if failure is not None:
+            return failure
+        address, data_str, data = _split(scan)
+        result = NMEASentence._from_address(address, kind, data_str, data)
+        if result:
+            _set_parsed(result, line)
+        return result
 
+    @staticmethod
+    def _from_address(address, kind, data_str, data):
+        '''
+        Instantiates the sentence class registered for the (upper case)
+        address of a sentence of the given kind, or returns the failure
+        '''
+        if kind == TALKER:
+            cls = TalkerSentence.sentence_types.get(address[2:5])
             if not cls:
                 # TODO instantiate base type instead of fail
-                raise SentenceTypeError(
-                    'Unknown sentence type %s' % sentence_type, line)
-            return cls(talker, sentence, data)
-
-        query_match = NMEASentence.query_re.match(sentence_type)
-        if query_match and not data_str:
-            talker = query_match.group('talker')
-            listener = query_match.group('listener')
-            sentence = query_match.group('sentence')
-            return QuerySentence(talker, listener, sentence)
-
-        proprietary_match = NMEASentence.proprietary_re.match(sentence_type)
-        if proprietary_match:
-            manufacturer = proprietary_match.group('manufacturer')
+                return SENTENCE_TYPE_ERROR
+            return cls(intern(address[:2]), intern(address[2:5]), data)
+
+        if kind == PROPRIETARY:
+            manufacturer = intern(address[1:4])
             cls = ProprietarySentence.sentence_types.get(manufacturer, ProprietarySentence)
             return cls(manufacturer, data)
 
-        raise ParseError(
-            'could not parse sentence type: %r' % sentence_type, line)
+        # NOTE: query sentences have no data
+        if data_str:
+            return PARSE_ERROR
+        return QuerySentence(
+            intern(address[:2]), intern(address[2:4]), intern(address[6:9]))
 
     def __getattr__(self, name):
         #pylint: disable=invalid-name
+        # fields are normally read through the `Field` descriptors installed by
+        # `NMEASentenceType`, this is the fallback for unknown attributes
+        if name == 'data':
+            return self._load()
         t = type(self)
         try:
             i = t.name_to_idx[name]
@@ -172,10 +622,76 @@ class NMEASentence(NMEASentenceBase):
         #pylint: disable=invalid-name
         t = type(self)
         if name not in t.name_to_idx:
-            return object.__setattr__(self, name, value)
+            object.__setattr__(self, name, value)
+            # the talker, manufacturer, ... are rendered too. `_parsed` is
+            # only set once there is something to discard, so constructors
+            # skip this
+            if name != '_cache':
+                try:
+                    _get_parsed(self, t)
+                except AttributeError:
+                    return
+                self._data_changed()
+            return
 
         i = t.name_to_idx[name]
         self.data[i] = str(value)
+        self._data_changed()
+
+    def _load(self):
+        '''
+        Verifies the checksum and splits the data of a sentence parsed with
+        `lazy=True`
+        '''
+        try:
+            line, check = self._lazy
+        except AttributeError:
+            raise AttributeError('data')
+        syntax = _BYTES_SYNTAX if isinstance(line, bytes) else _TEXT_SYNTAX
+        scan = _scan(line, syntax)
+        failure = _verify(scan, check)
+        if failure is not None:
+            raise failure.exception(line)
+        _, _, data = _split(scan)
+        object.__setattr__(self, 'data', data)
+        object.__delattr__(self, '_lazy')
+        return data
+
+    def cache(self, enabled=True):
+        '''
+        Keeps the converted field values of this sentence, as `cache_fields`
+        does for a class, until `cache(False)`. The setting is not kept
+        when the sentence is pickled.
+        '''
+        if not enabled and self.cache_fields:
+            raise ValueError('%s caches all its sentences'
+                             % type(self).__name__)
+        _set_cache(self, {} if enabled else None)
+        if enabled and getattr(self, '_parsed', None) is None:
+            # see `__setattr__`
+            _set_parsed(self, None)
+
+    def _data_changed(self):
+        '''
+        Discards values derived from `data`, must be called after it is modified
+        '''
+        cache = getattr(self, '_cache', None)
+        if cache:
+            cache.clear()
+        _set_parsed(self, None)
+        _set_rendered(self, None)
+
+    def __reduce__(self):
+        # sentence classes may choose their subclass in `__new__` from the
+        # data, so restore the slots onto a bare instance of the class instead
+        t = type(self)
+        state = []
+        for name, slot in t._state_slots:
+            try:
+                state.append((name, slot.__get__(self, t)))
+            except AttributeError:
+                pass
+        return (_restore, (t, tuple(state)))
 
     def __repr__(self):
         #pylint: disable=invalid-name
@@ -199,37 +715,320 @@ class NMEASentence(NMEASentenceBase):
         raise NotImplementedError
 
     def render(self, checksum=True, dollar=True, newline=False):
-        res = self.identifier() + ','.join(self.data)
-        if checksum:
-            res += '*%02X' % NMEASentence.checksum(res)
-        if dollar:
-            res = '$' + res
+        res = self._line()
+        if not checksum:
+            res = res[:-3]
+        if not dollar:
+            res = res[1:]
         if newline:
             res += (newline is True) and '\r\n' or newline
         return res
 
+    def _line(self):
+        '''
+        Returns the sentence rendered with '$' and its checksum. The line
+        it was parsed from, or its last rendering, is returned until
+        `_data_changed` is called.
+        '''
+        try:
+            line = self._rendered
+        except AttributeError:
+            line = None
+        if line is not None:
+            return line
+
+        body = self.identifier() + ','.join(self.data)
+        try:
+            parsed = self._parsed
+        except AttributeError:
+            parsed = None
+        if parsed is not None:
+            # the line parsed, if it is rendered the same way: its checksum
+            # was verified when it was parsed
+            if isinstance(parsed, bytes):
+                parsed = parsed.decode(ENCODING)
+            parsed = parsed.strip()
+            if parsed[1:-3] == body and parsed[:1] == '$' and \
+                    parsed[-3:] in _CHECKSUM_SET:
+                line = parsed
+        if line is None:
+            line = _render(body, True, True, False)
+        _set_parsed(self, None)
+        _set_rendered(self, line)
+        return line
+
     def __str__(self):
         return self.render()
 
 
+_CHECKSUMS = ['*%02X' % i for i in range(256)]
+_CHECKSUM_SET = frozenset(_CHECKSUMS)
+
+
+def _render(body, checksum, dollar, newline):
+    '''
+    Renders a sentence from its address and data, see `render`
+    '''
+    return '%s%s%s%s' % (
+        '$' if dollar else '',
+        body,
+        _CHECKSUMS[NMEASentence.checksum(body)] if checksum else '',
+        newline and ((newline is True) and '\r\n' or newline) or '')
+
+
+class SentenceTemplate(object):
+    '''
+    Renders sentences of one type and talker (or manufacturer) from the
+    values of their fields, see `TalkerSentence.template`.
+
+    The address and any constant fields at its start are rendered, and their
+    checksum computed, once: as the checksum is a XOR, only the checksum of
+    the other fields is computed for each sentence. The fields are formatted
+    with a single %-format.
+
+    `formats` maps field names to the %-format of their values, such as
+    `altitude='%.2f'` ('%s' by default), or to a constant without any
+    '%', such as `altitude_units='M'` (or `''` for fields which are always
+    empty, which is faster than passing None). `names` lists the fields
+    whose values are given to `render`, in order.
+
+    Classes which render their own address (`identifier`), such as the
+    Nortek sentences, are not supported.
+    '''
+    def __init__(self, cls, address, args, formats):
+        if cls.identifier not in (TalkerSentence.identifier,
+                                  ProprietarySentence.identifier):
+            raise TypeError('%s renders its own address, templates are not '
+                            'supported' % cls.__name__)
+        names = [f[1] for f in cls.fields]
+        unknown = set(formats) - set(names)
+        if unknown:
+            raise ValueError('unknown fields of %s: %s'
+                             % (cls.__name__, ', '.join(sorted(unknown))))
+        self.cls = cls
+        self.args = args
+        self.names = []
+        # the format of each field after the prefix, None for constants
+        self._formats = []
+        self._constants = []
+        for name in names:
+            fmt = formats.get(name, '%s')
+            if '%' not in fmt and not self.names:
+                self._constants.append(fmt)
+                continue
+            if '%' in fmt:
+                self.names.append(name)
+            self._formats.append(fmt)
+
+        self._prefix = address + ','.join(self._constants)
+        if self._constants and self._formats:
+            self._prefix += ','
+        self._checksum = NMEASentence.checksum(self._prefix)
+        self._dollar_prefix = '$' + self._prefix
+        self._format = ','.join(self._formats)
+        self._fast = issubclass(cls, TalkerSentence) and \
+            cls.__init__ is TalkerSentence.__init__
+
+    def _fields(self, values):
+        '''
+        Returns the formatted fields after the prefix, with empty fields for
+        values which are None
+        '''
+        values = iter(values)
+        fields = []
+        for fmt in self._formats:
+            if '%' not in fmt:
+                fields.append(fmt)
+                continue
+            value = next(values)
+            fields.append('' if value is None else fmt % value)
+        return fields
+
+    def render(self, values, checksum=True, newline=False):
+        '''
+        Renders a sentence from the values of the fields listed in `names`,
+        None for empty fields. See `NMEASentence.render` for the other
+        arguments
+        '''
+        if None in values:
+            body = ','.join(self._fields(values))
+        else:
+            body = self._format % tuple(values)
+        return '%s%s%s%s' % (
+            self._dollar_prefix,
+            body,
+            _CHECKSUMS[self._checksum ^ NMEASentence.checksum(body)]
+            if checksum else '',
+            newline and ((newline is True) and '\r\n' or newline) or '')
+
+    def sentence(self, values):
+        '''
+        Returns the sentence with the values of the fields listed in `names`
+        '''
+        data = self._constants + self._fields(values)
+        if not self._fast:
+            return self.cls(*(self.args + (data,)))
+        talker, sentence_type = self.args
+        msg = object.__new__(self.cls)
+        _set_cache(msg, None)
+        _set_talker(msg, talker)
+        _set_sentence_type(msg, sentence_type)
+        _set_data(msg, data)
+        return msg
+
+
+def _restore(cls, state):
+    '''
+    Unpickles a sentence, see `NMEASentence.__reduce__`
+    '''
+    self = object.__new__(cls)
+    object.__setattr__(self, '_cache', None)
+    for name, value in state:
+        object.__setattr__(self, name, value)
+    return self
+
+
 class TalkerSentence(NMEASentence):
     sentence_types = {}
+    __slots__ = ('talker', 'sentence_type')
     def __init__(self, talker, sentence_type, data):
-        self.talker = talker
-        self.sentence_type = sentence_type
-        self.data = list(data)
+        # the slots are set directly, there is nothing to discard yet
+        _set_cache(self, None)
+        _set_talker(self, talker)
+        _set_sentence_type(self, sentence_type)
+        _set_data(self, list(data))
+
+    @staticmethod
+    def _parse_lazy(line, scan, check):
+        '''
+        Creates the sentence for a talker sentence framed by `_scan` without
+        splitting its data, see `NMEASentence.parse`
+        '''
+        address = scan[0][:TALKER]
+        if isinstance(address, bytes):
+            address = address.decode(ENCODING)
+        address = address.upper()
+        cls = TalkerSentence.sentence_types.get(address[2:5])
+        if not cls:
+            return SENTENCE_TYPE_ERROR
+        if cls.__init__ is not TalkerSentence.__init__:
+            # the class needs its data to be constructed
+            failure = _verify(scan, check)
+            if failure is not None:
+                return failure
+            address, data_str, data = _split(scan)
+            result = NMEASentence._from_address(
+                address, TALKER, data_str, data)
+            if result:
+                _set_parsed(result, line)
+            return result
+
+        self = object.__new__(cls)
+        object.__setattr__(self, '_cache', None)
+        object.__setattr__(self, 'talker', intern(address[:2]))
+        object.__setattr__(self, 'sentence_type', intern(address[2:5]))
+        object.__setattr__(self, '_lazy', (line, check))
+        object.__setattr__(self, '_parsed', line)
+        return self
 
     def identifier(self):
         return '%s%s,' % (self.talker, self.sentence_type)
 
+    @classmethod
+    def template(cls, talker, **formats):
+        '''
+        Returns a `SentenceTemplate` rendering sentences of this type from
+        `talker` (see `SentenceTemplate` for `formats`)
+
+        >>> gga = GGA.template('GP', altitude='%.2f', altitude_units='M')
+        >>> gga.render(('184353.07', '1929.045', 'S', ..., 100, ...))
+        '''
+        sentence_type = cls.__name__
+        return SentenceTemplate(cls, '%s%s,' % (talker, sentence_type),
+                                (talker, sentence_type), formats)
+
+
+def _parse_cached(line, syntax, check, lazy, talkers):
+    '''
+    Same as `NMEASentence._parse` without filtering, but with the class of
+    talker sentences cached in `talkers`, see `_parse_talker`
+    '''
+    scan = _scan(line, syntax)
+    if scan is not None and scan[1] == TALKER and not lazy:
+        result = _verify(scan, check)
+        if result is None:
+            result = _parse_talker(scan, talkers, line)
+        return result
+    return NMEASentence._parse(line, syntax, check, lazy, None, None)
+
+
+def _parse_talker(scan, talkers, line, pool=None):
+    '''
+    Instantiates a talker sentence framed by `_scan` from `line`, `talkers`
+    caches the class, talker and sentence type for each address. See
+    `_parse_into` for `pool`.
+    '''
+    nmea_str = scan[0]
+    head = nmea_str[:TALKER]
+    try:
+        cls, talker, sentence_type, construct = talkers[head]
+    except KeyError:
+        address = head
+        if isinstance(address, bytes):
+            address = address.decode(ENCODING)
+        address = address.upper()
+        cls = TalkerSentence.sentence_types.get(address[2:5])
+        talker = intern(address[:2])
+        sentence_type = intern(address[2:5])
+        # classes with their own constructor are called, the rest have their
+        # slots set directly instead of through `__setattr__`
+        construct = cls is not None and \
+            cls.__init__ is not TalkerSentence.__init__
+        talkers[head] = cls, talker, sentence_type, construct
+    if cls is None:
+        return SENTENCE_TYPE_ERROR
+
+    data_str = nmea_str[TALKER:]
+    if isinstance(data_str, bytes):
+        data_str = data_str.decode(ENCODING)
+    data = data_str.split(',')
+    if pool is not None:
+        self = pool.get(cls)
+        if self is not None:
+            _reuse(self, (talker, sentence_type), data, line)
+            return self
+    if construct:
+        self = cls(talker, sentence_type, data)
+    else:
+        self = object.__new__(cls)
+        _set_cache(self, None)
+        _set_talker(self, talker)
+        _set_sentence_type(self, sentence_type)
+        _set_data(self, data)
+    _set_parsed(self, line)
+    if pool is not None:
+        pool[cls] = self
+    return self
+
+
+_set_cache = NMEASentence._cache.__set__
+_get_parsed = NMEASentence._parsed.__get__
+_set_parsed = NMEASentence._parsed.__set__
+_set_rendered = NMEASentence._rendered.__set__
+_set_data = NMEASentence.data.__set__
+_set_talker = TalkerSentence.talker.__set__
+_set_sentence_type = TalkerSentence.sentence_type.__set__
+
 
 class QuerySentence(NMEASentence):
     sentence_types = {}
+    __slots__ = ('talker', 'listener', 'sentence_type')
     def __init__(self, talker, listener, sentence_type):
-        self.talker = talker
-        self.listener = listener
-        self.sentence_type = sentence_type
-        self.data = []
+        _set_cache(self, None)
+        object.__setattr__(self, 'talker', talker)
+        object.__setattr__(self, 'listener', listener)
+        object.__setattr__(self, 'sentence_type', sentence_type)
+        _set_data(self, [])
 
     def identifier(self):
         return '%s%sQ,%s' % (self.talker, self.listener, self.sentence_type)
@@ -237,9 +1036,139 @@ class QuerySentence(NMEASentence):
 
 class ProprietarySentence(NMEASentence):
     sentence_types = {}
+    # the index of the data field from which `__new__` chooses the class, if
+    # it only depends on that field, see `_sentence_class`
+    _type_field = None
+    __slots__ = ('manufacturer',)
     def __init__(self, manufacturer, data):
-        self.manufacturer = manufacturer
-        self.data = list(data)
+        _set_cache(self, None)
+        _set_manufacturer(self, manufacturer)
+        _set_data(self, list(data))
 
     def identifier(self):
         return 'P%s' % (self.manufacturer)
+
+    @classmethod
+    def template(cls, manufacturer=None, **formats):
+        '''
+        Returns a `SentenceTemplate` rendering sentences of this class,
+        from the manufacturer it is registered for by default (see
+        `SentenceTemplate` for `formats`)
+        '''
+        if manufacturer is None:
+            base = cls
+            while base.__bases__[0] is not ProprietarySentence:
+                if base is ProprietarySentence:
+                    raise TypeError('the manufacturer must be given')
+                base = base.__bases__[0]
+            manufacturer = base.__name__
+        return SentenceTemplate(cls, 'P' + manufacturer, (manufacturer,),
+                                formats)
+
+
+_set_manufacturer = ProprietarySentence.manufacturer.__set__
+_get_data = NMEASentence.data.__get__
+_BASE_INITS = (TalkerSentence.__init__, ProprietarySentence.__init__)
+
+
+def _parse_into(line, syntax, check, target, pool, talkers=None):
+    '''
+    Same as `NMEASentence._parse` without filtering or `lazy`, but parses
+    talker and proprietary sentences into `target` if it is of their class,
+    see `NMEASentence.parse_into`. With a `pool` dict, `target` is the last
+    sentence of their class parsed with it, and the result replaces it.
+    `talkers` is the cache of `_parse_talker`, if any.
+    '''
+    scan = _scan(line, syntax)
+    if scan is None:
+        return PARSE_ERROR
+    failure = _verify(scan, check)
+    if failure is not None:
+        return failure
+    kind = scan[1]
+    if kind == TALKER and talkers is not None and pool is not None:
+        return _parse_talker(scan, talkers, line, pool)
+    address, data_str, data = _split(scan)
+    if kind != QUERY:
+        cls = _sentence_class(address, kind, data)
+        if pool is not None:
+            target = pool.get(cls)
+        if cls is not None and type(target) is cls:
+            if kind == TALKER:
+                args = (intern(address[:2]), intern(address[2:5]))
+            else:
+                args = (intern(address[1:4]),)
+            _reuse(target, args, data, line)
+            return target
+
+    result = NMEASentence._from_address(address, kind, data_str, data)
+    if result:
+        _set_parsed(result, line)
+        if pool is not None and kind != QUERY:
+            pool[type(result)] = result
+    return result
+
+
+# (manufacturer class, value of its `_type_field`) -> the class `__new__`
+# chooses, see `_sentence_class`
+_PROPRIETARY_CLASSES = {}
+
+
+def _sentence_class(address, kind, data):
+    '''
+    Returns the class `NMEASentence._from_address` instantiates for a talker
+    or proprietary sentence, or None
+    '''
+    if kind == TALKER:
+        return TalkerSentence.sentence_types.get(address[2:5])
+    manufacturer = address[1:4]
+    cls = ProprietarySentence.sentence_types.get(
+        manufacturer, ProprietarySentence)
+    if cls.__new__ is object.__new__:
+        return cls
+    i = cls._type_field
+    if i is None or i >= len(data):
+        # the class is chosen from the data
+        return type(cls.__new__(cls, intern(manufacturer), data))
+    key = cls, data[i]
+    result = _PROPRIETARY_CLASSES.get(key)
+    if result is None:
+        result = type(cls.__new__(cls, intern(manufacturer), data))
+        if len(_PROPRIETARY_CLASSES) > 1024:
+            # values of garbage lines
+            _PROPRIETARY_CLASSES.clear()
+        _PROPRIETARY_CLASSES[key] = result
+    return result
+
+
+def _reuse(self, args, data, line):
+    '''
+    Sets the state of a sentence of the class a line was parsed as, as its
+    constructor would with `args` and `data`, reusing its `data` list
+    '''
+    t = type(self)
+    try:
+        buf = _get_data(self, t)
+    except AttributeError:
+        # parsed with `lazy=True`, and not loaded
+        object.__delattr__(self, '_lazy')
+        buf = None
+    if t.__init__ not in _BASE_INITS:
+        t.__init__(self, *(args + (data,)))
+        data = _get_data(self, t)
+    else:
+        cache = self._cache
+        if cache:
+            cache.clear()
+        if len(args) == 2:
+            _set_talker(self, args[0])
+            _set_sentence_type(self, args[1])
+        else:
+            _set_manufacturer(self, args[0])
+    if buf is None:
+        _set_data(self, data)
+    else:
+        buf[:] = data
+        _set_data(self, buf)
+    _set_parsed(self, line)
+    _set_rendered(self, None)
@@ -1,36 +1,102 @@
-try:
-    # pylint: disable=used-before-assignment
-    basestring = basestring
-except NameError: # py3
-    basestring = str
+import bisect
+import io
+import mmap
+import os
+from array import array
 
 from .nmea import NMEASentence
+from .stream import NMEAWriter
+
+# size of the blocks of a memory-mapped file whose newlines are counted at
+# once, see `_LineIndex`
+BLOCK_SIZE = 1 << 14
 
 
 class NMEAFile(object):
     """
     Reads NMEA sentences from a file similar to a standard python file object.
+
+    Files opened in binary mode (eg, `NMEAFile('data.log', 'rb')`) yield
+    `bytes` lines, which are parsed with `NMEASentence.parse_bytes`.
+
+    The `include` and `exclude` keyword arguments select the sentence types
+    to read, see `NMEASentence.parse`; other lines are skipped.
+
+    With `mmap=True`, the file is memory-mapped and read as bytes. Lines can
+    then be accessed at random, without reading the lines before them:
+    `len(f)` is the number of lines, `f[i]` parses line `i` (and `f[i:j]`
+    a list of lines), and `f.seek_line(i)` makes `readline` and iteration
+    continue from line `i`.
+
+    Files opened for writing (mode 'w', 'a' or 'x') write sentences with
+    an `NMEAWriter`, which takes the `newline`, `checksum`, `flush_size`,
+    `flush_interval` and `fsync` keyword arguments. They are always opened
+    in binary mode, so that newlines are written unchanged.
     """
 
+    _WRITER_ARGS = ('newline', 'checksum', 'flush_size', 'flush_interval',
+                    'fsync')
+
     def __init__(self, f, *args, **kwargs):
         super(NMEAFile, self).__init__()
-        if isinstance(f, basestring) or args or kwargs:
+        self.include = kwargs.pop('include', None)
+        self.exclude = kwargs.pop('exclude', None)
+        use_mmap = kwargs.pop('mmap', False)
+        writer_args = dict((name, kwargs.pop(name))
+                           for name in self._WRITER_ARGS if name in kwargs)
+        mode = args[0] if args else kwargs.get('mode', 'r')
+        writing = any(c in mode for c in 'wax')
+        if writing and 'b' not in mode:
+            mode = mode.replace('t', '') + 'b'
+            if args:
+                args = (mode,) + args[1:]
+            else:
+                kwargs['mode'] = mode
+        if use_mmap and isinstance(f, str):
+            from . import compression
+            if compression.detect(f) is not None:
+                raise ValueError('compressed files cannot be memory-mapped')
+            self._file = open(f, 'rb')
+        elif isinstance(f, str) or args or kwargs:
             self._file = self.open(f, *args, **kwargs)
         else:
             self._file = f
         self._context = None
+        self._mmap = None
+        self._index = None
+        self._writer = None
+        if writing or writer_args:
+            self._writer = NMEAWriter(self._file, **writer_args)
+        if use_mmap:
+            self._map()
+
+    def _map(self):
+        size = os.fstat(self._file.fileno()).st_size
+        if size:
+            self._mmap = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            # empty files cannot be mapped
+            self._mmap = io.BytesIO()
+        self._index = _LineIndex(self._mmap, size)
 
     def open(self, fp, mode='r'):
         """
-        Open the NMEAFile.
+        Open the NMEAFile. gzip, bz2 and xz files are decompressed, see
+        `pynmea2.compression.open`
         """
-        self._file = open(fp, mode=mode)
+        from . import compression
+        self._file = compression.open(fp, mode=mode)
         return self._file
 
     def close(self):
         """
         Close the NMEAFile.
         """
+        if self._writer is not None:
+            self._writer.flush()
+        if self._mmap is not None:
+            self._mmap.close()
         self._file.close()
 
     def __iter__(self):
@@ -38,8 +104,13 @@ class NMEAFile(object):
         Iterate through the file yielding NMEASentences
         :return:
         """
-        for line in self._file:
-            yield self.parse(line)
+        lines = self._file
+        if self._mmap is not None:
+            lines = iter(self._mmap.readline, b'')
+        for line in lines:
+            s = self.parse(line)
+            if s is not None:
+                yield s
 
     def __enter__(self):
         if hasattr(self._file, '__enter__'):
@@ -47,6 +118,10 @@ class NMEAFile(object):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._writer is not None and not self._file.closed:
+            self._writer.flush()
+        if self._mmap is not None:
+            self._mmap.close()
         if self._context:
             ctx = self._context
             self._context = None
@@ -57,24 +132,220 @@ class NMEAFile(object):
         Iterate through the file object returning NMEASentence objects
         :return: NMEASentence
         """
-        data = self._file.readline()
-        return self.parse(data)
+        return self.readline()
 
     def parse(self, s):
-        return NMEASentence.parse(s)
+        if isinstance(s, bytes):
+            return NMEASentence.parse_bytes(
+                s, include=self.include, exclude=self.exclude)
+        return NMEASentence.parse(
+            s, include=self.include, exclude=self.exclude)
 
     def readline(self):
         """
         Return the next NMEASentence in the file object
         :return: NMEASentence
         """
-        data = self._file.readline()
-        s = self.parse(data)
-        return s
+        source = self._file if self._mmap is None else self._mmap
+        while True:
+            data = source.readline()
+            s = self.parse(data)
+            if s is not None or not data:
+                return s
 
     def read(self):
         """
         Return a list of NMEASentence objects for each line in the file
         :return: list of NMEASentence objects
         """
-        return [s for s in self]
+        lines = self._file
+        if self._mmap is not None:
+            lines = iter(self._mmap.readline, b'')
+        if type(self).parse is not NMEAFile.parse:
+            # subclasses parse each line themselves
+            return [s for s in map(self.parse, lines) if s is not None]
+        return NMEASentence.parse_many(
+            lines, errors='raise',
+            include=self.include, exclude=self.exclude)[0]
+
+    def write(self, msg):
+        """
+        Write a sentence, or a tuple of its address and fields (see
+        `NMEAWriter.write`)
+        """
+        self._writing().write(msg)
+
+    def write_many(self, msgs):
+        """
+        Write the sentences (or tuples) of an iterable
+        """
+        self._writing().write_many(msgs)
+
+    def flush(self):
+        """
+        Write the buffered sentences to the file
+        """
+        self._writing().flush()
+
+    def _writing(self):
+        if self._writer is None:
+            writable = getattr(self._file, 'writable', None)
+            if writable is None or not writable():
+                raise TypeError('NMEAFile is not open for writing')
+            self._writer = NMEAWriter(self._file)
+        return self._writer
+
+    def parallel_read(self, workers=None, **kwargs):
+        """
+        Parse the whole file with several processes, see
+        `pynmea2.parallel.parallel_read` for the arguments
+        :return: iterator of NMEASentence objects
+        """
+        from .parallel import parallel_read
+        kwargs.setdefault('include', self.include)
+        kwargs.setdefault('exclude', self.exclude)
+        return parallel_read(self._file.name, workers, **kwargs)
+
+    def index(self, rebuild=False, **kwargs):
+        """
+        Return the `NMEAIndex` of the file, from its sidecar file (the name
+        of the file with '.idx' appended). The index is built and saved if
+        that file is missing or out of date, or if `rebuild` is True;
+        `kwargs` are passed to `NMEAIndex.build`
+        :return: NMEAIndex
+        """
+        from .nmea_index import NMEAIndex
+        path = self._file.name
+        sidecar = path + '.idx'
+        if not rebuild and os.path.exists(sidecar):
+            index = NMEAIndex.load(sidecar)
+            if index.is_current(path):
+                return index
+        index = NMEAIndex.build(path, **kwargs)
+        index.save(sidecar)
+        return index
+
+    def between(self, t0, t1, types=None):
+        """
+        Iterate through the sentences whose time is in `[t0, t1)`, reading
+        only the blocks of the file which may hold them according to its
+        index (see `index` and `NMEAIndex.between`)
+        :return: iterator of (datetime, NMEASentence)
+        """
+        from . import compression
+        index = self.index()
+        with compression.open(self._file.name, 'rb', seekable=True) as f:
+            for item in index.between(f, t0, t1, types):
+                yield item
+
+    def __bool__(self):
+        return True
+
+    def __len__(self):
+        """
+        Return the number of lines in the file (mmap mode only)
+        """
+        return len(self._mapped())
+
+    def __getitem__(self, i):
+        """
+        Parse line `i` of the file, or a slice of lines (mmap mode only)
+        :return: NMEASentence, or None if filtered out by include/exclude
+        """
+        index = self._mapped()
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(index))
+            if step == 1:
+                return [self.parse(line)
+                        for line in index.lines(start, stop - start)]
+            return [self.parse(index.line(j))
+                    for j in range(start, stop, step)]
+        if i < 0:
+            i += len(index)
+        return self.parse(index.line(i))
+
+    def seek_line(self, i):
+        """
+        Make `readline` and iteration continue from line `i` (mmap mode only)
+        """
+        offset = self._mapped().offset(i)
+        self._mmap.seek(offset)
+
+    def _mapped(self):
+        if self._index is None:
+            raise TypeError('line access requires NMEAFile(..., mmap=True)')
+        return self._index
+
+
+class _LineIndex(object):
+    """
+    Finds the start of lines in a memory-mapped file.
+
+    The newlines of each block of `BLOCK_SIZE` bytes are counted (as far
+    into the file as needed), so that finding a line only scans its own
+    block line by line.
+    """
+    def __init__(self, data, size):
+        self.data = data
+        self.size = size
+        # number of newlines before each block counted so far
+        self.counts = array('q', [0])
+
+    def _count(self, i=None):
+        """
+        Count blocks until the one holding the `i`th newline, or all of them
+        """
+        data = self.data
+        counts = self.counts
+        start = (len(counts) - 1) * BLOCK_SIZE
+        while start < self.size and (i is None or counts[-1] < i):
+            end = start + BLOCK_SIZE
+            counts.append(counts[-1] + data[start:end].count(b'\n'))
+            start = end
+
+    def __len__(self):
+        self._count()
+        n = self.counts[-1]
+        if self.size and self.data[self.size - 1:self.size] != b'\n':
+            # last line without a newline
+            n += 1
+        return n
+
+    def offset(self, i):
+        """
+        Return the offset of the start of line `i`
+        """
+        if i < 0:
+            raise IndexError('line index out of range')
+        if i == 0:
+            return 0
+        self._count(i)
+        counts = self.counts
+        block = bisect.bisect_left(counts, i) - 1
+        if block + 1 >= len(counts):
+            raise IndexError('line index out of range')
+        data = self.data
+        pos = block * BLOCK_SIZE - 1
+        for _ in range(i - counts[block]):
+            pos = data.find(b'\n', pos + 1)
+        if pos + 1 >= self.size:
+            raise IndexError('line index out of range')
+        return pos + 1
+
+    def lines(self, i, n):
+        """
+        Return `n` lines from line `i`
+        """
+        data = self.data
+        pos = self.offset(i) if n > 0 else 0
+        result = []
+        for _ in range(n):
+            end = data.find(b'\n', pos)
+            if end == -1:
+                end = self.size
+            result.append(data[pos:end])
+            pos = end + 1
+        return result
+
+    def line(self, i):
+        return self.lines(i, 1)[0]
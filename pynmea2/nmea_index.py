@@ -0,0 +1,330 @@
+'''
+Sidecar index of a log file, for reading the sentences of a time range
+without parsing the whole log.
+
+The index divides the file into blocks of about `BLOCK_SIZE` bytes which
+start at a line, and holds for each block the count of each sentence type,
+the first and last times of its sentences, and the state of the
+`DatetimeTracker` at its start. It also holds the offset of the first
+sentence of each second.
+
+      index = NMEAIndex.build('log.nmea')
+      index.save('log.nmea.idx')
+      ...
+      index = NMEAIndex.load('log.nmea.idx')
+      with compression.open('log.nmea', 'rb', seekable=True) as f:
+          for dt, msg in index.between(f, t0, t1, types={'GGA'}):
+              ...
+'''
+import bisect
+import datetime
+import itertools
+import json
+import math
+import os
+import sys
+from array import array
+
+from . import compression, nmea
+from .nmea import NMEASentence, TalkerSentence, ProprietarySentence, \
+    ParseFailure
+from .stream import DatetimeTracker
+
+__all__ = ['NMEAIndex']
+
+MAGIC = b'NMEAIDX\n'
+VERSION = 1
+
+# default size of the blocks of the index, in bytes
+BLOCK_SIZE = 1 << 16
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+
+# names and typecodes of the arrays of the index, in the order of the file
+_ARRAYS = (
+    # offset of the start of each block
+    ('offsets', 'q'),
+    # first and last POSIX time of the sentences of each block, inf and -inf
+    # for blocks without any
+    ('first', 'd'),
+    ('last', 'd'),
+    # `DatetimeTracker.date` (as an ordinal, 0 if None) and `.seconds` (NaN
+    # if None) at the start of each block
+    ('dates', 'q'),
+    ('seconds', 'd'),
+    # count of each of `types` in each block, by block
+    ('counts', 'q'),
+    # POSIX second and offset of the first sentence of each second
+    ('sample_times', 'q'),
+    ('sample_offsets', 'q'),
+)
+
+
+class NMEAIndex(object):
+    '''
+    Index of the blocks of a log file, see the module documentation
+    '''
+    def __init__(self, size, file_size, mtime, block_size, types, **arrays):
+        # size of the (decompressed) data of the indexed file
+        self.size = size
+        # size and modification time (ns) of the indexed file
+        self.file_size = file_size
+        self.mtime = mtime
+        self.block_size = block_size
+        # sentence types counted: the sentence type of talker sentences,
+        # and 'P' and the manufacturer of proprietary sentences
+        self.types = types
+        for name, typecode in _ARRAYS:
+            setattr(self, name, arrays.get(name, array(typecode)))
+        # see `_bounds`
+        self._sorted_bounds = None
+
+    @classmethod
+    def build(cls, path, block_size=BLOCK_SIZE, date=None):
+        '''
+        Indexes the file at `path`, which may be compressed. `date` is the
+        date of the timestamps at the start of the file, if known (see
+        `DatetimeTracker`)
+        '''
+        stat = os.stat(path)
+        index = cls(0, stat.st_size, stat.st_mtime_ns, block_size, [])
+        types = {}
+        counts = []
+        tracker = DatetimeTracker(date)
+        # the time of the last timed sentence, for the ones without a time
+        current = None
+        second = None
+        parse = NMEASentence.try_parse
+
+        offset = 0
+        end = 0
+        with compression.open(path, 'rb') as f:
+            for line in f:
+                if offset >= end:
+                    index._start_block(offset, tracker)
+                    counts.append({})
+                    end = offset + block_size
+
+                msg = parse(line)
+                if not isinstance(msg, ParseFailure):
+                    name = _type_name(msg)
+                    if name is not None:
+                        block = counts[-1]
+                        block[name] = block.get(name, 0) + 1
+                        types.setdefault(name, len(types))
+
+                    dt = tracker.update(msg)
+                    if dt is not None:
+                        current = _posix(dt)
+                    if current is not None:
+                        if current < index.first[-1]:
+                            index.first[-1] = current
+                        if current > index.last[-1]:
+                            index.last[-1] = current
+                        if int(current) != second:
+                            second = int(current)
+                            index.sample_times.append(second)
+                            index.sample_offsets.append(offset)
+
+                offset += len(line)
+
+        index.size = offset
+        index.types = sorted(types, key=types.get)
+        for block in counts:
+            index.counts.extend(block.get(name, 0) for name in index.types)
+        return index
+
+    def _start_block(self, offset, tracker):
+        self.offsets.append(offset)
+        self.first.append(math.inf)
+        self.last.append(-math.inf)
+        date = tracker.date
+        self.dates.append(date.toordinal() if date is not None else 0)
+        seconds = tracker.seconds
+        self.seconds.append(seconds if seconds is not None else math.nan)
+
+    @classmethod
+    def load(cls, path):
+        '''
+        Loads an index saved with `save`
+        '''
+        with open(path, 'rb') as f:
+            if f.readline() != MAGIC:
+                raise ValueError('not an NMEA index: %r' % path)
+            header = json.loads(f.readline().decode('utf-8'))
+            if header['version'] != VERSION:
+                raise ValueError('unsupported NMEA index version: %r'
+                                 % header['version'])
+            arrays = {}
+            for name, typecode in _ARRAYS:
+                a = array(typecode)
+                a.fromfile(f, header['lengths'][name])
+                if header['byteorder'] != sys.byteorder:
+                    a.byteswap()
+                arrays[name] = a
+        return cls(header['size'], header['file_size'], header['mtime'],
+                   header['block_size'], header['types'], **arrays)
+
+    def save(self, path):
+        header = {
+            'version': VERSION,
+            'byteorder': sys.byteorder,
+            'size': self.size,
+            'file_size': self.file_size,
+            'mtime': self.mtime,
+            'block_size': self.block_size,
+            'types': self.types,
+            'lengths': dict(
+                (name, len(getattr(self, name))) for name, _ in _ARRAYS),
+        }
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(json.dumps(header).encode('utf-8') + b'\n')
+            for name, _ in _ARRAYS:
+                getattr(self, name).tofile(f)
+
+    def is_current(self, path):
+        '''
+        Returns whether the file at `path` is unchanged since it was indexed
+        '''
+        stat = os.stat(path)
+        return stat.st_size == self.file_size and \
+            stat.st_mtime_ns == self.mtime
+
+    def count(self, name):
+        '''
+        Returns the number of sentences of type `name` in the file
+        '''
+        if name not in self.types:
+            return 0
+        width = len(self.types)
+        return sum(self.counts[self.types.index(name)::width])
+
+    def between(self, f, t0, t1, types=None):
+        '''
+        Yields `(datetime, msg)` for the sentences of `f`, the indexed file
+        opened in binary mode (with `compression.open(path, 'rb',
+        seekable=True)` if compressed), whose time is in `[t0, t1)`. Sentences
+        without a timestamp take the time of the last one before them.
+
+        `types` selects sentence types as `include` does for
+        `NMEASentence.parse`. Naive datetimes are taken to be UTC.
+        '''
+        start, stop = _posix(t0), _posix(t1)
+        first_second = int(math.floor(start))
+        blocks = len(self.offsets)
+        last, first = self._bounds()
+        # the blocks before `lo` all end before `t0`, the ones from `hi` on
+        # all start at or after `t1`
+        lo = bisect.bisect_left(last, start)
+        hi = bisect.bisect_left(first, stop)
+        for i in range(lo, hi):
+            if self.last[i] < start or self.first[i] >= stop:
+                continue
+            if types is not None and not self._has_types(i, types):
+                continue
+
+            offset = self.offsets[i]
+            end = self.offsets[i + 1] if i + 1 < blocks else self.size
+            date = self.dates[i]
+            date = datetime.date.fromordinal(date) if date else None
+            seconds = self.seconds[i]
+            seconds = seconds if not math.isnan(seconds) else None
+            # the time of the last timed sentence before the block
+            current = None
+            if date is not None and seconds is not None:
+                current = (date.toordinal() - _EPOCH_ORDINAL) * 86400 + seconds
+
+            # start at the first sentence of the second of `t0`, if the
+            # sentences before it in the block are all earlier
+            s_lo = bisect.bisect_left(self.sample_offsets, offset)
+            s_hi = bisect.bisect_left(self.sample_offsets, end)
+            for j in range(s_lo, s_hi):
+                if self.sample_times[j] >= first_second:
+                    if j > s_lo:
+                        offset = self.sample_offsets[j]
+                        current = self.sample_times[j]
+                        sample = _EPOCH + datetime.timedelta(seconds=current)
+                        date = sample.date()
+                        seconds = current % 86400
+                    break
+
+            tracker = DatetimeTracker(date)
+            tracker.seconds = seconds
+            for posix, dt, msg in self._read(
+                    f, offset, end, tracker, current, types):
+                if start <= posix < stop:
+                    yield dt, msg
+
+    def _bounds(self):
+        '''
+        Returns the latest time of the blocks up to each block, and the
+        earliest time of the blocks from each block on: unlike `last` and
+        `first`, they are sorted even if the time goes back in the log
+        '''
+        if self._sorted_bounds is None or \
+                len(self._sorted_bounds[0]) != len(self.last):
+            last = list(itertools.accumulate(self.last, max))
+            first = list(itertools.accumulate(reversed(self.first), min))
+            self._sorted_bounds = last, first[::-1]
+        return self._sorted_bounds
+
+    def _has_types(self, i, types):
+        '''
+        Returns whether block `i` may hold sentences selected by `types`
+        '''
+        width = len(self.types)
+        counts = dict(zip(self.types, self.counts[i * width:(i + 1) * width]))
+        for name in types:
+            # only sentence types ('GGA') and proprietary manufacturers
+            # ('PASH') are counted
+            if name[:1] == 'P' and len(name) >= 4:
+                name = name[:4]
+            elif len(name) == 5:
+                name = name[2:5]
+            if counts.get(name):
+                return True
+        return False
+
+    def _read(self, f, offset, end, tracker, current, types):
+        '''
+        Yields `(POSIX time, datetime, msg)` for the sentences between
+        `offset` and `end`. `current` is the POSIX time at `offset`, if known
+        '''
+        f.seek(offset)
+        lines = f.read(end - offset).split(b'\n')
+        parse = NMEASentence.try_parse
+        syntax = nmea._BYTES_SYNTAX
+        dt = None
+        if current is not None:
+            dt = _EPOCH + datetime.timedelta(seconds=current)
+        for line in lines:
+            if not line:
+                continue
+            msg = parse(line)
+            if isinstance(msg, ParseFailure):
+                continue
+            time = tracker.update(msg)
+            if time is not None:
+                current, dt = _posix(time), time
+            if current is None:
+                continue
+            if types is not None and \
+                    not nmea._wanted(line, syntax, types, None):
+                continue
+            yield current, dt, msg
+
+
+def _type_name(msg):
+    if isinstance(msg, TalkerSentence):
+        return msg.sentence_type
+    if isinstance(msg, ProprietarySentence):
+        return 'P' + msg.manufacturer
+    return None
+
+
+def _posix(dt):
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return (dt - _EPOCH).total_seconds()
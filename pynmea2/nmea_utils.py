@@ -1,16 +1,11 @@
 #pylint: disable=invalid-name
 import datetime
 import re
+from functools import lru_cache
 
 
-# python 2.7 backport
-if not hasattr(datetime, 'timezone'):
-    class UTC(datetime.tzinfo):
-        def utcoffset(self, dt):
-            return datetime.timedelta(0)
-    class timezone(object):
-        utc = UTC()
-    datetime.timezone = timezone
+# tzinfo of all the times and datetimes made by the converters
+UTC = datetime.timezone.utc
 
 
 def valid(s):
@@ -23,22 +18,28 @@ def timestamp(s):
     datetime.time object
     '''
     ms_s = s[6:]
-    ms = ms_s and int(float(ms_s) * 1000000) or 0
+    if not ms_s:
+        ms = 0
+    elif ms_s[0] == '.' and ms_s[1:].isdigit():
+        # fraction of a second, truncated to microseconds
+        ms = int(ms_s[1:7].ljust(6, '0'))
+    else:
+        ms = int(float(ms_s) * 1000000)
 
-    t = datetime.time(
-        hour=int(s[0:2]),
-        minute=int(s[2:4]),
-        second=int(s[4:6]),
-        microsecond=ms,
-        tzinfo=datetime.timezone.utc)
-    return t
+    return datetime.time(int(s[0:2]), int(s[2:4]), int(s[4:6]), ms, UTC)
 
 
+@lru_cache(maxsize=64)
 def datestamp(s):
     '''
     Converts a datestamp given in "DDMMYY" ASCII text format to a
-    datetime.datetime object
+    datetime.date object
     '''
+    if len(s) == 6 and s.isdigit():
+        # as `strptime('%y')`
+        year = int(s[4:6])
+        year += 2000 if year < 69 else 1900
+        return datetime.date(year, int(s[2:4]), int(s[0:2]))
     return datetime.datetime.strptime(s, '%d%m%y').date()
 
 
@@ -58,12 +59,213 @@ def dm_to_sd(dm):
     return float(d) + float(m) / 60
 
 
+def dm_to_sd_array(values, directions=None):
+    '''
+    Converts a sequence or array of geographic co-ordinates given in
+    "degrees/minutes" dddmm.mmmm format (as text or bytes) to a NumPy array
+    of signed decimals, like `dm_to_sd` and `LatLonFix`.
+
+    If given, `directions` holds the cardinal direction of each co-ordinate:
+    'N' and 'E' are positive, 'S' and 'W' negative, and others give 0.
+    Invalid co-ordinates, for which `dm_to_sd` raises ValueError, are NaN.
+
+    Requires numpy.
+    '''
+    import numpy as np
+
+    values, chars, length = _char_matrix(values)
+    count, width = chars.shape
+    inside = np.arange(width) < length[:, None]
+    digit = (chars >= 48) & (chars <= 57)
+    dot = chars == 46
+
+    # '(\d+)(\d\d\.\d+)': one dot, with at least 3 digits before it and 1 after
+    point = dot.argmax(axis=1)
+    valid = (dot.sum(axis=1) == 1) & (point >= 3) & (point < length - 1) & \
+        ((digit | dot) | ~inside).all(axis=1)
+
+    # degrees, and minutes as an integer numerator over 10 ** decimals, are
+    # exact while short enough; their quotient then rounds like `float()`
+    decimals = length - point - 1
+    exact = valid & (point <= 17) & (decimals <= 13)
+    degrees = np.zeros(count, np.int64)
+    numerator = np.zeros(count, np.int64)
+    for j in range(width):
+        d = chars[:, j].astype(np.int64) - 48
+        in_degrees = j < point - 2
+        in_minutes = ~in_degrees & (j < length) & (j != point)
+        degrees = np.where(in_degrees, degrees * 10 + d, degrees)
+        numerator = np.where(in_minutes, numerator * 10 + d, numerator)
+    denominator = 10.0 ** np.where(exact, decimals, 0)
+    result = degrees.astype(np.float64) + \
+        numerator.astype(np.float64) / denominator / 60
+
+    for i in np.flatnonzero(valid & ~exact):
+        result[i] = dm_to_sd(values[i].decode('latin-1'))
+    result[~valid] = np.nan
+    # as `dm_to_sd`
+    result[(length == 0) | (values == b'0')] = 0.
+
+    if directions is not None:
+        directions = _bytes_array(directions)
+        sign = np.where((directions == b'N') | (directions == b'E'), 1.,
+                        np.where((directions == b'S') | (directions == b'W'),
+                                 -1., 0.))
+        result *= sign
+    return result
+
+
+def timestamp_array(values, dates=None):
+    '''
+    Converts a sequence or array of timestamps given in "hhmmss[.ss]" format
+    (as text or bytes) to a NumPy array of `timedelta64[us]` since midnight,
+    like `timestamp`. If the `dates` of the timestamps are given (as for
+    `datestamp_array`, or `datetime64`), returns `datetime64[us]` instead.
+    Invalid timestamps are NaT.
+
+    Requires numpy.
+    '''
+    import numpy as np
+
+    values, chars, length = _char_matrix(values, 13)
+    digit = (chars >= 48) & (chars <= 57)
+    inside = np.arange(chars.shape[1]) < length[:, None]
+    digits = chars[:, :13].astype(np.int64) - 48
+
+    # 'hhmmss', optionally followed by '.' and digits
+    fast = digit[:, :6].all(axis=1) & \
+        ((length == 6) | ((chars[:, 6] == 46) & (length > 7))) & \
+        (digit[:, 7:] | ~inside[:, 7:]).all(axis=1)
+    hours = digits[:, 0] * 10 + digits[:, 1]
+    minutes = digits[:, 2] * 10 + digits[:, 3]
+    seconds = digits[:, 4] * 10 + digits[:, 5]
+    fast &= (hours < 24) & (minutes < 60) & (seconds < 60)
+
+    # fraction of a second, truncated to microseconds
+    micro = np.zeros(len(values), np.int64)
+    for j in range(7, 13):
+        micro = micro * 10 + np.where(j < length, digits[:, j], 0)
+    result = (((hours * 60 + minutes) * 60 + seconds) * 1000000 + micro) \
+        .astype('timedelta64[us]')
+    result[~fast] = np.timedelta64('NaT')
+
+    for i in np.flatnonzero(~fast & (length > 0)):
+        try:
+            t = timestamp(values[i].decode('latin-1'))
+        except (ValueError, OverflowError):
+            continue
+        result[i] = np.timedelta64(
+            ((t.hour * 60 + t.minute) * 60 + t.second) * 1000000 +
+            t.microsecond, 'us')
+
+    if dates is None:
+        return result
+    dates = np.asarray(dates)
+    if dates.dtype.kind != 'M':
+        dates = datestamp_array(dates)
+    return dates.astype('datetime64[us]') + result
+
+
+def datestamp_array(values):
+    '''
+    Converts a sequence or array of datestamps given in "DDMMYY" format (as
+    text or bytes) to a NumPy array of `datetime64[D]`, like `datestamp`.
+    Invalid datestamps are NaT.
+
+    Requires numpy.
+    '''
+    import numpy as np
+
+    values, chars, length = _char_matrix(values, 6)
+    digits = chars[:, :6].astype(np.int64) - 48
+    fast = (length == 6) & ((digits >= 0) & (digits <= 9)).all(axis=1)
+    days = digits[:, 0] * 10 + digits[:, 1]
+    months = digits[:, 2] * 10 + digits[:, 3]
+    years = digits[:, 4] * 10 + digits[:, 5]
+    # as `strptime('%y')`
+    years = np.where(years < 69, years + 2000, years + 1900)
+
+    valid = fast & (months >= 1) & (months <= 12) & (days >= 1)
+    month = ((years - 1970) * 12 + np.where(valid, months - 1, 0)) \
+        .astype('datetime64[M]')
+    result = month.astype('datetime64[D]') + \
+        np.where(valid, days - 1, 0).astype('timedelta64[D]')
+    # days past the end of the month
+    valid &= result.astype('datetime64[M]') == month
+    result[~valid] = np.datetime64('NaT')
+
+    for i in np.flatnonzero(~fast & (length > 0)):
+        try:
+            result[i] = np.datetime64(datestamp(values[i].decode('latin-1')))
+        except ValueError:
+            pass
+    return result
+
+
+def _char_matrix(values, width=1):
+    '''
+    Returns `values` as a NumPy array of bytes at least `width` wide, the
+    matrix of their characters (NUL padded), and their lengths
+    '''
+    import numpy as np
+
+    values = _bytes_array(values)
+    if values.dtype.itemsize < width:
+        values = values.astype('S%d' % width)
+    chars = np.ascontiguousarray(values).view(np.uint8).reshape(
+        len(values), values.dtype.itemsize)
+    return values, chars, (chars != 0).sum(axis=1)
+
+
+def _bytes_array(values):
+    '''
+    Returns `values` as a NumPy array of bytes
+    '''
+    import numpy as np
+
+    if not isinstance(values, np.ndarray):
+        try:
+            values = np.array(values, dtype=np.bytes_)
+        except UnicodeEncodeError:
+            values = np.array(values, dtype=np.str_)
+    if values.dtype.kind != 'S':
+        if values.dtype.kind != 'U':
+            values = values.astype(np.str_)
+        try:
+            values = values.astype(np.bytes_)
+        except UnicodeEncodeError:
+            values = np.array([v.encode('ascii', 'replace') for v in values],
+                              dtype=np.bytes_)
+    return values
+
+
+def _cached(func):
+    '''
+    Decorator for a property of a sentence which is derived from its fields,
+    keeping the value with the converted fields when `cache_fields` is set
+    '''
+    name = func.__name__
+    def get(self):
+        cache = self._cache
+        if cache is None:
+            if not self.cache_fields:
+                return func(self)
+            cache = self._cache = {}
+        try:
+            return cache[name]
+        except KeyError:
+            v = cache[name] = func(self)
+            return v
+    return property(get, doc=func.__doc__)
+
+
 class LatLonFix(object):
     '''Mixin to add `latitude` and `longitude` properties as signed decimals
     to NMEA sentences which have co-ordinates given as degrees/minutes (lat, lon)
     and cardinal directions (lat_dir, lon_dir)'''
+    __slots__ = ()
     #pylint: disable=no-member
-    @property
+    @_cached
     def latitude(self):
         '''Latitude in signed degrees (python float)'''
         sd = dm_to_sd(self.lat)
@@ -74,7 +276,7 @@ class LatLonFix(object):
         else:
             return 0.
 
-    @property
+    @_cached
     def longitude(self):
         '''Longitude in signed degrees (python float)'''
         sd = dm_to_sd(self.lon)
@@ -93,24 +295,25 @@ class LatLonFix(object):
     def _seconds(x):
         return abs(x * 3600.) % 60.
 
-    @property
+    @_cached
     def latitude_minutes(self):
         return self._minutes(self.latitude)
 
-    @property
+    @_cached
     def longitude_minutes(self):
         return self._minutes(self.longitude)
 
-    @property
+    @_cached
     def latitude_seconds(self):
         return self._seconds(self.latitude)
 
-    @property
+    @_cached
     def longitude_seconds(self):
         return self._seconds(self.longitude)
 
 
 class DatetimeFix(object):
+    __slots__ = ()
     #pylint: disable=no-member
     @property
     def datetime(self):
@@ -118,6 +321,7 @@ class DatetimeFix(object):
 
 
 class ValidStatusFix(object):
+    __slots__ = ()
     #pylint: disable=no-member
     @property
     def is_valid(self):
@@ -125,6 +329,7 @@ class ValidStatusFix(object):
 
 
 class ValidRMCStatusFix(ValidStatusFix):
+    __slots__ = ()
     #pylint: disable=no-member
     @property
     def is_valid(self):
@@ -137,6 +342,7 @@ class ValidRMCStatusFix(ValidStatusFix):
 
 
 class ValidGSAFix(object):
+    __slots__ = ()
     #pylint: disable=no-member
     @property
     def is_valid(self):
@@ -144,6 +350,7 @@ class ValidGSAFix(object):
 
 
 class ValidGGAFix(object):
+    __slots__ = ()
     #pylint: disable=no-member
     @property
     def is_valid(self):
@@ -151,6 +358,7 @@ class ValidGGAFix(object):
 
 
 class ValidVBWFix(object):
+    __slots__ = ()
     #pylint: disable=no-member
     @property
     def is_valid(self):
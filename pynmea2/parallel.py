@@ -0,0 +1,195 @@
+'''
+Parses large log files on several processes.
+
+The file is split into ranges of about `chunk_size` bytes which end at a
+newline, and each range is parsed by a worker of a
+`concurrent.futures.ProcessPoolExecutor`. Results are returned in the order
+of the file.
+
+Requires Python 3.
+'''
+import collections
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from . import compression, nmea
+from .nmea import NMEASentence
+
+__all__ = ['parallel_read']
+
+ERRORS = ('raise', 'ignore')
+
+# default size of the ranges of the file parsed by each task, in bytes
+CHUNK_SIZE = 1 << 24
+
+
+def parallel_read(path, workers=None, cls=None, check=False, errors='raise',
+                  include=None, exclude=None, chunk_size=CHUNK_SIZE):
+    '''
+    Parses the file at `path` with `workers` processes (default: the number
+    of CPUs). The file may be uncompressed or block gzip compressed (see
+    `pynmea2.compression`).
+
+    Returns an iterator of the sentences of the file, in order. If `cls` is
+    given, it returns an iterator of the columns of the sentences of class
+    `cls` in each range of the file instead, as dicts of NumPy arrays (see
+    `columnar.decode`), which are much cheaper to send back from the workers
+    than sentence objects.
+
+    `errors` is `'raise'` (default) to raise the first exception `parse`
+    would have raised, or `'ignore'` to skip lines which could not be
+    parsed. See `NMEASentence.parse` for the other arguments.
+    '''
+    if errors not in ERRORS:
+        raise ValueError('errors must be one of %r (was: %r)'
+                         % (ERRORS, errors))
+    workers = workers or os.cpu_count() or 1
+    # bound the results held before they are consumed
+    window = 2 * workers
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending = collections.deque()
+        try:
+            for start, end in _ranges(path, chunk_size):
+                pending.append(executor.submit(
+                    _read_range, path, start, end, cls, check, errors,
+                    include, exclude))
+                if len(pending) >= window:
+                    for result in _results(pending.popleft(), cls):
+                        yield result
+            while pending:
+                for result in _results(pending.popleft(), cls):
+                    yield result
+        finally:
+            # when stopped early, do not wait for the remaining ranges
+            for future in pending:
+                future.cancel()
+
+
+def _results(future, cls):
+    result = future.result()
+    if cls is None:
+        return _unpack(*result)
+    return (result,)
+
+
+def _ranges(path, chunk_size):
+    '''
+    Splits the file at `path` into ranges of about `chunk_size` bytes which
+    end after a newline, or at the end of the file
+    '''
+    start = 0
+    with compression.open(path, 'rb', seekable=True) as f:
+        size = f.seek(0, os.SEEK_END)
+        while start < size:
+            end = start + chunk_size
+            if end < size:
+                f.seek(end - 1)
+                f.readline()
+                end = f.tell()
+            else:
+                end = size
+            yield start, end
+            start = end
+
+
+def _read_range(path, start, end, cls, check, errors, include, exclude):
+    '''
+    Parses the lines between `start` and `end` in the file at `path`, in a
+    worker process
+    '''
+    with compression.open(path, 'rb', seekable=True) as f:
+        f.seek(start)
+        data = f.read(end - start)
+    lines = data.split(b'\n')
+    if not lines[-1]:
+        lines.pop()
+
+    if cls is not None:
+        from . import columnar
+        if include is not None or exclude is not None:
+            lines = [line for line in lines if nmea._wanted(
+                line, nmea._BYTES_SYNTAX, include, exclude)]
+        return columnar.decode(lines, cls, check, errors)
+
+    return _pack(NMEASentence.parse_many(
+        lines, check, errors, include=include, exclude=exclude)[0])
+
+
+def _pack(msgs):
+    '''
+    Converts sentences to a form which is much faster to pickle than the
+    sentences themselves: the classes and slots other than `data` which
+    they share, the index of these for each sentence, and the data of all
+    the sentences in one string. Sentences whose data cannot be joined are
+    sent as they are, with an index of -1.
+    '''
+    keys = {}
+    indexes = []
+    datas = []
+    others = []
+    for msg in msgs:
+        t = type(msg)
+        state = []
+        data = None
+        for name, slot in t._state_slots:
+            try:
+                value = slot.__get__(msg, t)
+            except AttributeError:
+                continue
+            if name == 'data':
+                data = value
+            else:
+                state.append((name, value))
+
+        data_str = None
+        if data and all(type(v) is str for v in data):
+            data_str = ','.join(data)
+            if data_str.count(',') != len(data) - 1 or '\n' in data_str:
+                data_str = None
+        if data_str is None:
+            indexes.append(-1)
+            datas.append('')
+            others.append(msg)
+            continue
+
+        key = t, tuple(state)
+        index = keys.get(key)
+        if index is None:
+            index = keys[key] = len(keys)
+        indexes.append(index)
+        datas.append(data_str)
+
+    keys = sorted(keys, key=keys.get)
+    return keys, indexes, '\n'.join(datas), others
+
+
+def _unpack(keys, indexes, datas, others):
+    '''
+    Rebuilds the sentences converted by `_pack`
+    '''
+    # the class of each key, and the functions setting its slots
+    builders = []
+    for cls, state in keys:
+        slots = dict(cls._state_slots)
+        builders.append((cls, tuple(
+            (slots[name].__set__, value) for name, value in state)))
+
+    others = iter(others)
+    new = object.__new__
+    set_cache = nmea._set_cache
+    set_data = nmea._set_data
+    msgs = []
+    append = msgs.append
+    for index, data_str in zip(indexes, datas.split('\n')):
+        if index < 0:
+            append(next(others))
+            continue
+        cls, setters = builders[index]
+        msg = new(cls)
+        set_cache(msg, None)
+        for setter, value in setters:
+            setter(msg, value)
+        set_data(msg, data_str.split(','))
+        append(msg)
+    return msgs
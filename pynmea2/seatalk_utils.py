@@ -2,6 +2,7 @@
 class SeaTalk(object):
     '''Mixin to add Seatalk functionality. Based on Thomas knauf's work
     http://www.thomasknauf.de/seatalk.htm'''
+    __slots__ = ()
     byte_to_command = {
         '00': 'Depth below transducer',
         '01': 'Equipment ID',
@@ -1,21 +1,44 @@
-from __future__ import unicode_literals
+import datetime
+import io
+import os
+import time
+
 from . import nmea
 
-__all__ = ['NMEAStreamReader']
+__all__ = ['NMEAStreamReader', 'NMEAWriter', 'DatetimeTracker']
 
 ERRORS = ('raise', 'yield', 'ignore')
 
+# default `max_line_length` of NMEAStreamReader
+MAX_LINE_LENGTH = 4096
+
+# number of talker addresses after which the cache of their classes is reset
+MAX_TALKERS = 1024
+
+# default `flush_size` of NMEAWriter
+FLUSH_SIZE = 1 << 16
+
+_monotonic = getattr(time, 'monotonic', time.time)
+
+HALF_DAY = 12 * 3600
+ONE_DAY = datetime.timedelta(days=1)
+
 class NMEAStreamReader(object):
     '''
     Reads NMEA sentences from a stream.
     '''
-    def __init__(self, stream=None, errors='raise'):
+    def __init__(self, stream=None, errors='raise', lazy=False,
+                 include=None, exclude=None,
+                 max_line_length=MAX_LINE_LENGTH, chunk_size=None,
+                 reuse=False):
         '''
         Create NMEAStreamReader object.
 
         `stream`:   file-like object to read from, can be omitted to
                     pass data to `next` manually.
                     must support `.readline()` which returns a string
+                    (or `bytes`, see `next`), or `.read(size)` if
+                    `chunk_size` is given
 
         `errors`: behaviour when a parse error is encountered. can be one of:
             `'raise'` (default) raise an exception immediately
@@ -23,42 +46,204 @@ class NMEAStreamReader(object):
                                 stream, and continue reading at the next line
             `'ignore'`          completely ignore and suppress the error, and
                                 continue reading at the next line
+
+        `lazy`:   if True, sentences are parsed with `lazy=True` (see
+                  `NMEASentence.parse`): checksum errors are then raised
+                  when a field of the sentence is first read, regardless
+                  of `errors`
+
+        `include`, `exclude`: sets of sentence types to read or skip, see
+                  `NMEASentence.parse`
+
+        `max_line_length`: lines longer than this are dropped up to the
+                  next '$' or '!', as a ParseError handled according to
+                  `errors`, so that data without newlines does not
+                  accumulate. None for no limit
+
+        `chunk_size`: if given, `next` reads up to this many characters
+                  with `stream.read` instead of calling `stream.readline()`
+
+        `reuse`:  if True, each sentence is parsed into the last sentence
+                  of the same class yielded, if any (see
+                  `NMEASentence.parse_into`), so sentences must be used or
+                  copied before the next one is read. Cannot be combined
+                  with `lazy`
         '''
 
         if errors not in ERRORS:
             raise ValueError('errors must be one of {!r} (was: {!r})'
                     .format(ERRORS, errors))
+        if lazy and reuse:
+            raise ValueError('lazy and reuse cannot be combined')
 
         self.errors = errors
         self.stream = stream
-        self.buffer = ''
+        self.lazy = lazy
+        self.include = include
+        self.exclude = exclude
+        self.max_line_length = max_line_length
+        self.chunk_size = chunk_size
+        # the data received after the last newline, as the chunks it was
+        # received in so that it is only copied once the line is complete
+        self._pending = []
+        self._pending_length = 0
+        # True when dropping the rest of a line which was too long, up to
+        # the next '$', '!' or newline
+        self._skipping = False
+        # see `nmea._parse_talker`
+        self._talkers = {}
+        # the last sentence of each class with `reuse`, see `nmea._parse_into`
+        self._pool = {} if reuse else None
+
+    @property
+    def buffer(self):
+        '''
+        The data received after the last newline
+        '''
+        if not self._pending:
+            return ''
+        return self._pending[0][:0].join(self._pending)
+
+    @buffer.setter
+    def buffer(self, data):
+        '''
+        Replaces the data received after the last newline, such as with ''
+        to drop a partial line
+        '''
+        if isinstance(data, (bytearray, memoryview)):
+            data = bytes(data)
+        self._pending = [data] if data else []
+        self._pending_length = len(data)
+        self._skipping = False
 
     def next(self, data=None):
         '''
-        consume `data` (if given, or calls `stream.read()` if `stream` was given
+        consume `data` (if given, or reads from `stream` if `stream` was given
         in the constructor) and yield a list of `NMEASentence` objects parsed
         from the stream (may be empty)
+
+        `data` may be a string, or `bytes`/`bytearray`/`memoryview` in which
+        case the lines are split and parsed without being decoded first (see
+        `NMEASentence.parse_bytes`)
         '''
         if data is None:
-            if self.stream:
+            if not self.stream:
+                return
+            if self.chunk_size:
+                data = self.stream.read(self.chunk_size)
+            else:
                 data = self.stream.readline()
+
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data)
+            newline, starts = b'\n', (b'$', b'!')
+        else:
+            newline, starts = '\n', ('$', '!')
+
+        if self._skipping:
+            data = self._skip(data, newline, starts)
+
+        # only the new data is scanned for the end of the line
+        end = data.rfind(newline)
+        if end == -1:
+            lines = []
+        else:
+            if self._pending:
+                self._pending.append(data[:end])
+                lines = data[:0].join(self._pending).split(newline)
+                self._pending = []
+                self._pending_length = 0
             else:
-                return
+                lines = data[:end].split(newline)
+            data = data[end + 1:]
 
-        lines = (self.buffer + data).split('\n')
-        self.buffer = lines.pop()
+        limit = self.max_line_length
+        # the start of the pending line, if it was dropped for being too long
+        overflow = None
+        if data:
+            self._pending.append(data)
+            self._pending_length += len(data)
+            if limit and self._pending_length > limit:
+                line = data[:0].join(self._pending)
+                overflow, rest = _resync(line, limit, starts)
+                if rest:
+                    self._pending = [rest]
+                    self._pending_length = len(rest)
+                else:
+                    self._pending = []
+                    self._pending_length = 0
+                    self._skipping = True
 
+        if isinstance(data, bytes):
+            syntax = nmea._BYTES_SYNTAX
+        else:
+            syntax = nmea._TEXT_SYNTAX
+        filtered = self.include is not None or self.exclude is not None
+        talkers = self._talkers
+        if len(talkers) > MAX_TALKERS:
+            # addresses of garbage lines
+            talkers.clear()
+
+        # errors are only built into exceptions when they are raised or yielded
+        parse = nmea._parse_cached
+        parse_into = nmea._parse_into
+        pool = self._pool
         for line in lines:
-            try:
-                msg = nmea.NMEASentence.parse(line)
-                yield msg
-            except nmea.ParseError as e:
+            if limit and len(line) > limit:
+                head, line = _resync(line, limit, starts)
                 if self.errors == 'raise':
-                    raise e
+                    raise _overflow(head, limit)
                 if self.errors == 'yield':
-                    yield e
+                    yield _overflow(head, limit)
+                if line is None:
+                    continue
+
+            if filtered and not nmea._wanted(
+                    line, syntax, self.include, self.exclude):
+                continue
+            try:
+                if pool is None:
+                    msg = parse(line, syntax, False, self.lazy, talkers)
+                else:
+                    msg = parse_into(line, syntax, False, None, pool, talkers)
+            except Exception as e:
+                # the constructors of some sentence classes fail on
+                # malformed data
+                msg = e
+            if isinstance(msg, (nmea.ParseFailure, Exception)):
                 if self.errors == 'ignore':
-                    pass
+                    continue
+                if isinstance(msg, nmea.ParseFailure):
+                    error = msg.exception(line)
+                else:
+                    error = nmea.ParseError(
+                        'could not parse sentence: %r' % msg, line)
+                if self.errors == 'raise':
+                    raise error
+                yield error
+                continue
+            yield msg
+
+        if overflow is not None:
+            if self.errors == 'raise':
+                raise _overflow(overflow, limit)
+            if self.errors == 'yield':
+                yield _overflow(overflow, limit)
+
+    def _skip(self, data, newline, starts):
+        '''
+        Drops the start of `data` up to the next '$' or '!', or up to and
+        including the next newline
+        '''
+        found = [i for i in (data.find(newline), data.find(starts[0]),
+                             data.find(starts[1])) if i != -1]
+        if not found:
+            return data[:0]
+        self._skipping = False
+        i = min(found)
+        if data[i:i + 1] == newline:
+            return data[i + 1:]
+        return data[i:]
 
     __next__ = next
 
@@ -73,3 +258,235 @@ class NMEAStreamReader(object):
                   print msg
         '''
         return self
+
+
+def _resync(line, limit, starts):
+    '''
+    Splits a line longer than `limit` at the first '$' or '!' which leaves
+    at most `limit` characters. Returns the part before it, and the rest (or
+    None if there is no such '$' or '!')
+    '''
+    found = [i for i in (line.find(starts[0], max(1, len(line) - limit)),
+                         line.find(starts[1], max(1, len(line) - limit)))
+             if i != -1]
+    if not found:
+        return line, None
+    i = min(found)
+    return line[:i], line[i:]
+
+
+def _overflow(head, limit):
+    return nmea.ParseError(
+        'line exceeds %d characters' % limit, head[:limit])
+
+
+class NMEAWriter(object):
+    '''
+    Writes NMEA sentences to a stream. Sentences are rendered into a buffer
+    which is written out in large batches.
+
+      with NMEAWriter(sock) as writer:
+          for msg in msgs:
+              writer.write(msg)
+    '''
+    def __init__(self, stream, newline='\r\n', checksum=True,
+                 flush_size=FLUSH_SIZE, flush_interval=None, fsync=False):
+        '''
+        Create NMEAWriter object.
+
+        `stream`: file-like object to write to, in text or binary mode
+                  (sentences are then encoded as latin-1), or a socket
+
+        `newline`: appended to each sentence, CRLF by default as the
+                  standard requires. Files in text mode should be opened
+                  with `newline=''` so that it is written unchanged
+
+        `checksum`: whether to append the checksum of each sentence
+
+        `flush_size`: the buffer is written to `stream` once it holds this
+                  many characters (0 to write each sentence at once)
+
+        `flush_interval`: if given, the buffer is also written when a
+                  sentence is added this many seconds after the last write
+
+        `fsync`: if True, `os.fsync` is called after each write to a file,
+                  so that the sentences written survive a system crash
+        '''
+        self.stream = stream
+        self.newline = newline
+        self.checksum = checksum
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        # sockets have no `write`
+        self._write = getattr(stream, 'write', None) or stream.sendall
+        self._binary = not isinstance(stream, io.TextIOBase)
+        self._buffer = []
+        self._size = 0
+        self._last = _monotonic()
+
+    def write(self, msg):
+        '''
+        Add a sentence: an `NMEASentence`, or a tuple (or list) of its
+        address and fields, such as `('GPGGA', '184353.07', ...)`
+        '''
+        self.write_many((msg,))
+
+    def write_many(self, msgs):
+        '''
+        Add the sentences (or tuples, see `write`) of an iterable
+        '''
+        append = self._buffer.append
+        checksum = self.checksum
+        newline = self.newline
+        flush_size = self.flush_size
+        interval = self.flush_interval
+        sentence = nmea.NMEASentence
+        size = self._size
+        for msg in msgs:
+            if isinstance(msg, sentence):
+                line = msg.render(checksum, True, newline)
+            else:
+                line = _render_fields(msg, checksum, newline)
+            append(line)
+            size += len(line)
+            if size >= flush_size or (
+                    interval is not None and
+                    _monotonic() - self._last >= interval):
+                self.flush()
+                size = 0
+        self._size = size
+
+    def flush(self):
+        '''
+        Write the buffered sentences to `stream`
+        '''
+        if self._buffer:
+            data = ''.join(self._buffer)
+            del self._buffer[:]
+            self._size = 0
+            if self._binary:
+                data = data.encode(nmea.ENCODING)
+            self._write(data)
+        self._last = _monotonic()
+        flush = getattr(self.stream, 'flush', None)
+        if flush is not None:
+            flush()
+            if self.fsync:
+                os.fsync(self.stream.fileno())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
+
+
+def _render_fields(fields, checksum, newline):
+    '''
+    Renders a sentence given as a tuple of its address and fields
+    '''
+    try:
+        body = ','.join(fields)
+    except TypeError:
+        body = ','.join(map(str, fields))
+    return nmea._render(body, checksum, True, newline)
+
+
+class DatetimeTracker(object):
+    '''
+    Attaches the full UTC datetime to timestamped sentences (GGA, GLL, GST,
+    ...) using the date of the latest sentence which carries one (RMC, ZDA,
+    TNLGGK, ...), without looking back in the stream.
+
+      tracker = DatetimeTracker()
+      for batch in NMEAStreamReader(stream):
+          for dt, msg in tracker.track(batch):
+              print dt, msg
+    '''
+    def __init__(self, date=None):
+        '''
+        `date`: the date of the timestamps read before the first sentence
+                with a datestamp, if known
+        '''
+        self.date = date
+        # seconds of the day of the latest timestamp on `self.date`
+        self.seconds = None
+
+    def update(self, msg):
+        '''
+        Returns the datetime of `msg`, or None if it has no timestamp or no
+        date is known yet.
+
+        Timestamps more than 12 hours before the latest one are taken to be
+        on the next day (UTC midnight rollover), and timestamps more than
+        12 hours after it on the previous day (late sentences).
+        '''
+        time = getattr(msg, 'timestamp', None) if \
+            _has(type(msg), 'timestamp') else None
+        if isinstance(time, datetime.datetime):
+            return time
+        if isinstance(time, datetime.time):
+            seconds = time.hour * 3600 + time.minute * 60 + time.second + \
+                time.microsecond / 1e6
+        else:
+            time = seconds = None
+
+        date = _datestamp(msg)
+        if date is not None:
+            self.date = date
+            self.seconds = seconds
+        elif time is None or self.date is None:
+            return None
+        else:
+            date = self.date
+            if self.seconds is not None:
+                delta = seconds - self.seconds
+                if delta < -HALF_DAY:
+                    date = self.date = date + ONE_DAY
+                elif delta > HALF_DAY:
+                    return datetime.datetime.combine(date - ONE_DAY, time)
+            self.seconds = seconds
+
+        if time is None:
+            return None
+        return datetime.datetime.combine(date, time)
+
+    def track(self, msgs):
+        '''
+        Yields `(datetime, msg)` for each sentence of `msgs`, see `update`
+        '''
+        update = self.update
+        for msg in msgs:
+            yield update(msg), msg
+
+
+# (sentence class, attribute) -> whether the class has such a field or
+# property, to avoid the cost of a failed attribute lookup
+_HAS = {}
+
+
+def _has(cls, name):
+    key = cls, name
+    has = _HAS.get(key)
+    if has is None:
+        has = _HAS[key] = hasattr(cls, name) or \
+            name in getattr(cls, 'name_to_idx', ())
+    return has
+
+
+def _datestamp(msg):
+    '''
+    Returns the date carried by `msg`, or None
+    '''
+    if not _has(type(msg), 'datestamp'):
+        return None
+    try:
+        date = getattr(msg, 'datestamp', None)
+    except (TypeError, ValueError):
+        # eg ZDA with missing or invalid day, month or year
+        return None
+    if isinstance(date, datetime.date) and \
+            not isinstance(date, datetime.datetime):
+        return date
+    return None
@@ -32,12 +32,14 @@ class ASHRATT(ASH):
     '''
     RT300 proprietary attitude sentence
     '''
+    __slots__ = ('subtype',)
+
     @staticmethod
     def match(data):
         return re.match(r'^\d{6}\.\d{2,3}$', data[1])
 
     def __init__(self, *args, **kwargs):
-        self.subtype = 'ATT'
+        object.__setattr__(self, 'subtype', 'ATT')
         super(ASHRATT, self).__init__(*args, **kwargs)
 
     fields = (
@@ -9,6 +9,7 @@ from ...nmea_utils import *
 
 class FEC(nmea.ProprietarySentence):
     sentence_types = {}
+    _type_field = 1
 
     def __new__(_cls, manufacturer, data):
         name = manufacturer + data[1]
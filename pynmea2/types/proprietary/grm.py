@@ -6,6 +6,8 @@ from ... import nmea
 
 class GRM(nmea.ProprietarySentence):
     sentence_types = {}
+    _type_field = 0
+    __slots__ = ('sentence_type',)
 
     def __new__(_cls, manufacturer, data):
         name = manufacturer + data[0]
@@ -13,7 +15,7 @@ class GRM(nmea.ProprietarySentence):
         return super(GRM, cls).__new__(cls)
 
     def __init__(self, manufacturer, data):
-        self.sentence_type = manufacturer + data[0]
+        object.__setattr__(self, 'sentence_type', manufacturer + data[0])
         super(GRM, self).__init__(manufacturer, data)
 
 
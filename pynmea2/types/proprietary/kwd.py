@@ -8,6 +8,8 @@ from ... import nmea_utils
 
 class KLD(nmea.ProprietarySentence):
     sentence_types = {}
+    _type_field = 0
+    __slots__ = ('sentence_type',)
 
     def __new__(_cls, manufacturer, data):
         name = manufacturer + data[0]
@@ -15,11 +17,13 @@ class KLD(nmea.ProprietarySentence):
         return super(KLD, cls).__new__(cls)
 
     def __init__(self, manufacturer, data):
-        self.sentence_type = manufacturer + data[0]
+        object.__setattr__(self, 'sentence_type', manufacturer + data[0])
         super(KLD, self).__init__(manufacturer, data)
 
 class KND(nmea.ProprietarySentence):
     sentence_types = {}
+    _type_field = 0
+    __slots__ = ('sentence_type',)
 
     def __new__(_cls, manufacturer, data):
         name = manufacturer + data[0]
@@ -27,11 +31,13 @@ class KND(nmea.ProprietarySentence):
         return super(KND, cls).__new__(cls)
 
     def __init__(self, manufacturer, data):
-        self.sentence_type = manufacturer + data[0]
+        object.__setattr__(self, 'sentence_type', manufacturer + data[0])
         super(KND, self).__init__(manufacturer, data)
 
 class KLS(nmea.ProprietarySentence):
     sentence_types = {}
+    _type_field = 0
+    __slots__ = ('sentence_type',)
 
     def __new__(_cls, manufacturer, data):
         name = manufacturer + data[0]
@@ -39,11 +45,13 @@ class KLS(nmea.ProprietarySentence):
         return super(KLS, cls).__new__(cls)
 
     def __init__(self, manufacturer, data):
-        self.sentence_type = manufacturer + data[0]
+        object.__setattr__(self, 'sentence_type', manufacturer + data[0])
         super(KLS, self).__init__(manufacturer, data)
 
 class KNS(nmea.ProprietarySentence):
     sentence_types = {}
+    _type_field = 0
+    __slots__ = ('sentence_type',)
 
     def __new__(_cls, manufacturer, data):
         name = manufacturer + data[0]
@@ -51,12 +59,14 @@ class KNS(nmea.ProprietarySentence):
         return super(KNS, cls).__new__(cls)
 
     def __init__(self, manufacturer, data):
-        self.sentence_type = manufacturer + data[0]
+        object.__setattr__(self, 'sentence_type', manufacturer + data[0])
         super(KNS, self).__init__(manufacturer, data)
 
 
 class KWD(nmea.ProprietarySentence):
     sentence_types = {}
+    _type_field = 0
+    __slots__ = ('sentence_type',)
 
     def __new__(_cls, manufacturer, data):
         name = manufacturer + data[0]
@@ -64,7 +74,7 @@ class KWD(nmea.ProprietarySentence):
         return super(KWD, cls).__new__(cls)
 
     def __init__(self, manufacturer, data):
-        self.sentence_type = manufacturer + data[0]
+        object.__setattr__(self, 'sentence_type', manufacturer + data[0])
         super(KWD, self).__init__(manufacturer, data)
 
 
@@ -8,6 +8,8 @@ from ... import nmea_utils
 
 class MGN(nmea.ProprietarySentence):
     sentence_types = {}
+    _type_field = 0
+    __slots__ = ('sentence_type',)
 
     def __new__(_cls, manufacturer, data):
         name = manufacturer + data[0]
@@ -15,7 +17,7 @@ class MGN(nmea.ProprietarySentence):
         return super(MGN, cls).__new__(cls)
 
     def __init__(self, manufacturer, data):
-        self.sentence_type = manufacturer + data[0]
+        object.__setattr__(self, 'sentence_type', manufacturer + data[0])
         super(MGN, self).__init__(manufacturer, data)
 
 
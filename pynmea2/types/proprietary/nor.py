@@ -7,6 +7,8 @@ from datetime import datetime
 
 class NOR(ProprietarySentence):
     sentence_types = {}
+    _type_field = 0
+    __slots__ = ('sentence_type',)
 
     def __new__(_cls, manufacturer, data):
         name = manufacturer + data[0]
@@ -14,7 +16,7 @@ class NOR(ProprietarySentence):
         return super(NOR, cls).__new__(cls)
 
     def __init__(self, manufacturer, data):
-        self.sentence_type = manufacturer + data[0]
+        object.__setattr__(self, 'sentence_type', manufacturer + data[0])
         super(NOR, self).__init__(manufacturer, data[1:])
 
     def identifier(self):
@@ -10,6 +10,7 @@ class RDI(nmea.ProprietarySentence):
     RD Instruments message. Only one sentence known?
     '''
     sentence_types = {}
+    _type_field = 0
     def __new__(_cls, manufacturer, data):
         name = manufacturer + data[0]
         cls = _cls.sentence_types.get(name, _cls)
@@ -5,6 +5,8 @@ from ... import nmea
 
 class SRF(nmea.ProprietarySentence):
     sentence_types = {}
+    _type_field = 0
+    __slots__ = ('sentence_type',)
 
     def __new__(_cls, manufacturer, data):
         name = manufacturer + data[0]
@@ -12,7 +14,7 @@ class SRF(nmea.ProprietarySentence):
         return super(SRF, cls).__new__(cls)
 
     def __init__(self, manufacturer, data):
-        self.sentence_type = manufacturer + data[0]
+        object.__setattr__(self, 'sentence_type', manufacturer + data[0])
         super(SRF, self).__init__(manufacturer, data)
 
 
@@ -40,6 +40,7 @@ from ... import nmea
 
 class SXN(nmea.ProprietarySentence):
     sentence_types = {}
+    _type_field = 1
 
     def __new__(_cls, manufacturer, data):
         name = manufacturer + data[1]
@@ -71,12 +71,14 @@ class TNLDG(TNL):
     """
         Trimble DG message (L-band, beacon signal strength, etc)
     """
+    __slots__ = ('subtype',)
+
     @staticmethod
     def match(data):
         return re.match(r'\d+\.\d{1}', data[1])
 
     def __init__(self, *args, **kwargs):
-        self.subtype = 'DG'
+        object.__setattr__(self, 'subtype', 'DG')
         super(TNLDG, self).__init__(*args, **kwargs)
 
     fields = (
@@ -8,6 +8,7 @@ from ...nmea_utils import *
 # u-blox
 class UBX(nmea.ProprietarySentence):
     sentence_types = {}
+    _type_field = 1
 
     def __new__(_cls, manufacturer, data):
         name = manufacturer + data[1]
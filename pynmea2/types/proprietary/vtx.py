@@ -7,6 +7,8 @@ from ...nmea_utils import *
 
 class VTX(nmea.ProprietarySentence):
     sentence_types = {}
+    _type_field = 1
+    __slots__ = ('sentence_type',)
 
     def __new__(_cls, manufacturer, data):
         name = manufacturer + data[1]
@@ -14,7 +16,7 @@ class VTX(nmea.ProprietarySentence):
         return super(VTX, cls).__new__(cls)
 
     def __init__(self, manufacturer, data):
-        self.sentence_type = manufacturer + data[0]
+        object.__setattr__(self, 'sentence_type', manufacturer + data[0])
         super(VTX, self).__init__(manufacturer, data)
 
 
@@ -408,6 +408,7 @@ class RTE(TalkerSentence):
     @waypoint_list.setter
     def waypoint_list(self, val):
         self.data[4:] = val
+        self._data_changed()
 
 
 class R00(TalkerSentence):
@@ -419,6 +420,7 @@ class R00(TalkerSentence):
     @waypoint_list.setter
     def waypoint_list(self, val):
         self.data[:] = val
+        self._data_changed()
 
 
 class STN(TalkerSentence):
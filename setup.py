@@ -30,6 +30,10 @@ setup(
 
     description='Python library for the NMEA 0183 protcol',
     packages=['pynmea2','pynmea2.types','pynmea2.types.proprietary'],
+    python_requires='>=3.7',
+    extras_require={
+        'numpy': ['numpy'],
+    },
     keywords='python nmea gps parse parsing nmea0183 0183',
 
     classifiers=[
@@ -37,12 +41,7 @@ setup(
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',
@@ -0,0 +1,29 @@
+import datetime
+
+import pytest
+
+
+def _make_log(path, start, count):
+    '''
+    Writes a log of GGA sentences every half second, with RMC every second
+    and VTG without timestamps
+    '''
+    lines = []
+    for i in range(count):
+        t = start + datetime.timedelta(seconds=i / 2.)
+        ts = t.strftime('%H%M%S.') + '%02d' % (t.microsecond // 10000)
+        if i % 2 == 0:
+            lines.append('$GPRMC,%s,A,3926.276,N,07739.361,W,0.0,0.0,%s,,E'
+                         % (ts, t.strftime('%d%m%y')))
+        lines.append('$GPGGA,%s,1929.045,S,02410.506,E,1,04,2.6,100.00,M,'
+                     '-33.9,M,,0000' % ts)
+        lines.append('$GPVTG,108.53,T,,M,0.04,N,0.07,K,A')
+    path.write_text('\n'.join(lines) + '\n')
+
+
+@pytest.fixture
+def make_log():
+    '''
+    Returns a function writing a timed log, see `_make_log`
+    '''
+    return _make_log
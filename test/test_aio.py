@@ -0,0 +1,192 @@
+import asyncio
+import socket
+
+import pytest
+
+import pynmea2
+from pynmea2.aio import AsyncNMEAStreamReader, NMEAUDPReceiver, \
+    NMEATCPClient, NMEATCPServer
+
+DATA = b"$GPGGA,184353.07,1929.045,S,02410.506,E,1,04,2.6,100.00,M,-33.9,M,,0000*6D\n"
+
+
+def read_all(data, **kwargs):
+    '''
+    Sends `data` through a socket pair and reads it back
+    '''
+    async def main():
+        a, b = socket.socketpair()
+        reader, writer = await asyncio.open_connection(sock=a)
+        b.sendall(data)
+        b.close()
+        try:
+            return [msg async for msg in AsyncNMEAStreamReader(reader, **kwargs)]
+        finally:
+            writer.close()
+
+    return asyncio.run(main())
+
+
+def test_aio():
+    msgs = read_all(DATA * 1000, chunk_size=100)
+    assert len(msgs) == 1000
+    assert all(str(msg) == DATA.decode().strip() for msg in msgs)
+
+    # the last line does not need a newline
+    msgs = read_all(DATA + DATA.strip())
+    assert len(msgs) == 2
+
+    assert read_all(b'') == []
+
+
+def test_aio_errors():
+    data = DATA + b'foo\n' + DATA
+    with pytest.raises(pynmea2.ParseError):
+        read_all(data)
+
+    msgs = read_all(data, errors='yield')
+    assert [type(msg) for msg in msgs] == \
+        [pynmea2.GGA, pynmea2.ParseError, pynmea2.GGA]
+
+    msgs = read_all(data, errors='ignore', include={'GGA'})
+    assert len(msgs) == 2
+
+
+def test_aio_batch():
+    class Stream(object):
+        def __init__(self, chunks):
+            self.chunks = list(chunks)
+
+        async def read(self, size):
+            return self.chunks.pop(0) if self.chunks else ''
+
+    data = DATA.decode()
+
+    async def main():
+        reader = AsyncNMEAStreamReader(Stream([data * 3, data[:20], data[20:]]))
+        return [await reader.read_batch() for _ in range(4)]
+
+    batches = asyncio.run(main())
+    assert [len(b) for b in batches[:3]] == [3, 0, 1]
+    assert batches[3] is None
+
+
+def test_udp_receiver():
+    async def main():
+        receiver = await NMEAUDPReceiver.create('127.0.0.1', 0)
+        port = receiver.transport.get_extra_info('sockname')[1]
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.sendto(DATA * 3, ('127.0.0.1', port))
+        sock.sendto(DATA.strip(), ('127.0.0.1', port))
+        sock.close()
+        msgs = []
+        while len(msgs) < 4:
+            msgs.extend(await receiver.read_batch())
+        receiver.close()
+        assert await receiver.read_batch() is None
+        return msgs
+
+    msgs = asyncio.run(main())
+    assert len(msgs) == 4
+    assert all(isinstance(msg, pynmea2.GGA) for msg in msgs)
+
+
+def test_udp_receiver_errors():
+    async def main():
+        receiver = NMEAUDPReceiver()
+        receiver.datagram_received(DATA + b'foo', None)
+        assert len(await receiver.read_batch()) == 1
+        with pytest.raises(pynmea2.ParseError):
+            await receiver.read_batch()
+
+        receiver = NMEAUDPReceiver(errors='yield')
+        receiver.datagram_received(b'foo\n' + DATA, None)
+        return await receiver.read_batch()
+
+    msgs = asyncio.run(main())
+    assert [type(msg) for msg in msgs] == [pynmea2.ParseError, pynmea2.GGA]
+
+
+def test_tcp():
+    async def main():
+        server = await NMEATCPServer.create('127.0.0.1', 0)
+        port = server.server.sockets[0].getsockname()[1]
+        # devices sending to the server
+        for _ in range(2):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(DATA * 10)
+            await writer.drain()
+            writer.close()
+        msgs = []
+        while len(msgs) < 20:
+            msgs.extend(await server.read_batch())
+        server.close()
+        assert await server.read_batch() is None
+        return msgs
+
+    msgs = asyncio.run(main())
+    assert len(msgs) == 20
+
+
+def test_tcp_client_reconnect():
+    async def main():
+        connections = []
+
+        async def handle(reader, writer):
+            connections.append(writer)
+            writer.write(DATA * 5)
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client = await NMEATCPClient.create(
+            '127.0.0.1', port, min_delay=0.01, max_delay=0.02)
+        msgs = []
+        while len(msgs) < 15:
+            msgs.extend(await client.read_batch())
+        client.close()
+        server.close()
+        assert await client.read_batch() is None
+        assert client.connections >= 3
+        return msgs
+
+    msgs = asyncio.run(main())
+    assert all(isinstance(msg, pynmea2.GGA) for msg in msgs)
+
+
+def test_malformed_proprietary():
+    # ASH sentences without a sentence type fail in their constructor
+    bad = b'$PASH\n'
+
+    async def main():
+        receiver = NMEAUDPReceiver(errors='ignore')
+        receiver.datagram_received(bad + DATA, None)
+        assert len(await receiver.read_batch()) == 1
+
+        async def handle(reader, writer):
+            writer.write(DATA + bad + DATA)
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client = await NMEATCPClient.create(
+            '127.0.0.1', port, min_delay=0.01, max_delay=0.02)
+        errors = 0
+        msgs = []
+        while len(msgs) < 3:
+            try:
+                batch = await asyncio.wait_for(client.read_batch(), 5)
+            except pynmea2.ParseError:
+                errors += 1
+                continue
+            msgs.extend(batch)
+        client.close()
+        server.close()
+        assert errors >= 1
+        assert client.connections >= 2
+        return msgs
+
+    msgs = asyncio.run(main())
+    assert all(isinstance(msg, pynmea2.GGA) for msg in msgs)
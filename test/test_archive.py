@@ -0,0 +1,106 @@
+from io import BytesIO
+
+import pytest
+
+import pynmea2
+from pynmea2 import archive
+
+DATA = [
+    '$GPGGA,184353.07,1929.045,S,02410.506,E,1,04,2.6,100.00,M,-33.9,M,,0000*6D',
+    '$GNGGA,184354.07,1929.046,S,02410.507,E,1,12,,99.5,M,-33.9,M,,0000',
+    '$GPGGA,184355.07,1929.047,S,02410.508,E,,,2.60,1e2,M,nan,M,,0000',
+    '$GPRMC,181031.576,V,3926.276,N,07739.361,W,99.7,18.30,250915,,E*79',
+    '$GPRMC,181034.576,V,3949.797,N,07809.854,W,18.8,34.66,250915,,E,A',
+    '$PASHR,130533.620,0.311,T,-80.467,-1.395,,0.066,0.067,0.215,2,3*0B',
+    '$PGRME,15.0,M,45.0,M,25.0,M*1C',
+    '$CCGPQ,GGA*2B',
+    '$GPTXT,01,01,02,caf\xe9*C0',
+]
+
+
+def round_trip(msgs, **kwargs):
+    f = BytesIO()
+    writer = archive.ArchiveWriter(f, **kwargs)
+    writer.write_many(msgs)
+    writer.flush()
+    f.seek(0)
+    return archive.ArchiveReader(f).read()
+
+
+def test_archive():
+    msgs = [pynmea2.parse(line) for line in DATA] * 3
+    for block_size in (archive.BLOCK_SIZE, 4):
+        result = round_trip(msgs, block_size=block_size)
+        assert [type(msg) for msg in result] == [type(msg) for msg in msgs]
+        assert [msg.data for msg in result] == [msg.data for msg in msgs]
+        assert [str(msg) for msg in result] == [str(msg) for msg in msgs]
+        assert [repr(msg) for msg in result] == [repr(msg) for msg in msgs]
+    assert result[0].talker == 'GP'
+    assert result[1].talker == 'GN'
+    assert result[1].num_sats == '12'
+    assert result[5].manufacturer == 'ASH'
+    assert result[7].listener == 'GP'
+
+    lazy = pynmea2.parse(DATA[0], lazy=True)
+    assert round_trip([lazy])[0].data == lazy.data
+
+
+def test_archive_columns():
+    def spec(convert, values):
+        field = ('Field', 'field', convert)
+        return archive._encode_column(field, values, pynmea2.GGA)[0]
+
+    assert spec(float, ('100.00', '', '99.50')) == ['f', 0, 2]
+    assert spec(float, ('02410.506', '12345.000')) == ['f', 9, 3]
+    assert spec(int, ('', '04', '12')) == ['i', 2]
+    assert spec(int, ('7', '12')) == ['i', 0]
+    # values which would not render back are kept as text
+    assert spec(float, ('100.00', '99.5')) == ['s']
+    assert spec(float, ('1e2',)) == ['s']
+    assert spec(float, ('nan',)) == ['s']
+    assert spec(int, ('4', '04')) == ['s']
+    assert spec(None, ('4', '5')) == ['s']
+
+
+def test_archive_errors(tmp_path):
+    msg = pynmea2.parse(DATA[0])
+    msg.data[3] = 1
+    with pytest.raises(ValueError):
+        round_trip([msg])
+    msg.data[3] = 'a\nb'
+    with pytest.raises(ValueError):
+        round_trip([msg])
+
+    path = tmp_path / 'log.nmea'
+    path.write_text('\n'.join(DATA))
+    with pytest.raises(ValueError):
+        archive.ArchiveReader(str(path))
+
+
+def test_archive_decode(tmp_path):
+    np = pytest.importorskip('numpy')
+    from pynmea2 import columnar
+
+    path = str(tmp_path / 'log.arc')
+    with archive.ArchiveWriter(path, block_size=5) as writer:
+        writer.write_many(pynmea2.parse(line) for line in DATA * 3)
+    for cls in (pynmea2.GGA, pynmea2.RMC, pynmea2.GSA):
+        with archive.ArchiveReader(path) as reader:
+            result = reader.decode(cls)
+        expected = columnar.decode(DATA * 3, cls)
+        assert sorted(result) == sorted(expected)
+        for name in expected:
+            np.testing.assert_array_equal(result[name], expected[name])
+
+
+def test_archive_reread(tmp_path):
+    pytest.importorskip('numpy')
+    path = str(tmp_path / 'log.arc')
+    msgs = [pynmea2.parse(line) for line in DATA]
+    with archive.ArchiveWriter(path, block_size=4) as writer:
+        writer.write_many(msgs)
+    with archive.ArchiveReader(path) as reader:
+        assert len(reader.decode(pynmea2.GGA)['timestamp']) == 3
+        assert len(reader.decode(pynmea2.RMC)['timestamp']) == 2
+        assert [str(msg) for msg in reader.read()] == [str(msg) for msg in msgs]
+        assert len(list(reader)) == len(msgs)
@@ -0,0 +1,141 @@
+import datetime
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import pynmea2
+from pynmea2 import columnar
+
+
+LINES = [
+    '$GPGGA,184353.07,1929.045,S,02410.506,E,1,04,2.6,100.00,M,-33.9,M,,0000*6D',
+    '$GPGGA,181032.576,3926.276,N,07739.361,W,0,00,,,M,,M,,*5F',
+    '$GPRMC,181031.576,V,3926.276,N,07739.361,W,99.7,18.30,250915,,E*79',
+    '$GPRMC,181034.576,V,3949.797,N,07809.854,W,18.8,34.66,250995,,E*7D',
+    '$GPVTG,108.53,T,,M,0.04,N,0.07,K,A*31',
+    '$GPGST,172814.0,0.006,0.023,0.020,273.6,0.023,0.020,0.031*6A',
+    '$HEHDT,359.4,T*24',
+    '$PASHR,130533.620,0.311,T,-80.467,-1.395,0.25,0.066,0.067,0.215,2,3*12',
+    '$PSXN,23,0.30,-0.97,298.57,0.13*1B',
+    '$PSXN,20,0,0,0,0*3B',
+    '$PFEC,GPatt,294.7,-02.5,+00.4*45',
+    '$PFEC,GPhve,00.007,A*08',
+]
+
+CLASSES = [
+    pynmea2.GGA, pynmea2.RMC, pynmea2.VTG, pynmea2.GST, pynmea2.HDT,
+    pynmea2.ash.ASHRATT, pynmea2.sxn.SXN23, pynmea2.fec.FECGPatt,
+]
+
+
+def expected(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime.time):
+        return value.hour * 3600 + value.minute * 60 + value.second + \
+            value.microsecond / 1e6
+    if isinstance(value, datetime.date):
+        return np.datetime64(value, 'D')
+    if isinstance(value, str):
+        return value.encode('ascii')
+    return float(value)
+
+
+@pytest.mark.parametrize('cls', CLASSES, ids=lambda cls: cls.__name__)
+def test_decode(cls):
+    msgs = [msg for msg in map(pynmea2.parse, LINES) if type(msg) is cls]
+    assert msgs
+    columns = columnar.decode(LINES, cls)
+    assert list(columns) == [f[1] for f in cls.fields]
+
+    for field in cls.fields:
+        column = columns[field[1]]
+        assert len(column) == len(msgs)
+        dtype = columnar.field_dtype(field)
+        if dtype is not None:
+            assert column.dtype == dtype
+        for msg, value in zip(msgs, column):
+            v = expected(getattr(msg, field[1]))
+            if v is None:
+                assert np.isnan(value) or value == columnar.MISSING_INT
+            elif isinstance(v, float):
+                assert value == pytest.approx(v)
+            else:
+                assert value == v
+
+
+def test_decode_array():
+    array = columnar.decode_array(
+        [line.encode('ascii') for line in LINES], pynmea2.RMC)
+    assert array.dtype.names == tuple(f[1] for f in pynmea2.RMC.fields)
+    assert array['datestamp'].tolist() == [
+        datetime.date(2015, 9, 25), datetime.date(1995, 9, 25)]
+    assert array['spd_over_grnd'][0] == 99.7
+    assert array['lat'][1] == b'3949.797'
+
+
+def test_decode_missing():
+    lines = ['$GPRMC,2500,A,,,,,x,,320299,,E', '$GPRMC,,A,,,']
+    columns = columnar.decode(lines, pynmea2.RMC)
+    assert np.isnan(columns['timestamp']).all()
+    assert np.isnan(columns['spd_over_grnd']).all()
+    assert np.isnat(columns['datestamp']).all()
+    assert columns['status'].tolist() == [b'A', b'A']
+    assert columns['nav_status'].tolist() == [b'', b'']
+
+    columns = columnar.decode(['$PSXN,20,,1,x,0*3B'], pynmea2.sxn.SXN20,
+                              errors='ignore')
+    assert len(columns['horiz_qual']) == 0
+    columns = columnar.decode(['$PSXN,20,,1,x,0'], pynmea2.sxn.SXN20)
+    assert columns['horiz_qual'].tolist() == [columnar.MISSING_INT]
+    assert columns['head_qual'].tolist() == [columnar.MISSING_INT]
+    assert columns['rp_qual'].tolist() == [0]
+    # -1 is a value
+    columns = columnar.decode(['$PSXN,20,-1,1,0,0'], pynmea2.sxn.SXN20)
+    assert columns['horiz_qual'].tolist() == [-1]
+
+    # timestamps which `timestamp` rejects with OverflowError
+    line = '$GPGGA,12345699999999999,1929.045,S,02410.506,E,1,04,2.6,,M,,M,,'
+    assert pynmea2.parse(line).timestamp == '12345699999999999'
+    assert np.isnan(columnar.decode([line], pynmea2.GGA)['timestamp']).all()
+
+
+def test_decode_errors():
+    lines = LINES[:1] + ['FOOBAR', LINES[0][:-2] + '00']
+    with pytest.raises(pynmea2.ParseError):
+        columnar.decode(lines, pynmea2.GGA)
+    with pytest.raises(pynmea2.ChecksumError):
+        columnar.decode(lines[::2], pynmea2.GGA)
+    with pytest.raises(pynmea2.ChecksumError):
+        columnar.decode([LINES[0][:-3]], pynmea2.GGA, check=True)
+
+    # lines from an iterator
+    with pytest.raises(pynmea2.ChecksumError):
+        columnar.decode(iter(lines[::2]), pynmea2.GGA)
+    with pytest.raises(pynmea2.ChecksumError):
+        columnar.decode((line.encode('ascii') for line in lines[::2]),
+                        pynmea2.GGA)
+
+    columns = columnar.decode(lines, pynmea2.GGA, errors='ignore')
+    assert len(columns['timestamp']) == 1
+
+    # lines which the class cannot be constructed from
+    lines = ['$PASH', next(line for line in LINES if 'PASHR' in line)]
+    with pytest.raises(pynmea2.ParseError):
+        columnar.decode(lines, pynmea2.ash.ASHRATT)
+    columns = columnar.decode(lines, pynmea2.ash.ASHRATT, errors='ignore')
+    assert columns['roll'].tolist() == [-80.467]
+
+
+def test_parallel_read(tmp_path):
+    from pynmea2.parallel import parallel_read
+    path = tmp_path / 'data.log'
+    path.write_text('\n'.join(LINES * 10) + '\n')
+    expected = columnar.decode(LINES * 10, pynmea2.GGA)
+    batches = list(parallel_read(
+        str(path), workers=2, cls=pynmea2.GGA, chunk_size=300))
+    assert len(batches) > 1
+    for name, column in expected.items():
+        result = np.concatenate([b[name] for b in batches])
+        np.testing.assert_array_equal(result, column)
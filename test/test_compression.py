@@ -0,0 +1,132 @@
+import datetime
+import gzip
+import os
+import threading
+
+import pytest
+
+import pynmea2
+import pynmea2.parallel
+from pynmea2 import compression
+
+UTC = datetime.timezone.utc
+
+DATA = b''.join(b'$GPGGA,%06d.00,1929.045,S,02410.506,E,1,04,2.6,100.00,M,'
+                b'-33.9,M,,0000\n' % i for i in range(5000))
+
+
+@pytest.mark.parametrize('ext', ['gz', 'bz2', 'xz'])
+def test_round_trip(tmp_path, ext):
+    path = str(tmp_path / ('log.nmea.' + ext))
+    with compression.open(path, 'wt') as f:
+        f.write(DATA.decode('ascii'))
+    assert compression.detect(path) == {'gz': 'gzip'}.get(ext, ext)
+    with compression.open(path, 'rb', block_size=1000) as f:
+        assert f.read() == DATA
+    with compression.open(path, 'rt') as f:
+        assert sum(1 for line in f) == 5000
+
+    with pynmea2.NMEAFile(path) as f:
+        assert len(f.read()) == 5000
+    with pytest.raises(ValueError):
+        pynmea2.NMEAFile(path, mmap=True)
+
+    # compression is detected from the content, not the name
+    (tmp_path / 'log').write_bytes((tmp_path / ('log.nmea.' + ext)).read_bytes())
+    with compression.open(str(tmp_path / 'log')) as f:
+        assert f.read() == DATA
+
+
+def test_uncompressed(tmp_path):
+    path = str(tmp_path / 'log.nmea')
+    with compression.open(path, 'wb') as f:
+        f.write(DATA)
+    assert compression.detect(path) is None
+    with compression.open(path, 'rb', seekable=True) as f:
+        f.seek(100)
+        assert f.read(10) == DATA[100:110]
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason='requires FIFOs')
+def test_fifo(tmp_path):
+    path = str(tmp_path / 'fifo')
+    os.mkfifo(path)
+    assert compression.detect(path) is None
+
+    def write():
+        with open(path, 'wb') as f:
+            f.write(b''.join(DATA.splitlines(True)[:2]))
+    thread = threading.Thread(target=write)
+    thread.start()
+    try:
+        with pynmea2.NMEAFile(path) as f:
+            assert len(f.read()) == 2
+    finally:
+        thread.join()
+
+
+def test_block_gzip(tmp_path):
+    path = str(tmp_path / 'log.nmea.gz')
+    with compression.open(path, 'wb', block_size=1000) as f:
+        f.write(DATA)
+    with open(path, 'rb') as f:
+        assert gzip.decompress(f.read()) == DATA
+
+    reader = compression.BlockGzipReader(path)
+    assert reader.size == len(DATA)
+    # blocks end at a newline
+    assert all(DATA[offset - 1:offset] == b'\n'
+               for offset in reader._uncompressed[1:])
+    with compression.open(path, 'rb', seekable=True) as f:
+        for pos in (len(DATA) - 7, 12345, 0, 999, 1000):
+            f.seek(pos)
+            assert f.read(2000) == DATA[pos:pos + 2000]
+        assert f.seek(0, 2) == len(DATA)
+        assert f.read() == b''
+
+    # more blocks than fit in one table member
+    with compression.open(path, 'wb', block_size=10) as f:
+        f.write(DATA)
+    with compression.open(path, 'rb', seekable=True) as f:
+        f.seek(len(DATA) - 100)
+        assert f.read() == DATA[-100:]
+
+    with compression.open(path, 'wb', block_size=1000) as f:
+        pass
+    with compression.open(path, 'rb', seekable=True) as f:
+        assert f.read() == b''
+
+    with gzip.open(path, 'wb') as f:
+        f.write(DATA)
+    with pytest.raises(ValueError):
+        compression.open(path, 'rb', seekable=True)
+
+
+def test_block_gzip_parallel_read(tmp_path):
+    path = str(tmp_path / 'log.nmea.gz')
+    with compression.open(path, 'wb', block_size=1000) as f:
+        f.write(DATA)
+    expected = pynmea2.NMEASentence.parse_many(DATA.splitlines())[0]
+    result = pynmea2.parallel.parallel_read(path, workers=2, chunk_size=5000)
+    assert [str(s) for s in result] == [str(s) for s in expected]
+
+
+def test_block_gzip_between(tmp_path, make_log):
+    plain = tmp_path / 'log.nmea'
+    start = datetime.datetime(2016, 12, 31, 23, 59, tzinfo=UTC)
+    make_log(plain, start, 200)
+    path = str(tmp_path / 'log.nmea.gz')
+    with compression.open(path, 'wb', block_size=500) as f:
+        f.write(plain.read_bytes())
+
+    t0 = datetime.datetime(2017, 1, 1, 0, 0, 10)
+    t1 = datetime.datetime(2017, 1, 1, 0, 0, 20)
+    with pynmea2.NMEAFile(str(plain)) as f:
+        expected = [(dt, str(msg)) for dt, msg in f.between(t0, t1)]
+    with pynmea2.NMEAFile(path) as f:
+        index = f.index(block_size=1000)
+        result = [(dt, str(msg)) for dt, msg in f.between(t0, t1)]
+    assert index.size == len(plain.read_bytes())
+    assert index.is_current(path)
+    assert len(result) == 50
+    assert result == expected
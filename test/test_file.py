@@ -1,9 +1,10 @@
-try:
-    from StringIO import StringIO
-except ImportError:
-    from io import StringIO
+from io import StringIO
+from io import BytesIO
+
+import pytest
 
 import pynmea2
+import pynmea2.parallel
 
 TEST_DATA = """$GPRMC,181031.576,V,3926.276,N,07739.361,W,99.7,18.30,250915,,E*79
 $GPGGA,181032.576,3926.276,N,07739.361,W,0,00,,,M,,M,,*5F
@@ -41,6 +42,134 @@ def test_file():
     assert all([isinstance(s, pynmea2.NMEASentence) for s in nmea_strings])
 
 
+def test_file_bytes():
+    nmeafile = pynmea2.NMEAFile(BytesIO(TEST_DATA.encode('ascii')))
+    nmea_strings = nmeafile.read()
+    assert len(nmea_strings) == 10
+    assert [str(s) for s in nmea_strings] == TEST_DATA.splitlines()
+
+
+def test_file_filter():
+    nmeafile = pynmea2.NMEAFile(StringIO(TEST_DATA), include={'GGA', 'GLL'})
+    nmea_strings = nmeafile.read()
+    assert len(nmea_strings) == 6
+    assert not any(isinstance(s, pynmea2.RMC) for s in nmea_strings)
+
+    nmeafile = pynmea2.NMEAFile(StringIO(TEST_DATA), exclude={'RMC', 'GLL'})
+    assert isinstance(nmeafile.readline(), pynmea2.GGA)
+    assert isinstance(nmeafile.next(), pynmea2.GGA)
+
+
+def test_file_subclass():
+    class GGAFile(pynmea2.NMEAFile):
+        def parse(self, s):
+            msg = super(GGAFile, self).parse(s)
+            return msg if isinstance(msg, pynmea2.GGA) else None
+
+    with GGAFile(StringIO(TEST_DATA)) as f:
+        assert len(f.read()) == 3
+    with GGAFile(StringIO(TEST_DATA)) as f:
+        assert len(list(f)) == 3
+
+
+def test_parallel_read(tmp_path):
+    path = tmp_path / 'data.log'
+    path.write_text((TEST_DATA + '\n') * 20)
+    with pynmea2.NMEAFile(str(path)) as f:
+        expected = [str(s) for s in f.read()]
+
+    with pynmea2.NMEAFile(str(path)) as f:
+        result = list(f.parallel_read(workers=2, chunk_size=100))
+    assert [str(s) for s in result] == expected
+
+    result = list(pynmea2.parallel.parallel_read(
+        str(path), workers=2, chunk_size=1000, include={'GGA'}))
+    assert len(result) == 60
+    assert all(isinstance(s, pynmea2.GGA) for s in result)
+
+    with open(str(path), 'a') as f:
+        f.write('foo\n' + TEST_DATA)
+    with pytest.raises(pynmea2.ParseError):
+        list(pynmea2.parallel.parallel_read(str(path), chunk_size=100))
+    result = pynmea2.parallel.parallel_read(
+        str(path), chunk_size=100, errors='ignore')
+    assert len(list(result)) == 210
+
+
+def test_file_write(tmp_path):
+    path = tmp_path / 'out.log'
+    msgs = pynmea2.NMEAFile(StringIO(TEST_DATA)).read()
+    with pynmea2.NMEAFile(str(path), 'w', flush_size=100, fsync=True) as f:
+        f.write(msgs[0])
+        assert path.read_bytes() == b''
+        f.write_many(msgs[1:])
+        assert path.read_bytes() != b''
+    expected = ''.join(str(msg) + '\r\n' for msg in msgs).encode('ascii')
+    assert path.read_bytes() == expected
+
+    with pynmea2.NMEAFile(str(path), 'a', newline='\n') as f:
+        f.write(('GPGLL', '4916.45', 'N', '12311.12', 'W', '225444', 'A'))
+    assert path.read_bytes() == \
+        expected + b'$GPGLL,4916.45,N,12311.12,W,225444,A*31\n'
+
+    with pynmea2.NMEAFile(str(path)) as f:
+        with pytest.raises(TypeError):
+            f.write(msgs[0])
+
+    gz = str(tmp_path / 'out.log.gz')
+    with pynmea2.NMEAFile(gz, 'w') as f:
+        f.write_many(msgs)
+    with pynmea2.NMEAFile(gz) as f:
+        assert [str(msg) for msg in f] == [str(msg) for msg in msgs]
+
+
+def test_file_mmap(tmp_path, monkeypatch):
+    monkeypatch.setattr(pynmea2.nmea_file, 'BLOCK_SIZE', 64)
+    lines = TEST_DATA.splitlines()
+    path = tmp_path / 'data.log'
+    path.write_text('\r\n'.join(lines * 3))
+
+    with pynmea2.NMEAFile(str(path), mmap=True) as f:
+        assert len(f) == 30
+        assert str(f[0]) == lines[0]
+        assert str(f[25]) == lines[5]
+        assert str(f[-1]) == lines[-1]
+        assert [str(s) for s in f[8:13]] == (lines * 2)[8:13]
+        assert [str(s) for s in f[::7]] == (lines * 3)[::7]
+        assert f[40:] == []
+        with pytest.raises(IndexError):
+            f[30]
+
+        f.seek_line(28)
+        assert str(f.readline()) == lines[8]
+        assert [str(s) for s in f] == lines[9:]
+        f.seek_line(0)
+        assert len(f.read()) == 30
+
+    path.write_text('\n'.join(lines) + '\n')
+    with pynmea2.NMEAFile(str(path), mmap=True, include={'GGA'}) as f:
+        assert len(f) == 10
+        assert f[0] is None
+        assert isinstance(f[1], pynmea2.GGA)
+        with pytest.raises(IndexError):
+            f.seek_line(10)
+
+    path.write_text('')
+    with pynmea2.NMEAFile(str(path), mmap=True) as f:
+        assert len(f) == 0
+        assert list(f) == []
+
+    f = pynmea2.NMEAFile(StringIO(TEST_DATA))
+    for access in (len, lambda f: f[0], lambda f: f.seek_line(0)):
+        with pytest.raises(TypeError, match='requires NMEAFile'):
+            access(f)
+
+    # the mapping is closed with the file
+    path.write_text(TEST_DATA)
+    with pynmea2.NMEAFile(str(path), mmap=True) as f:
+        mapping = f._mmap
+    assert mapping.closed
+
+
 if __name__ == '__main__':
     test_file()
-
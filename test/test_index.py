@@ -0,0 +1,110 @@
+import datetime
+
+import pynmea2
+from pynmea2.nmea_index import NMEAIndex
+
+UTC = datetime.timezone.utc
+
+
+def expected(path, t0, t1, types=None):
+    tracker = pynmea2.DatetimeTracker()
+    result = []
+    current = None
+    for line in path.read_text().splitlines():
+        msg = pynmea2.parse(line)
+        current = tracker.update(msg) or current
+        if current is None or not t0 <= current < t1:
+            continue
+        if types is None or msg.sentence_type in types:
+            result.append((current, str(msg)))
+    return result
+
+
+def test_index(tmp_path, make_log):
+    path = tmp_path / 'log.nmea'
+    start = datetime.datetime(2016, 12, 31, 23, 50, tzinfo=UTC)
+    make_log(path, start, 3000)
+
+    index = NMEAIndex.build(str(path), block_size=1024)
+    assert len(index.offsets) > 100
+    assert index.count('GGA') == 3000
+    assert index.count('RMC') == 1500
+    assert index.count('XYZ') == 0
+    index.save(str(tmp_path / 'idx'))
+    loaded = NMEAIndex.load(str(tmp_path / 'idx'))
+    assert loaded.types == index.types
+    assert loaded.sample_offsets == index.sample_offsets
+    assert loaded.is_current(str(path))
+
+    windows = [
+        (start + datetime.timedelta(seconds=100.5),
+         start + datetime.timedelta(seconds=160)),
+        # across midnight
+        (datetime.datetime(2016, 12, 31, 23, 59, 30, tzinfo=UTC),
+         datetime.datetime(2017, 1, 1, 0, 1, 0, tzinfo=UTC)),
+        (datetime.datetime(2017, 1, 1, 0, 2, 0, tzinfo=UTC),
+         datetime.datetime(2017, 1, 1, 0, 2, 0, 500000, tzinfo=UTC)),
+        (datetime.datetime(2017, 1, 2, tzinfo=UTC),
+         datetime.datetime(2017, 1, 3, tzinfo=UTC)),
+    ]
+    with open(str(path), 'rb') as f:
+        for t0, t1 in windows:
+            result = [(dt, str(msg)) for dt, msg in loaded.between(f, t0, t1)]
+            assert result == expected(path, t0, t1)
+            result = [(dt, str(msg)) for dt, msg in
+                      loaded.between(f, t0, t1, types={'GPGGA', 'VTG'})]
+            assert result == expected(path, t0, t1, types={'GGA', 'VTG'})
+    assert len(expected(path, *windows[0])) == 119 * 2 + 59
+
+
+def test_index_unordered(tmp_path, make_log):
+    # two logs appended out of order
+    start = datetime.datetime(2017, 1, 1, 12, tzinfo=UTC)
+    later, earlier = tmp_path / 'later', tmp_path / 'earlier'
+    make_log(later, start + datetime.timedelta(minutes=10), 600)
+    make_log(earlier, start, 600)
+    path = tmp_path / 'log.nmea'
+    path.write_text(later.read_text() + earlier.read_text())
+
+    index = NMEAIndex.build(str(path), block_size=1024)
+    last, first = index._bounds()
+    assert last == sorted(last) and first == sorted(first)
+
+    read = []
+    def _read(f, offset, *args):
+        read.append(offset)
+        return original(f, offset, *args)
+    original, index._read = index._read, _read
+    with open(str(path), 'rb') as f:
+        for minutes in (1, 11):
+            t0 = start + datetime.timedelta(minutes=minutes)
+            t1 = t0 + datetime.timedelta(seconds=30)
+            del read[:]
+            result = [(dt, str(msg)) for dt, msg in index.between(f, t0, t1)]
+            assert result == expected(path, t0, t1)
+            assert len(result) == 150
+            assert len(read) < len(index.offsets) // 4
+
+
+def test_file_between(tmp_path, make_log):
+    path = tmp_path / 'log.nmea'
+    start = datetime.datetime(2016, 12, 31, 23, 59, tzinfo=UTC)
+    make_log(path, start, 200)
+    t0 = datetime.datetime(2017, 1, 1, 0, 0, 10)
+    t1 = datetime.datetime(2017, 1, 1, 0, 0, 20)
+
+    with pynmea2.NMEAFile(str(path)) as f:
+        result = list(f.between(t0, t1, types={'GGA'}))
+    assert len(result) == 20
+    assert all(isinstance(msg, pynmea2.GGA) for dt, msg in result)
+    assert result[0][0] == t0.replace(tzinfo=UTC)
+    assert (tmp_path / 'log.nmea.idx').exists()
+
+    with pynmea2.NMEAFile(str(path)) as f:
+        assert f.index().count('GGA') == 200
+
+    # out of date indexes are rebuilt
+    make_log(path, start, 100)
+    with pynmea2.NMEAFile(str(path)) as f:
+        assert f.index().count('GGA') == 100
+        assert list(f.between(t0, t1)) == []
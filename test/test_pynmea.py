@@ -1,3 +1,6 @@
+import datetime
+import pickle
+
 import pytest
 import pynmea2
 
@@ -17,6 +20,197 @@ def test_sentence():
     assert str(msg) == data
 
 
+def test_parse_bytes():
+    msg = pynmea2.NMEASentence.parse_bytes(data.encode('ascii'))
+    assert isinstance(msg, pynmea2.GGA)
+    assert msg.talker == 'GP'
+    assert msg.data == pynmea2.parse(data).data
+    assert str(msg) == data
+
+    msg = pynmea2.NMEASentence.parse_bytes(memoryview(b'$PGRME,15.0,M,45.0,M,25.0,M*1C\r\n'))
+    assert isinstance(msg, pynmea2.grm.GRME)
+    assert msg.hpe == 15
+
+    with pytest.raises(pynmea2.ChecksumError):
+        pynmea2.NMEASentence.parse_bytes(data[:-2].encode('ascii') + b'00')
+
+    with pytest.raises(pynmea2.ParseError):
+        pynmea2.NMEASentence.parse_bytes(b'FOOBAR')
+
+
+def test_parse_lazy():
+    msg = pynmea2.parse(data, lazy=True)
+    assert isinstance(msg, pynmea2.GGA)
+    assert msg.talker == 'GP'
+    assert msg.sentence_type == 'GGA'
+    assert msg._lazy == (data, False)
+    assert msg.lat == '1929.045'
+    assert msg.data == pynmea2.parse(data).data
+    assert str(msg) == data
+
+    msg = pynmea2.NMEASentence.parse_bytes(data.encode('ascii'), lazy=True)
+    assert msg.altitude == 100.0
+
+    # the checksum is verified when the data is first read
+    msg = pynmea2.parse(data[:-2] + '00', lazy=True)
+    assert msg.sentence_type == 'GGA'
+    with pytest.raises(pynmea2.ChecksumError):
+        msg.lat
+    with pytest.raises(pynmea2.ChecksumError):
+        msg.render()
+
+    msg = pynmea2.parse(data[:-3], check=True, lazy=True)
+    with pytest.raises(pynmea2.ChecksumError):
+        msg.data
+
+    # the sentence type is still checked up front
+    with pytest.raises(pynmea2.SentenceTypeError):
+        pynmea2.parse('$GPXXX,1,2', lazy=True)
+
+    # proprietary sentences choose their class from the data
+    msg = pynmea2.parse('$PGRME,15.0,M,45.0,M,25.0,M*1C', lazy=True)
+    assert isinstance(msg, pynmea2.grm.GRME)
+
+
+def test_parse_filter():
+    assert pynmea2.parse(data, include={'RMC'}) is None
+    assert pynmea2.parse(data, exclude={'GGA'}) is None
+    assert isinstance(pynmea2.parse(data, include={'GGA'}), pynmea2.GGA)
+    assert isinstance(pynmea2.parse(data, include={'GPGGA'}), pynmea2.GGA)
+    assert pynmea2.parse(data, include={'GLGGA'}) is None
+
+    # rejected lines are not checked
+    assert pynmea2.parse(data[:-2] + '00', exclude={'GGA'}) is None
+    assert pynmea2.NMEASentence.parse_bytes(
+        data.encode('ascii'), include={'RMC'}) is None
+
+    ashr = '$PASHR,130533.620,0.311,T,-80.467,-1.395,0.25,0.066,0.067,0.215,2,3*12'
+    tnl = '$PTNL,PJK,202831.50,011112,+805083.350,N,+388997.346,E,10,09,1.5,GHT+25.478,M*77'
+    assert pynmea2.parse(ashr, include={'PASHR'}).manufacturer == 'ASH'
+    assert pynmea2.parse(ashr, include={'PASH'}).manufacturer == 'ASH'
+    assert pynmea2.parse(ashr, include={'PTNL'}) is None
+    assert pynmea2.parse(tnl, include={'PASHR', 'PTNL'}).manufacturer == 'TNL'
+
+    # lines without an address field are not filtered
+    with pytest.raises(pynmea2.ParseError):
+        pynmea2.parse('FOOBAR', include={'GGA'})
+
+
+def test_try_parse():
+    assert isinstance(pynmea2.try_parse(data), pynmea2.GGA)
+    assert isinstance(pynmea2.try_parse(data.encode('ascii')), pynmea2.GGA)
+    assert pynmea2.try_parse(data, include={'RMC'}) is None
+
+    failures = [
+        ('FOOBAR*00', pynmea2.PARSE_ERROR),
+        ('$CCGPQ,GGA,1*36', pynmea2.PARSE_ERROR),
+        ('$GPXXX,1,2*4C', pynmea2.SENTENCE_TYPE_ERROR),
+        (data[:-2] + '00', pynmea2.CHECKSUM_MISMATCH),
+        (data[:-3].encode('ascii'), pynmea2.CHECKSUM_MISSING),
+    ]
+    for line, failure in failures:
+        result = pynmea2.try_parse(line, check=True)
+        assert result is failure
+        assert not result
+        e = result.exception(line)
+        assert type(e) is failure.error
+        with pytest.raises(failure.error) as raised:
+            if isinstance(line, bytes):
+                pynmea2.NMEASentence.parse_bytes(line, check=True)
+            else:
+                pynmea2.parse(line, check=True)
+        assert raised.value.args == e.args
+
+
+@pytest.mark.parametrize('line', [
+    data,
+    data[:-2] + '6d',
+    '$GPGGA,184353.07,1929.045,S*6D  \r\n',
+    '$GPGGA,1*6D\t\n',
+    '$GPGGA,1*6D\x0b\x0c\r\n',
+    '$GPGGA,1*6D\n\r  ',
+    '  $GPGGA,1\r\n',
+    ' \xa0$GPGGA,1*6D\u2028',
+    '$GPGGA,1*6D\r\nxx',
+    '$GPGGA,1*6D x',
+    '$GPGGA,1*6',
+    '$GPGGA,1*',
+    '$GPGGA,1*6G',
+    '$GPGGA,1*6D*6D',
+    '$\xc4PGGA,1*6D',
+    '$GP\xc4GA,1',
+    '$P\xc4SH,1',
+    '$GP\u0663GA,1',
+    '$GP_GA,1',
+    '$CCGPQ,GGA',
+    '$CCGPQ,GGA*2B',
+    '$CCGPQ,GGA,1*36',
+    'CCGPQ,GGA',
+    'GPGGA,1',
+    'PGRME,15.0*1C',
+    '$gpgga,1',
+    '$GPGGA1',
+    '$PGRM',
+    '$PGR',
+    '$P',
+    '$',
+    '',
+])
+def test_scan(line):
+    # `_scan` frames sentences as `sentence_re` does
+    match = pynmea2.NMEASentence.sentence_re.match(line)
+    if match:
+        expected = (match.group('nmea_str'), len(match.group('sentence_type')),
+                    match.group('checksum'))
+    else:
+        expected = None
+    nmea = pynmea2.nmea
+    assert nmea._scan(line, nmea._TEXT_SYNTAX) == expected
+
+    try:
+        raw = line.encode('ascii')
+    except UnicodeEncodeError:
+        return
+    if expected is not None:
+        expected = (expected[0].encode('ascii'), expected[1],
+                    expected[2] and expected[2].encode('ascii'))
+    assert nmea._scan(raw, nmea._BYTES_SYNTAX) == expected
+
+
+def test_parse_many():
+    lines = [
+        data,
+        'FOOBAR',
+        '$GPRMC,181031.576,V,3926.276,N,07739.361,W,99.7,18.30,250915,,E*79',
+        data.encode('ascii'),
+        data[:-2] + '00',
+        '$PGRME,15.0,M,45.0,M,25.0,M*1C',
+        '$CCGPQ,GGA*2B',
+        '$GPXXX,1,2',
+        data[:-3].lower(),
+    ]
+    sentences, errors = pynmea2.parse_many(lines)
+    expected = [pynmea2.try_parse(line) for line in lines]
+    assert [str(msg) for msg in sentences] == \
+        [str(msg) for msg in expected if msg]
+    assert [type(msg) for msg in sentences] == \
+        [type(msg) for msg in expected if msg]
+    assert [i for i, e in errors] == [1, 4, 7]
+    assert isinstance(errors[1][1], pynmea2.ChecksumError)
+    assert isinstance(errors[2][1], pynmea2.SentenceTypeError)
+    assert sentences[0].talker == sentences[5].talker == 'GP'
+
+    sentences, errors = pynmea2.parse_many(iter(lines), errors='ignore',
+                                           include={'GGA'})
+    assert len(sentences) == 3
+    assert errors == []
+
+    with pytest.raises(pynmea2.ParseError):
+        pynmea2.parse_many(lines, errors='raise')
+    with pytest.raises(ValueError):
+        pynmea2.parse_many(lines, errors='bad')
+
+
 def test_checksum():
     d = data[:-2] + '00'
     with pytest.raises(pynmea2.ChecksumError):
@@ -29,6 +223,68 @@ def test_attribute():
         msg.foobar
 
 
+def test_field_descriptor():
+    assert isinstance(pynmea2.GGA.lat, pynmea2.nmea.Field)
+    assert pynmea2.GGA.lat.index == 1
+    assert isinstance(pynmea2.ash.ASHRATT.roll, pynmea2.nmea.Field)
+
+    # fields never shadow methods or properties
+    assert pynmea2.srf.SRF103.checksum is pynmea2.NMEASentence.checksum
+    msg = pynmea2.parse('$PSRF103,00,01,00,01*25')
+    assert msg.rate == '00'
+    assert msg.checksum('A') == 0x41
+
+
+def test_cache_fields(monkeypatch):
+    msg = pynmea2.parse(data)
+    assert msg.timestamp is not msg.timestamp
+
+    # for a single sentence
+    msg.cache()
+    assert msg.timestamp is msg.timestamp
+    assert msg.latitude is msg.latitude
+    msg.timestamp = '184354'
+    assert msg.timestamp.second == 54
+    assert msg.timestamp is msg.timestamp
+    assert pynmea2.parse(data).timestamp is not pynmea2.parse(data).timestamp
+    msg.cache(False)
+    assert msg.timestamp is not msg.timestamp
+
+    monkeypatch.setattr(pynmea2.NMEASentence, 'cache_fields', True)
+    msg = pynmea2.parse(data)
+    assert msg.timestamp is msg.timestamp
+    assert msg.latitude is msg.latitude
+    assert msg.latitude == -19.484083333333334
+
+    msg.lat = '1930.000'
+    assert msg.latitude == -19.5
+    assert msg.latitude_minutes == 30.
+    msg.timestamp = '184354'
+    assert msg.timestamp.second == 54
+    msg.data = data.split(',')[1:]
+    assert msg.latitude == -19.484083333333334
+    with pytest.raises(ValueError):
+        msg.cache(False)
+
+
+def test_slots():
+    msg = pynmea2.parse(data)
+    assert not hasattr(msg, '__dict__')
+    with pytest.raises(AttributeError):
+        msg.foobar = 1
+    assert msg.talker is pynmea2.parse(data).talker
+
+
+def test_pickle():
+    for line in [data, 'CCGPQ,GGA', '$PGRME,15.0,M,45.0,M,25.0,M*1C',
+            '$PASHR,130533.620,0.311,T,-80.467,-1.395,0.25,0.066,0.067,0.215,2,3*12']:
+        msg = pynmea2.parse(line)
+        msg2 = pickle.loads(pickle.dumps(msg))
+        assert type(msg2) is type(msg)
+        assert repr(msg2) == repr(msg)
+        assert str(msg2) == str(msg)
+
+
 def test_fail():
     with pytest.raises(pynmea2.ParseError):
         pynmea2.parse('FOOBAR')
@@ -125,6 +381,66 @@ def test_timestamp():
     assert pynmea2.nmea_utils.timestamp('115919.12345'  ).microsecond == 123450
     assert pynmea2.nmea_utils.timestamp('115919.123456' ).microsecond == 123456
     assert pynmea2.nmea_utils.timestamp('115919.1234567').microsecond == 123456
+    assert pynmea2.nmea_utils.timestamp('115919.57'     ).microsecond == 570000
+    assert pynmea2.nmea_utils.timestamp('115919.29'     ).microsecond == 290000
+    assert pynmea2.nmea_utils.timestamp('115919').tzinfo is pynmea2.nmea_utils.UTC
+
+    with pytest.raises(ValueError):
+        pynmea2.nmea_utils.timestamp('115919.')
+    with pytest.raises(ValueError):
+        pynmea2.nmea_utils.timestamp('246000')
+
+
+def test_datestamp():
+    datestamp = pynmea2.nmea_utils.datestamp
+    assert datestamp('250915') == datetime.date(2015, 9, 25)
+    assert datestamp('311268') == datetime.date(2068, 12, 31)
+    assert datestamp('010169') == datetime.date(1969, 1, 1)
+    # as strptime
+    assert datestamp('10203') == datetime.date(2003, 2, 10)
+    for s in ('', '320115', '300215', '001215', '011315', 'abcdef'):
+        with pytest.raises(ValueError):
+            datestamp(s)
+
+
+def test_timestamp_array():
+    np = pytest.importorskip('numpy')
+    utils = pynmea2.nmea_utils
+    values = ['115919', '115919.57', '115919.1234567', b'000000.5', '',
+              '115919.', '246000', '1159', '115919.x', '+15919',
+              '12345699999999999']
+    result = utils.timestamp_array(values)
+    assert result.dtype == np.dtype('timedelta64[us]')
+    for v, r in zip(values, result):
+        try:
+            t = utils.timestamp(v.decode() if isinstance(v, bytes) else v)
+        except (ValueError, OverflowError):
+            assert np.isnat(r)
+            continue
+        assert r == np.timedelta64(
+            ((t.hour * 60 + t.minute) * 60 + t.second) * 1000000 +
+            t.microsecond, 'us')
+
+    result = utils.timestamp_array(['115919.5', '000001'], ['250915', 'x'])
+    assert result.dtype == np.dtype('datetime64[us]')
+    assert result[0] == np.datetime64('2015-09-25T11:59:19.5')
+    assert np.isnat(result[1])
+
+
+def test_datestamp_array():
+    np = pytest.importorskip('numpy')
+    utils = pynmea2.nmea_utils
+    values = ['250915', '311268', '010169', '10203', '', '320115', '300215',
+              '290216', '001215', '011315', 'abcdef']
+    result = utils.datestamp_array(values)
+    assert result.dtype == np.dtype('datetime64[D]')
+    for v, r in zip(values, result):
+        try:
+            d = utils.datestamp(v)
+        except ValueError:
+            assert np.isnat(r)
+            continue
+        assert r == np.datetime64(d)
 
 
 def test_corrupt_message():
@@ -147,6 +463,158 @@ def test_corrupt_message():
     assert msg.render(checksum=False) == data
 
 
+def test_template():
+    gga = pynmea2.GGA.template(
+        'GP', lat='%08.3f', lon='%09.3f', num_sats='%02d', altitude='%.2f',
+        altitude_units='M', geo_sep_units='M')
+    assert gga.names == [
+        'timestamp', 'lat', 'lat_dir', 'lon', 'lon_dir', 'gps_qual',
+        'num_sats', 'horizontal_dil', 'altitude', 'geo_sep', 'age_gps_data',
+        'ref_station_id']
+    values = ('184353.07', 1929.045, 'S', 2410.506, 'E', 1, 4, 2.6, 100,
+              -33.9, None, '0000')
+    assert gga.render(values) == data
+    assert gga.render(values, checksum=False, newline=True) == \
+        data[:-3] + '\r\n'
+    msg = gga.sentence(values)
+    assert type(msg) is pynmea2.GGA
+    assert msg.talker == 'GP'
+    assert msg.data == pynmea2.parse(data).data
+    assert str(msg) == data
+
+    # leading constants are part of the prefix
+    attitude = pynmea2.types.proprietary.ash.ASHRATT.template(_r='R')
+    line = '$PASHR,130533.620,0.311,T,-80.467,-1.395,,0.066,0.067,0.215,2,3*0B'
+    values = ('130533.620', 0.311, 'T', -80.467, -1.395, None, 0.066, 0.067,
+              0.215, 2, 3)
+    assert attitude.render(values) == line
+    assert repr(attitude.sentence(values)) == repr(pynmea2.parse(line))
+
+    with pytest.raises(ValueError):
+        pynmea2.GGA.template('GP', altitud='%.2f')
+    with pytest.raises(TypeError):
+        pynmea2.ProprietarySentence.template()
+
+    # Nortek sentences render their address from the data they were
+    # constructed with
+    nor = '$PNORBT0,1,040721,131335.3341,23.961,-48.122,-32.76800,10.00000,0.00,0x00000000*48'
+    msg = pynmea2.parse(nor)
+    assert str(msg) == nor
+    with pytest.raises(TypeError):
+        type(msg).template()
+
+
+def test_render_cache(monkeypatch):
+    msg = pynmea2.parse(data)
+    assert msg._parsed is data
+    assert str(msg) is data
+    assert str(msg) is str(msg)
+    assert msg.render(checksum=False, dollar=False, newline=True) == \
+        data[1:-3] + '\r\n'
+
+    msg.altitude = '101.00'
+    assert str(msg) == data.replace('100.00', '101.00')[:-3] + '*6C'
+    msg.data[0] = '184354.07'
+    msg._data_changed()
+    assert str(msg) == pynmea2.GGA('GP', 'GGA', msg.data).render()
+    msg.talker = 'GN'
+    assert str(msg).startswith('$GNGGA,184354.07,')
+
+    # constructors set their slots directly
+    msg = pynmea2.GGA('GP', 'GGA', msg.data)
+    assert not hasattr(msg, '_parsed')
+    str(msg)
+    msg.data = ['184355.07']
+    assert str(msg) == pynmea2.GGA('GP', 'GGA', ['184355.07']).render()
+    msg = pynmea2.GGA('GP', 'GGA', ['184355.07'])
+    msg.cache()
+    assert msg.timestamp.second == 55
+    msg.sentence_type = 'GGA'
+    assert msg._cache == {}
+    monkeypatch.setattr(pynmea2.NMEASentence, 'cache_fields', True)
+    msg = pynmea2.GGA('GP', 'GGA', ['184355.07'])
+    assert msg.timestamp.second == 55
+    msg.data = ['184356.07']
+    assert msg.timestamp.second == 56
+
+    # the line parsed is only kept if it renders the same way
+    assert str(pynmea2.parse(data[:-2] + '6d')) == data
+    assert str(pynmea2.parse(data[:-3])) == data
+    msg = pynmea2.NMEASentence.parse_bytes(data.encode('ascii'))
+    assert str(msg) == data
+    assert str(pynmea2.parse(data, lazy=True)) == data
+
+    rte = pynmea2.parse('$GPRTE,2,1,c,0,PBRCPK,PBRTO,PTELGR,PPLAND*58')
+    str(rte)
+    rte.waypoint_list = ['A', 'B']
+    assert str(rte) == '$GPRTE,2,1,c,0,A,B*07'
+
+    slots = dict(type(msg)._state_slots)
+    assert '_parsed' not in slots and '_rendered' not in slots
+
+
+def test_parse_into(monkeypatch):
+    lines = [
+        data,
+        '$PASHR,130533.620,0.311,T,-80.467,-1.395,,0.066,0.067,0.215,2,3*0B',
+        '$PSXN,23,0.30,-0.97,298.57,0.13*1B',
+        '$PSXN,20,0,0,0,0*3B',
+        '$CCGPQ,GGA*2B',
+    ]
+    for line in lines:
+        expected = pynmea2.parse(line)
+        for target in (None, pynmea2.parse(line), pynmea2.parse(lines[2]),
+                       pynmea2.parse(line, lazy=True)):
+            buf = getattr(target, 'data', None)
+            msg = pynmea2.NMEASentence.parse_into(line, target)
+            assert type(msg) is type(expected)
+            assert repr(msg) == repr(expected)
+            assert str(msg) == str(expected)
+            if type(target) is type(expected) and \
+                    not isinstance(msg, pynmea2.QuerySentence):
+                assert msg is target
+                assert msg.data is buf
+
+    monkeypatch.setattr(pynmea2.NMEASentence, 'cache_fields', True)
+    msg = pynmea2.parse(data)
+    assert msg.altitude == 100.0
+    line = data.replace('100.00', '101.00')[:-3]
+    assert pynmea2.NMEASentence.parse_into(line.encode('ascii'), msg) is msg
+    assert msg.altitude == 101.0
+    assert str(msg) == line + '*6C'
+
+    with pytest.raises(pynmea2.ChecksumError):
+        pynmea2.NMEASentence.parse_into(data[:-2] + '00', msg)
+    assert str(msg) == line + '*6C'
+
+
+def test_sentence_class(monkeypatch):
+    nmea = pynmea2.nmea
+    calls = []
+    for cls in (pynmea2.grm.GRM, pynmea2.ash.ASH):
+        def new(_cls, manufacturer, data, new=cls.__new__):
+            calls.append(_cls)
+            return new(_cls, manufacturer, data)
+        monkeypatch.setattr(cls, '__new__', staticmethod(new))
+    monkeypatch.setattr(nmea, '_PROPRIETARY_CLASSES', {})
+
+    # classes chosen from one field are looked up once per value
+    for _ in range(3):
+        assert nmea._sentence_class('PGRM', nmea.PROPRIETARY, ['E', '1']) \
+            is pynmea2.grm.GRME
+        assert nmea._sentence_class('PGRM', nmea.PROPRIETARY, ['X']) \
+            is pynmea2.grm.GRM
+    assert calls == [pynmea2.grm.GRM] * 2
+
+    del calls[:]
+    data = '130533.620,0.311,T,-80.467,-1.395,,0.066,0.067,0.215,2,3'
+    for _ in range(2):
+        assert nmea._sentence_class(
+            'PASH', nmea.PROPRIETARY, ['R'] + data.split(',')) \
+            is pynmea2.ash.ASHRATT
+    assert calls == [pynmea2.ash.ASH] * 2
+
+
 #
 # ^o^
 #       |\    ship it!
@@ -1,9 +1,9 @@
+import datetime
+
 import pytest
 
-try:
-    from StringIO import StringIO
-except ImportError:
-    from io import StringIO
+from io import StringIO
+from io import BytesIO
 
 import pynmea2
 
@@ -31,6 +31,140 @@ def test_stream():
     assert len(list(sr.next())) == 0
 
 
+def test_stream_bytes():
+    sr = pynmea2.NMEAStreamReader()
+    data = DATA.encode('ascii')
+    assert len(list(sr.next(data[:10]))) == 0
+    msgs = list(sr.next(data[10:] + data))
+    assert len(msgs) == 2
+    assert all(str(msg) == DATA.strip() for msg in msgs)
+
+    f = BytesIO(data * 2)
+    sr = pynmea2.NMEAStreamReader(f)
+    assert len(list(sr.next())) == 1
+    assert len(list(sr.next())) == 1
+    assert len(list(sr.next())) == 0
+
+    sr = pynmea2.NMEAStreamReader()
+    view = memoryview(data * 2)
+    assert list(sr.next(view[:10])) == []
+    msgs = list(sr.next(view[10:]))
+    assert [str(msg) for msg in msgs] == [DATA.strip()] * 2
+
+
+def test_stream_buffer():
+    sr = pynmea2.NMEAStreamReader(errors='ignore')
+    assert list(sr.next(DATA[:10])) == []
+    assert sr.buffer == DATA[:10]
+    sr.buffer = ''
+    assert sr.buffer == ''
+    assert list(sr.next(DATA[10:])) == []
+    assert [str(msg) for msg in sr.next(DATA)] == [DATA.strip()]
+
+    sr.buffer = DATA[:10]
+    assert [str(msg) for msg in sr.next(DATA[10:])] == [DATA.strip()]
+
+    sr = pynmea2.NMEAStreamReader(errors='ignore', max_line_length=100)
+    assert list(sr.next(b'x' * 200)) == []
+    sr.buffer = bytearray(DATA[:10].encode('ascii'))
+    assert sr.buffer == DATA[:10].encode('ascii')
+    assert len(list(sr.next(DATA[10:].encode('ascii')))) == 1
+
+
+def test_stream_lazy():
+    sr = pynmea2.NMEAStreamReader(errors='ignore', lazy=True)
+    msgs = list(sr.next(DATA + 'FOOBAR\n' + DATA))
+    assert len(msgs) == 2
+    assert all(msg.sentence_type == 'GGA' for msg in msgs)
+    assert all(str(msg) == DATA.strip() for msg in msgs)
+
+    sr = pynmea2.NMEAStreamReader(lazy=True)
+    msgs = list(sr.next(DATA.encode('ascii')))
+    assert msgs[0].altitude == 100.0
+
+
+def test_stream_reuse():
+    att = '$PSXN,23,0.30,-0.97,298.57,0.13*1B\n'
+    data = DATA + att + DATA.replace('1,04', '1,05')[:-4] + '\n' + att
+    sr = pynmea2.NMEAStreamReader(errors='yield', reuse=True)
+    msgs = []
+    for msg in sr.next(data + 'FOOBAR\n' + data.encode('ascii').decode()):
+        msgs.append((msg, str(msg), repr(msg)))
+    expected = pynmea2.NMEASentence.parse_many(data.splitlines())[0]
+    assert [m[1:] for m in msgs[:4]] == [(str(e), repr(e)) for e in expected]
+    assert isinstance(msgs[4][0], pynmea2.ParseError)
+    assert msgs[0][0] is msgs[2][0] is msgs[5][0]
+    assert msgs[1][0] is msgs[3][0] is msgs[6][0]
+
+    with pytest.raises(ValueError):
+        pynmea2.NMEAStreamReader(lazy=True, reuse=True)
+
+
+def test_stream_filter():
+    rmc = '$GPRMC,181031.576,V,3926.276,N,07739.361,W,99.7,18.30,250915,,E*79\n'
+    sr = pynmea2.NMEAStreamReader(include={'RMC'})
+    msgs = list(sr.next(DATA + rmc + DATA))
+    assert len(msgs) == 1
+    assert isinstance(msgs[0], pynmea2.RMC)
+
+    sr = pynmea2.NMEAStreamReader(exclude={'RMC'})
+    assert len(list(sr.next((DATA + rmc).encode('ascii')))) == 1
+
+
+def test_stream_chunk_size():
+    f = StringIO(DATA * 3)
+    sr = pynmea2.NMEAStreamReader(f, chunk_size=50)
+    msgs = []
+    for _ in range(5):
+        msgs.extend(sr.next())
+    assert len(msgs) == 3
+    assert sr.buffer == ''
+
+    f = BytesIO(DATA.encode('ascii') * 3)
+    sr = pynmea2.NMEAStreamReader(f, chunk_size=7)
+    msgs = []
+    for _ in range(len(DATA) * 3 // 7 + 1):
+        msgs.extend(sr.next())
+    assert [str(msg) for msg in msgs] == [DATA.strip()] * 3
+
+
+def test_stream_max_line_length():
+    sr = pynmea2.NMEAStreamReader(errors='yield', max_line_length=100)
+    # garbage without newlines is dropped as it arrives
+    data = list(sr.next('x' * 60))
+    assert data == []
+    data = list(sr.next('x' * 60))
+    assert len(data) == 1
+    assert isinstance(data[0], pynmea2.ParseError)
+    assert sr.buffer == ''
+    assert list(sr.next('x' * 1000)) == []
+    assert sr.buffer == ''
+
+    # and reading resumes at the next sentence
+    data = list(sr.next('xx' + DATA))
+    assert len(data) == 1
+    assert isinstance(data[0], pynmea2.GGA)
+
+    # resynchronize on a '$' in the dropped data
+    data = list(sr.next('x' * 90 + DATA + 'x' * 90 + DATA[:20]))
+    data += list(sr.next(DATA[20:]))
+    assert [type(msg) for msg in data] == \
+        [pynmea2.ParseError, pynmea2.GGA, pynmea2.ParseError, pynmea2.GGA]
+
+    sr = pynmea2.NMEAStreamReader(errors='ignore', max_line_length=100)
+    data = list(sr.next(('x' * 500 + '\n' + DATA).encode('ascii')))
+    assert len(data) == 1
+    assert isinstance(data[0], pynmea2.GGA)
+
+    sr = pynmea2.NMEAStreamReader(max_line_length=100)
+    with pytest.raises(pynmea2.ParseError):
+        list(sr.next('x' * 500))
+
+    sr = pynmea2.NMEAStreamReader(max_line_length=None)
+    assert list(sr.next('x' * 10000)) == []
+    assert len(sr.buffer) == 10000
+
+
 def test_iter():
     sr = pynmea2.NMEAStreamReader(StringIO(DATA))
     for batch in sr:
@@ -55,6 +189,22 @@ def test_yield_errors():
     assert isinstance(data[0], pynmea2.ParseError)
     assert isinstance(data[1], pynmea2.GGA)
 
+    bad = DATA[:-3] + '00\n'
+    data = list(sr.next(bad))
+    assert isinstance(data[0], pynmea2.ChecksumError)
+    with pytest.raises(pynmea2.ChecksumError) as e:
+        pynmea2.parse(bad)
+    assert data[0].args == e.value.args
+
+    # sentence constructors failing on malformed data
+    data = list(sr.next('$PASH\n' + DATA))
+    assert isinstance(data[0], pynmea2.ParseError)
+    assert isinstance(data[1], pynmea2.GGA)
+    with pytest.raises(pynmea2.ParseError):
+        list(pynmea2.NMEAStreamReader().next('$PASH\n'))
+    sr = pynmea2.NMEAStreamReader(errors='ignore', reuse=True)
+    assert len(list(sr.next('$PASH\n' + DATA))) == 1
+
 
 def test_ignore_errors():
     sr = pynmea2.NMEAStreamReader(errors='ignore')
@@ -67,3 +217,80 @@ def test_ignore_errors():
 def test_bad_error_value():
     with pytest.raises(ValueError):
         sr = pynmea2.NMEAStreamReader(errors='bad')
+
+
+def test_datetime_tracker():
+    utc = datetime.timezone.utc
+    data = (
+        '$GPGGA,235958.00,1929.045,S,02410.506,E,1,04,2.6,100.00,M,-33.9,M,,0000\n'
+        '$GPRMC,235959.00,A,3926.276,N,07739.361,W,0.0,0.0,311215,,E\n'
+        '$GPGGA,235959.50,1929.045,S,02410.506,E,1,04,2.6,100.00,M,-33.9,M,,0000\n'
+        '$GPGGA,000000.00,1929.045,S,02410.506,E,1,04,2.6,100.00,M,-33.9,M,,0000\n'
+        '$GPVTG,108.53,T,,M,0.04,N,0.07,K,A\n'
+        '$GPGLL,2359.99,N,12345.67,W,235959.90,A\n'
+        '$GPGGA,000001.00,1929.045,S,02410.506,E,1,04,2.6,100.00,M,-33.9,M,,0000\n'
+        '$GPZDA,120000.00,01,01,2016,00,00\n'
+        '$GPGGA,120000.50,1929.045,S,02410.506,E,1,04,2.6,100.00,M,-33.9,M,,0000\n'
+    )
+    tracker = pynmea2.DatetimeTracker()
+    sr = pynmea2.NMEAStreamReader()
+    result = [dt for dt, msg in tracker.track(sr.next(data))]
+    assert result == [
+        # no date known yet
+        None,
+        datetime.datetime(2015, 12, 31, 23, 59, 59, tzinfo=utc),
+        datetime.datetime(2015, 12, 31, 23, 59, 59, 500000, tzinfo=utc),
+        # midnight rollover
+        datetime.datetime(2016, 1, 1, 0, 0, 0, tzinfo=utc),
+        # no timestamp
+        None,
+        # late sentence from before midnight
+        datetime.datetime(2015, 12, 31, 23, 59, 59, 900000, tzinfo=utc),
+        datetime.datetime(2016, 1, 1, 0, 0, 1, tzinfo=utc),
+        datetime.datetime(2016, 1, 1, 12, 0, 0, tzinfo=utc),
+        datetime.datetime(2016, 1, 1, 12, 0, 0, 500000, tzinfo=utc),
+    ]
+    assert tracker.date == datetime.date(2016, 1, 1)
+
+    # seeded with a date
+    tracker = pynmea2.DatetimeTracker(datetime.date(2015, 12, 31))
+    msg = pynmea2.parse(data.splitlines()[0])
+    assert tracker.update(msg) == \
+        datetime.datetime(2015, 12, 31, 23, 59, 58, tzinfo=utc)
+
+    # ZDA without a date does not change it
+    msg = pynmea2.parse('$GPZDA,000000.00,,,,,')
+    assert tracker.update(msg) == \
+        datetime.datetime(2016, 1, 1, 0, 0, 0, tzinfo=utc)
+
+
+def test_writer():
+    msg = pynmea2.parse(DATA)
+    line = DATA.replace('\n', '\r\n').encode('ascii')
+    grm = pynmea2.ProprietarySentence('GRM', ['E', '15.0', 'M']).render()
+
+    f = BytesIO()
+    writer = pynmea2.NMEAWriter(f, flush_size=300)
+    writer.write(msg)
+    writer.write(('GPGGA',) + tuple(msg.data))
+    writer.write(['PGRME', 15.0, 'M'])
+    assert f.getvalue() == b''
+    writer.write_many([msg, msg])
+    assert f.getvalue() == \
+        line * 2 + (grm + '\r\n').encode('ascii') + line * 2
+    with writer:
+        writer.write(msg)
+    assert f.getvalue().endswith(line * 3)
+
+    f = StringIO()
+    writer = pynmea2.NMEAWriter(f, newline='\n', checksum=False,
+                                flush_interval=0)
+    writer.write(msg)
+    assert f.getvalue() == DATA.replace('*6D', '')
+
+    import socket
+    a, b = socket.socketpair()
+    with a, b:
+        with pynmea2.NMEAWriter(a) as writer:
+            writer.write(msg)
+        assert b.recv(1000) == line
@@ -15,3 +15,26 @@ def test_latlon():
     msg = pynmea2.parse(data)
     with pytest.raises(ValueError):
         x =  msg.latitude
+
+
+def test_dm_to_sd_array():
+    np = pytest.importorskip('numpy')
+    values = ['1929.045', '02410.506', '', '0', '12108.1', '37.352387',
+              '1.2.3', '12319.943281', 'abc']
+    directions = ['S', 'E', 'N', 'S', 'W', 'N', 'N', 'X', 'N']
+    result = pynmea2.nmea_utils.dm_to_sd_array(values, directions)
+    assert result.dtype == np.float64
+    assert result[0] == -19.484083333333334
+    assert result[1] == 24.1751
+    assert result[2] == 0.
+    assert result[3] == 0.
+    assert result[4] == -121.135
+    assert np.isnan(result[5])
+    assert np.isnan(result[6])
+    assert result[7] == 0.
+    assert np.isnan(result[8])
+
+    # same as dm_to_sd
+    values = np.array([b'1929.045', b'12319.943281', b'000.0'])
+    assert pynmea2.nmea_utils.dm_to_sd_array(values).tolist() == \
+        [pynmea2.nmea_utils.dm_to_sd(v.decode()) for v in values]